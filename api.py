@@ -0,0 +1,221 @@
+"""Read-only JSON occupancy API for kiosks and door signs.
+
+Usage: python api.py [--host 0.0.0.0] [--port 8502]
+
+    GET /rooms/free                 rooms free right now
+    GET /rooms/{room}/now           what is in a room right now
+    GET /instructors/{name}/today   an instructor's classes today
+    GET /schedule?day=Mon           a day's classes (default: today)
+
+Responses carry an ETag tied to the data version (and, for answers about
+"now", the current minute); clients polling with If-None-Match get 304
+until something changes. Bodies are built once per state and reused.
+"""
+import argparse
+import asyncio
+import json
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from utils import clock
+from utils.compact import DAYS
+from utils.database import get_data_version
+from utils.occupancy import OccupancyIndex, get_occupancy_index
+
+# Seconds between checks of the clock and the data version.
+REFRESH_INTERVAL = 1.0
+
+# Distinct paths whose bodies are kept per state.
+MAX_CACHED_RESPONSES = 4096
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+Response = Tuple[int, str, bytes]
+
+def _hhmm(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+def _classes(df: pd.DataFrame) -> list:
+    df = df.sort_values(['start_min', 'Room'])
+    return [
+        {
+            'course': course,
+            'title': title,
+            'instructor': instructor,
+            'room': room,
+            'start': _hhmm(start),
+            'end': _hhmm(end),
+        }
+        for course, title, instructor, room, start, end in zip(
+            df['Course'].astype(object).where(df['Course'].notna(), None),
+            df['Course Title'].astype(object).where(df['Course Title'].notna(), None),
+            df['Instructor'].astype(object).where(df['Instructor'].notna(), None),
+            df['Room'], df['start_min'].tolist(), df['end_min'].tolist()
+        )
+    ]
+
+class OccupancyApi:
+    """Answers API paths from the occupancy index, caching encoded bodies per state.
+
+    The state (data version, index, day, minute) is swapped in by refresh(),
+    which may block on SQLite and so runs off the event loop; respond()
+    never touches the database.
+    """
+
+    def __init__(self):
+        # (version, index, day, minute, responses), replaced as a whole so
+        # cached bodies always belong to the state they were built from.
+        self.state: Optional[Tuple[Tuple[int, int], OccupancyIndex, str, int, Dict[str, Response]]] = None
+
+    def refresh(self) -> None:
+        now = clock.now()
+        version = get_data_version()
+        key = (version, now.strftime('%a'), clock.minute_of_day(now))
+        if self.state is None or (self.state[0], *self.state[2:4]) != key:
+            self.state = (version, get_occupancy_index(), key[1], key[2], {})
+
+    def respond(self, target: str, if_none_match: Optional[str] = None) -> Response:
+        """Returns (status, etag, body) for a GET of `target`."""
+        state = self.state
+        responses = state[4]
+        response = responses.get(target)
+        if response is None:
+            response = self._build(state, target)
+            if len(responses) < MAX_CACHED_RESPONSES:
+                responses[target] = response
+        status, etag, body = response
+        if status == 200 and if_none_match == etag:
+            return 304, etag, b""
+        return response
+
+    def _build(self, state, target: str) -> Response:
+        (term_id, data_version), index, today, minute, _ = state
+        version = f"{term_id}.{data_version}"
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip('/').split('/')]
+        live_tag = f'"{version}-{today}-{minute}"'
+
+        if parts == ['rooms', 'free']:
+            occupied = index.rooms_occupied_at(today, minute)
+            free = [room for room in index.rooms if room not in occupied]
+            return self._json(live_tag, {'day': today, 'time': _hhmm(minute), 'rooms': free})
+
+        if len(parts) == 3 and parts[0] == 'rooms' and parts[2] == 'now':
+            room = parts[1]
+            if room not in index.rooms:
+                return self._error(404, f"Unknown room: {room}")
+            classes = index.classes_at(today, minute)
+            classes = classes[classes['Room'] == room]
+            return self._json(live_tag, {
+                'room': room,
+                'day': today,
+                'time': _hhmm(minute),
+                'occupied': not classes.empty,
+                'classes': _classes(classes),
+                'free_at': _hhmm(index.next_free(room, today, minute)),
+            })
+
+        if len(parts) == 3 and parts[0] == 'instructors' and parts[2] == 'today':
+            name = parts[1]
+            day = index.day_schedule(today)
+            classes = day[day['Instructor'] == name]
+            if classes.empty and not (index.schedule['Instructor'] == name).any():
+                return self._error(404, f"Unknown instructor: {name}")
+            return self._json(f'"{version}-{today}"', {'instructor': name, 'day': today, 'classes': _classes(classes)})
+
+        if parts == ['schedule']:
+            day = parse_qs(url.query).get('day', [today])[0][:3].title()
+            if day not in DAYS:
+                return self._error(400, f"Unknown day: {day}")
+            return self._json(f'"{version}-{day}"', {'day': day, 'classes': _classes(index.day_schedule(day))})
+
+        return self._error(404, "Not found")
+
+    @staticmethod
+    def _json(etag: str, payload) -> Response:
+        return 200, etag, json.dumps(payload, separators=(',', ':')).encode()
+
+    @staticmethod
+    def _error(status: int, message: str) -> Response:
+        return status, "", json.dumps({'error': message}).encode()
+
+def _encode(status: int, etag: str, body: bytes, keep_alive: bool, head: bool = False) -> bytes:
+    headers = [
+        f"HTTP/1.1 {status} {REASONS[status]}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Cache-Control: no-cache",
+        "Access-Control-Allow-Origin: *",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    if etag:
+        headers.append(f"ETag: {etag}")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode('latin-1') + (b"" if head else body)
+
+async def handle_connection(api: OccupancyApi, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serves HTTP/1.1 requests on one connection until it closes."""
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            lines = request.decode('latin-1').split("\r\n")
+            method, target, protocol = (lines[0].split(" ", 2) + ["", ""])[:3]
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            # Requests never carry a body we need; skip one if sent.
+            length = int(headers.get('content-length') or 0)
+            if length:
+                await reader.readexactly(length)
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if protocol == "HTTP/1.1" else connection == 'keep-alive'
+            if method not in ("GET", "HEAD"):
+                status, etag, body = 405, "", b'{"error":"Method not allowed"}'
+            else:
+                status, etag, body = api.respond(target, headers.get('if-none-match'))
+            writer.write(_encode(status, etag, body, keep_alive, head=method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host: str, port: int) -> None:
+    api = OccupancyApi()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, api.refresh)
+
+    async def refresh_forever():
+        while True:
+            await asyncio.sleep(REFRESH_INTERVAL)
+            try:
+                await loop.run_in_executor(None, api.refresh)
+            except Exception as e:
+                print(f"refresh failed: {e}")
+
+    refresher = asyncio.create_task(refresh_forever())
+    server = await asyncio.start_server(lambda r, w: handle_connection(api, r, w), host, port, backlog=1024)
+    print(f"Serving occupancy API on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        refresher.cancel()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default="0.0.0.0")
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
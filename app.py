@@ -1,5 +1,6 @@
 import streamlit as st
 from utils.database import create_database
+from utils.metrics import rerun
 
 # --- Configuration ---
 st.set_page_config(layout="wide", page_title="Campus Management", page_icon="🏫")
@@ -35,4 +36,5 @@ def main():
     # The sidebar navigation is handled automatically by Streamlit Pages
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with rerun("Home"):
+        main()
\ No newline at end of file
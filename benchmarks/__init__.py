@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Benchmarks must never touch the app's real database: point utils.database at
+# a scratch file before anything imports it.
+os.environ.setdefault(
+    "SCHEDULE_DATABASE_FILE",
+    os.path.join(tempfile.mkdtemp(prefix="schedule-bench-"), "schedule.db")
+)
@@ -0,0 +1,47 @@
+"""Weekly Patterns heatmap: pivoting the full schedule vs the room_day_stats aggregates.
+
+Usage: python -m benchmarks.bench_aggregates [--sections 50000] [--repeat 20]
+
+Both paths run uncached, as a page rerun after a cache miss would, and
+their class-count grids are compared.
+"""
+import argparse
+import time
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.data_processing import expand_schedule
+
+def from_schedule():
+    df = database.get_schedule_data.uncached()
+    return df.pivot_table(index='Room', columns='Meeting Day', values='Course', aggfunc='count', fill_value=0)
+
+def from_stats():
+    stats = database.get_room_day_stats.uncached()
+    return stats.pivot(index='Room', columns='Meeting Day', values='Classes').fillna(0).astype('int64')
+
+def timed(func, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    frame = expand_schedule(generate_export(args.sections, seed=9))
+    database.insert_data(frame)
+
+    legacy, legacy_s = timed(from_schedule, args.repeat)
+    stats, stats_s = timed(from_stats, args.repeat)
+    assert legacy.sort_index().equals(stats.sort_index().reindex(columns=legacy.columns)), "heatmaps differ"
+
+    print(f"{len(frame)} meetings, {stats.size} heatmap cells")
+    print(f"full schedule pivot: {legacy_s * 1000:8.1f} ms")
+    print(f"aggregates pivot:    {stats_s * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Batch ingest throughput: department exports parsed and expanded across 1..N worker processes.
+
+Usage: python -m benchmarks.bench_batch [--files 32] [--sections 2000] [--workers 1 2 4 8] [--format csv]
+
+Writes --files exports of --sections sections each to a scratch
+directory (every fourth file repeats the one before it, as a
+cross-listing department's would), then times collect_exports() plus
+process_exports() for each worker count. Speedup is against one worker,
+which runs in-process. Pool startup is included in the timings, except
+for the forkserver's own start, a one-off per app process that is done
+before timing. Worker counts above the machine's cores cannot go faster.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.generator import generate_export, write_export
+from utils.batch import collect_exports, process_exports
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=32)
+    parser.add_argument('--sections', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="schedule-batch-")
+    for i in range(args.files):
+        seed = i - 1 if i % 4 == 3 else i
+        write_export(
+            generate_export(args.sections, seed=100 + seed, malformed_rate=0.01),
+            os.path.join(directory, f"dept-{i:02d}.{args.format}")
+        )
+    print(f"{args.files} {args.format} exports of {args.sections} sections, {os.cpu_count()} cores")
+
+    exports = collect_exports([directory])
+    if max(args.workers) > 1:
+        process_exports(exports[:2], workers=2)
+
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        result = process_exports(collect_exports([directory]), workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(
+            f"  {workers:2d} workers  {elapsed:7.2f} s  {args.files / elapsed:6.1f} files/s  "
+            f"x{baseline / elapsed:.2f}  ({len(result.schedule):,} meetings, {result.duplicates:,} duplicates)"
+        )
+
+if __name__ == "__main__":
+    main()
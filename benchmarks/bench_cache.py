@@ -0,0 +1,67 @@
+"""Kiosk fan-out against the shared query cache.
+
+Usage: python -m benchmarks.bench_cache [--kiosks 200] [--ticks 20] [--sections 5000]
+
+Every kiosk runs a Dashboard tick (today's schedule plus the room list)
+`--ticks` times, and one upload lands halfway through. Cache misses are
+the number of real queries issued: they should be one per query kind per
+data version, not one per kiosk tick.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.cache import cache_stats, clear_cache
+from utils.data_processing import expand_schedule
+
+def tick(cached: bool) -> None:
+    if cached:
+        database.get_schedule_data(meeting_day='Mon')
+        database.get_all_rooms()
+    else:
+        database.get_schedule_data.uncached(meeting_day='Mon')
+        database.get_all_rooms.uncached()
+
+def run(kiosks: int, ticks: int, cached: bool, frame) -> float:
+    barrier = threading.Barrier(kiosks)
+
+    def kiosk(n: int) -> None:
+        for i in range(ticks):
+            if n == 0 and i == ticks // 2:
+                database.insert_data(frame)
+            barrier.wait()
+            tick(cached)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=kiosks) as executor:
+        for future in [executor.submit(kiosk, n) for n in range(kiosks)]:
+            future.result()
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--kiosks', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=20)
+    parser.add_argument('--sections', type=int, default=5000)
+    args = parser.parse_args()
+
+    frame = expand_schedule(generate_export(args.sections, seed=1))
+    database.insert_data(frame)
+    total = args.kiosks * args.ticks
+
+    uncached_s = run(args.kiosks, args.ticks, False, frame)
+    print(f"uncached: {total} ticks in {uncached_s:.2f}s, {total * 2} queries")
+
+    clear_cache()
+    before = cache_stats()
+    cached_s = run(args.kiosks, args.ticks, True, frame)
+    stats = cache_stats()
+    misses = stats['misses'] - before['misses']
+    print(f"cached:   {total} ticks in {cached_s:.2f}s, {misses} queries "
+          f"({stats['hit_rate']:.2%} hit rate, {stats['bytes'] / 1e6:.1f} MB held)")
+
+if __name__ == "__main__":
+    main()
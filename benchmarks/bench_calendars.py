@@ -0,0 +1,63 @@
+"""Weekly calendars: stored at ingest vs rebuilt from a query per view, for one room and for all of them.
+
+Usage: python -m benchmarks.bench_calendars [--sections 5000] [--repeat 5]
+
+Stores one generated export, then times what ingest now spends building
+every room's and instructor's calendar, a single room's calendar and the
+zip of all rooms read from storage (shared query cache bypassed), and the
+per-view work they replace: querying a room's classes and sorting them
+into weekday order.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.calendars import calendar_archive, refresh_calendars
+from utils.compact import DAYS
+from utils.data_processing import expand_schedule
+
+def timed(func, repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    expanded = expand_schedule(generate_export(args.sections, seed=24))
+    database.insert_data(expanded)
+    rooms = database.get_all_rooms()
+    partition_id = int(database.get_partitions()['id'].iloc[0])
+
+    def rebuild():
+        with database._pool().writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            refresh_calendars(conn, partition_id)
+
+    def query_room(room):
+        df = database.get_schedule_data.uncached(rooms=[room])
+        df.assign(**{'Meeting Day': pd.Categorical(df['Meeting Day'], categories=DAYS)}) \
+            .sort_values(['Meeting Day', 'start_min'])
+
+    print(f"{args.sections} sections, {len(expanded):,} meetings, {len(rooms)} rooms")
+    for label, func in [
+        ("ingest: build calendars", rebuild),
+        ("insert_data (total)", lambda: database.insert_data(expanded)),
+        ("one room: query + sort", lambda: query_room(rooms[0])),
+        ("one room: stored ICS", lambda: database.get_calendars.uncached('room', [rooms[0]])),
+        ("one room: stored JSON", lambda: database.get_calendars.uncached('room', [rooms[0]], fmt='json')),
+        ("all rooms: query + sort", lambda: [query_room(room) for room in rooms]),
+        ("all rooms: stored zip", lambda: calendar_archive(database.get_calendars.uncached('room'), 'ics')),
+    ]:
+        print(f"  {label:25s} {timed(func, args.repeat):9.2f} ms")
+
+if __name__ == "__main__":
+    main()
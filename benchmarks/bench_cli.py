@@ -0,0 +1,52 @@
+"""Command-line startup and end-to-end times: cli.py run as a subprocess, as cron would.
+
+Usage: python -m benchmarks.bench_cli [--sections 5000] [--repeat 5]
+
+Ingests one generated export of --sections sections into a scratch
+database, then times each command from process start to exit, best of
+--repeat. `--help` is the interpreter's floor; a query adds pandas and
+the database modules, never Streamlit.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generator import generate_export, write_export
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cli.py')
+
+def run(args, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI] + args, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="schedule-cli-")
+    export = os.path.join(directory, "export.csv")
+    write_export(generate_export(args.sections, seed=23), export)
+    database = ['--database', os.path.join(directory, "schedule.db")]
+
+    print(f"{args.sections} sections, best of {args.repeat}")
+    for label, command, repeat in [
+        ("--help", ['--help'], args.repeat),
+        ("ingest", database + ['ingest', export], 1),
+        ("query free", database + ['query', 'free', '--day', 'Tue', 'Thu', '--start', '14:00', '--end', '15:15'], args.repeat),
+        ("query at", database + ['query', 'at', '--day', 'Mon', '--time', '11:30'], args.repeat),
+        ("query instructor", database + ['query', 'instructor', 'Instructor 7'], args.repeat),
+        ("export csv", database + ['export', '--out', os.devnull], args.repeat),
+    ]:
+        print(f"  {label:18s} {run(command, repeat):9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time columns and "now": per-query timezone localization vs minute lookups, and per-call vs pinned clock reads.
+
+Usage: python -m benchmarks.bench_clock [--rows 100 1000 10000 50000] [--repeat 20]
+
+get_schedule_data() used to parse both 'HH:MM:SS' columns with
+pd.to_datetime(), localize them to US/Central and take .dt.time on every
+query; it now looks each row's datetime.time up by its stored minute.
+Pages used to build a pytz timezone and read the system clock at every
+call; a page run now reads utils.clock once and reuses it.
+"""
+import argparse
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from utils import clock
+from utils.time_parsing import minutes_to_times
+
+def timed(func, repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def localized(df: pd.DataFrame) -> None:
+    for col in ('start_time', 'end_time'):
+        pd.to_datetime(df[col], format='%H:%M:%S').dt.tz_localize('US/Central').dt.time
+
+def looked_up(df: pd.DataFrame) -> None:
+    minutes_to_times(df['start_min'])
+    minutes_to_times(df['end_min'])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(25)
+    print("time columns per query        localize (ms)   lookup (ms)   speedup")
+    for rows in args.rows:
+        start = rng.integers(7 * 60, 21 * 60, rows)
+        end = start + rng.choice([50, 75, 150], rows)
+        df = pd.DataFrame({
+            'start_min': start,
+            'end_min': end,
+            'start_time': [f"{m // 60:02d}:{m % 60:02d}:00" for m in start],
+            'end_time': [f"{m // 60:02d}:{m % 60:02d}:00" for m in end],
+        })
+        before = timed(lambda: localized(df), args.repeat)
+        after = timed(lambda: looked_up(df), args.repeat)
+        print(f"  {rows:>8,} rows              {before:9.3f}   {after:11.3f}   x{before / after:7.1f}")
+
+    # A Dashboard run asks for the time in about five places.
+    calls = 5
+
+    def per_call():
+        for _ in range(calls):
+            datetime.datetime.now(pytz.timezone("US/Central"))
+
+    def pinned():
+        with clock.pinned():
+            for _ in range(calls):
+                clock.now()
+
+    print(f"\"now\" for a run asking {calls} times")
+    print(f"  timezone + clock per call    {timed(per_call, args.repeat * 50) * 1000:9.1f} us")
+    print(f"  pinned once per run          {timed(pinned, args.repeat * 50) * 1000:9.1f} us")
+
+if __name__ == "__main__":
+    main()
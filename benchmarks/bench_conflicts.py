@@ -0,0 +1,60 @@
+"""Conflict detection over a full campus, checked against a brute-force pairwise scan.
+
+Usage: python -m benchmarks.bench_conflicts [--meetings 100000] [--check 3000]
+"""
+import argparse
+import time
+from collections import Counter
+
+import pandas as pd
+
+from benchmarks.generator import generate_export
+from utils.conflicts import conflict_summary, find_conflicts
+from utils.data_processing import expand_schedule
+from utils.delta import normalize_meetings
+
+def brute_force(meetings: pd.DataFrame) -> Counter:
+    found = Counter()
+    rows = list(meetings.itertuples(index=False))
+    for a, x in enumerate(rows):
+        for y in rows[a + 1:]:
+            if x.meeting_day != y.meeting_day or x.course == y.course:
+                continue
+            if not (x.start_min < y.end_min and y.start_min < x.end_min):
+                continue
+            overlap = (max(x.start_min, y.start_min), min(x.end_min, y.end_min))
+            courses = tuple(sorted((x.course, y.course)))
+            if x.room == y.room:
+                found[('Room', x.meeting_day, x.room, courses, overlap)] += 1
+            if x.instructor and x.instructor == y.instructor:
+                found[('Instructor', x.meeting_day, x.instructor, courses, overlap)] += 1
+    return found
+
+def as_counter(conflicts: pd.DataFrame) -> Counter:
+    return Counter(
+        (kind, day, resource, tuple(sorted((a, b))), (start, end))
+        for kind, day, resource, a, b, start, end in conflicts[
+            ['kind', 'meeting_day', 'resource', 'course_a', 'course_b', 'start_min', 'end_min']
+        ].itertuples(index=False)
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--meetings', type=int, default=100_000)
+    parser.add_argument('--check', type=int, default=3000, help="meetings in the brute-force parity check")
+    args = parser.parse_args()
+
+    # About 1.6 meetings per section.
+    meetings = normalize_meetings(expand_schedule(generate_export(int(args.meetings / 1.6), seed=11)))
+
+    sample = meetings.head(args.check)
+    assert as_counter(find_conflicts(sample)) == brute_force(sample), "sweep and brute force disagree"
+
+    find_conflicts(meetings)
+    start = time.perf_counter()
+    conflicts = find_conflicts(meetings)
+    elapsed = time.perf_counter() - start
+    print(f"{len(meetings)} meetings: {conflict_summary(conflicts)} in {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Query latency under concurrent dashboards: fresh connections vs the pool.
+
+Usage: python -m benchmarks.bench_db_pool [--dashboards 50] [--ticks 40] [--sections 20000]
+
+Each simulated dashboard runs the queries of one Dashboard refresh (today's
+schedule plus the distinct room list) `--ticks` times. The run is repeated
+with an upload being written concurrently to show readers are not blocked.
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.connection import get_pool
+from utils.data_processing import expand_schedule
+
+DAY_QUERY = "SELECT * FROM schedule WHERE 1=1 AND meeting_day = ?"
+ROOMS_QUERY = "SELECT DISTINCT room FROM schedule"
+UPLOAD_INTERVAL = 0.25
+
+def build_frame(sections: int) -> pd.DataFrame:
+    df = expand_schedule(generate_export(sections, seed=3))
+    df['start_time'] = df['start_time'].map(lambda t: t.strftime('%H:%M:%S'))
+    df['end_time'] = df['end_time'].map(lambda t: t.strftime('%H:%M:%S'))
+    return df.rename(columns={'Course': 'course', 'Course Title': 'course_title',
+                              'Instructor': 'instructor'})
+
+def fresh_tick(path: str) -> None:
+    """One refresh the way utils.database used to do it: connect per call."""
+    conn = sqlite3.connect(path)
+    pd.read_sql_query(DAY_QUERY, conn, params=['Mon'])
+    conn.close()
+    conn = sqlite3.connect(path)
+    pd.read_sql_query(ROOMS_QUERY, conn)
+    conn.close()
+
+def pooled_tick(path: str) -> None:
+    pool = get_pool(path)
+    with pool.reader() as conn:
+        pd.read_sql_query(DAY_QUERY, conn, params=['Mon'])
+    with pool.reader() as conn:
+        pd.read_sql_query(ROOMS_QUERY, conn)
+
+def run(tick, path: str, dashboards: int, ticks: int, writer=None) -> tuple:
+    latencies, errors = [], []
+    stop = threading.Event()
+
+    def dashboard():
+        for _ in range(ticks):
+            start = time.perf_counter()
+            try:
+                tick(path)
+            except Exception as e:  # e.g. "database is locked" or a half-written upload
+                errors.append(e)
+            latencies.append(time.perf_counter() - start)
+
+    write_thread = None
+    if writer:
+        write_thread = threading.Thread(target=writer, args=(stop,))
+        write_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=dashboards) as executor:
+            for future in [executor.submit(dashboard) for _ in range(dashboards)]:
+                future.result()
+    finally:
+        stop.set()
+        if write_thread:
+            write_thread.join()
+    return latencies, errors
+
+def report(label: str, result: tuple) -> None:
+    latencies, errors = result
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p95 = ordered[int(len(ordered) * 0.95)] * 1000
+    print(f"{label:<32} p50 {p50:8.2f} ms   p95 {p95:8.2f} ms   "
+          f"max {ordered[-1] * 1000:8.2f} ms   mean {statistics.mean(ordered) * 1000:8.2f} ms   "
+          f"failed reads {len(errors)}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dashboards', type=int, default=50)
+    parser.add_argument('--ticks', type=int, default=40)
+    parser.add_argument('--sections', type=int, default=20000)
+    args = parser.parse_args()
+
+    frame = build_frame(args.sections)
+    pooled_path = database.DATABASE_FILE
+    legacy_path = os.path.join(os.path.dirname(pooled_path), "legacy.db")
+
+    # The legacy file stays in the default rollback-journal mode.
+    conn = sqlite3.connect(legacy_path)
+    frame.to_sql('schedule', conn, if_exists='replace', index=False)
+    conn.close()
+    database.insert_data(frame)
+
+    # An upload lands every UPLOAD_INTERVAL seconds while dashboards refresh.
+    def legacy_writer(stop):
+        while not stop.wait(UPLOAD_INTERVAL):
+            conn = sqlite3.connect(legacy_path, timeout=30)
+            frame.to_sql('schedule', conn, if_exists='replace', index=False)
+            conn.close()
+
+    def pooled_writer(stop):
+        while not stop.wait(UPLOAD_INTERVAL):
+            database.insert_data(frame)
+
+    print(f"{len(frame)} meetings, {args.dashboards} dashboards x {args.ticks} ticks")
+    report("fresh connections", run(fresh_tick, legacy_path, args.dashboards, args.ticks))
+    report("pooled WAL connections", run(pooled_tick, pooled_path, args.dashboards, args.ticks))
+    report("fresh connections + upload", run(
+        fresh_tick, legacy_path, args.dashboards, args.ticks, legacy_writer))
+    report("pooled WAL + upload", run(
+        pooled_tick, pooled_path, args.dashboards, args.ticks, pooled_writer))
+
+if __name__ == "__main__":
+    main()
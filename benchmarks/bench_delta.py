@@ -0,0 +1,42 @@
+"""Full replace vs delta ingest for a small mid-semester correction.
+
+Usage: python -m benchmarks.bench_delta [--sections 50000] [--changes 10]
+"""
+import argparse
+import time
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.data_processing import expand_schedule
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=50_000)
+    parser.add_argument('--changes', type=int, default=10)
+    args = parser.parse_args()
+
+    frame = expand_schedule(generate_export(args.sections, seed=7))
+    database.insert_data(frame)
+
+    # Move some classes to another room and cancel as many others.
+    corrected = frame.copy()
+    step = len(frame) // (args.changes * 2)
+    moved = corrected.index[::step][:args.changes]
+    corrected.loc[moved, 'room'] = 'Annex ' + corrected.loc[moved, 'room']
+    corrected = corrected.drop(index=corrected.index[step // 2::step][:args.changes])
+
+    _, replace_s = timed(database.insert_data, corrected)
+    database.insert_data(frame)
+    summary, delta_s = timed(database.apply_delta, corrected)
+
+    print(f"{len(frame)} meetings, correction: {summary}")
+    print(f"full replace: {replace_s * 1000:8.1f} ms")
+    print(f"delta ingest: {delta_s * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
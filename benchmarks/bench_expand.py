@@ -0,0 +1,75 @@
+"""Benchmarks expand_schedule against the original iterrows expansion.
+
+Usage: python -m benchmarks.bench_expand [--max-rows 1000000] [--legacy-max 50000]
+
+Every size is also checked for parity: the vectorized output must be
+frame-equal to the row-by-row implementation it replaced.
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_export
+from utils.data_processing import DAYS_MAP, KEEP_COLUMNS, expand_schedule
+from utils.time_parsing import parse_time
+
+def legacy_expand(df: pd.DataFrame) -> pd.DataFrame:
+    """The original row-by-row expansion from load_and_process_data."""
+    df = df.dropna(subset=['Meeting Pattern', 'Meeting Time', 'Room Number(s)'])
+    df['Room Number(s)'] = df['Room Number(s)'].astype(str).str.strip()
+    expanded = []
+    for _, row in df.iterrows():
+        rooms = [r.strip() for r in str(row['Room Number(s)']).split(';')]
+        days = [d.strip().lower() for d in str(row['Meeting Pattern']).split(',')]
+        meeting_time_str = str(row['Meeting Time']).strip()
+        if '-' in meeting_time_str:
+            start_time_str, end_time_str = meeting_time_str.split('-')
+            start_time = parse_time(start_time_str)
+            end_time = parse_time(end_time_str)
+        else:
+            start_time = parse_time(meeting_time_str)
+            end_time = None
+        if start_time and end_time:
+            for day in days:
+                for room in rooms:
+                    if day in DAYS_MAP:
+                        new_row = row.to_dict()
+                        new_row['meeting_day'] = DAYS_MAP[day]
+                        new_row['room'] = room
+                        new_row['start_time'] = start_time
+                        new_row['end_time'] = end_time
+                        expanded.append(new_row)
+    df_expanded = pd.DataFrame(expanded)
+    return df_expanded[KEEP_COLUMNS].dropna(subset=['start_time', 'end_time'])
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-rows', type=int, default=1_000_000)
+    parser.add_argument('--legacy-max', type=int, default=50_000,
+                        help="largest size to also run the slow legacy loop on")
+    args = parser.parse_args()
+
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= args.max_rows]
+    print(f"{'rows':>10} {'expanded':>10} {'vectorized s':>13} {'legacy s':>10} {'speedup':>8}")
+    for n in sizes:
+        export = generate_export(n, seed=n)
+        # Sprinkle in rows the expansion has to drop or partially keep.
+        export.loc[::97, 'Meeting Time'] = 'TBA'
+        export.loc[::89, 'Meeting Pattern'] = 'Saturday, Monday'
+
+        fast, fast_s = timed(expand_schedule, export.copy())
+        if n <= args.legacy_max:
+            slow, slow_s = timed(legacy_expand, export.copy())
+            pd.testing.assert_frame_equal(fast, slow.reset_index(drop=True))
+            print(f"{n:>10} {len(fast):>10} {fast_s:>13.3f} {slow_s:>10.3f} {slow_s / fast_s:>7.1f}x")
+        else:
+            print(f"{n:>10} {len(fast):>10} {fast_s:>13.3f} {'-':>10} {'-':>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Instructor Schedules render cost: per-instructor queries and cards vs one batch query and tables.
+
+Usage: python -m benchmarks.bench_instructors [--faculty 60] [--repeat 5]
+
+The per-instructor path is the page's original flow for every selected
+instructor: two get_schedule_data() calls and one markdown string per
+class. The batch path is get_instructor_schedules() plus
+schedule_tables(), for everyone at once and for one PAGE_SIZE page.
+Both bypass the shared query cache and must return the same classes.
+"""
+import argparse
+import time
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.data_processing import expand_schedule
+from utils.tables import schedule_tables
+
+PAGE_SIZE = 10
+
+def per_instructor(instructors, day):
+    blocks = []
+    for instructor in instructors:
+        if database.get_schedule_data.uncached(instructor=instructor).empty:
+            continue
+        df = database.get_schedule_data.uncached(meeting_day=day, instructor=instructor)
+        for _, row in df.iterrows():
+            blocks.append(f"""
+            <div class="card" style="margin-bottom: 10px; color: #8e44ad;">
+                <b>{row['Course']}</b> - {row['Room']}<br>
+                {row['Start Time'].strftime('%I:%M %p')} - {row['End Time'].strftime('%I:%M %p')}<br>
+                <small>{row['Course Title']}</small>
+            </div>
+            """)
+    return blocks
+
+def batch(instructors, day):
+    df = database.get_instructor_schedules.uncached(instructors, day)
+    return df, schedule_tables(df)
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--faculty', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # The generator draws one instructor per four sections.
+    database.insert_data(expand_schedule(generate_export(args.faculty * 4, seed=16)))
+    instructors = [name for name in database.get_all_instructors() if name]
+
+    for day in (None, 'Mon'):
+        blocks = per_instructor(instructors, day)
+        df, tables = batch(instructors, day)
+        expected = sorted(
+            (row['Instructor'], row['Meeting Day'], row['start_min'], row['Course'], row['Room'])
+            for instructor in instructors
+            for _, row in database.get_schedule_data.uncached(meeting_day=day, instructor=instructor).iterrows()
+        )
+        got = sorted(zip(df['Instructor'], df['Meeting Day'], df['start_min'], df['Course'], df['Room']))
+        assert got == expected, "batch query and per-instructor queries disagree"
+        assert len(blocks) == len(df)
+        print(f"{day or 'all days'}: {len(instructors)} instructors, {len(df)} classes, "
+              f"{len(blocks)} markdown calls -> {len(tables)}")
+
+        legacy_ms = timed(lambda: per_instructor(instructors, day), args.repeat)
+        batch_ms = timed(lambda: batch(instructors, day), args.repeat)
+        page_ms = timed(lambda: batch(instructors[:PAGE_SIZE], day), args.repeat)
+        print(f"  per-instructor queries + cards  {legacy_ms:8.1f} ms")
+        print(f"  batch query + tables (all)      {batch_ms:8.1f} ms")
+        print(f"  batch query + tables (1 page)   {page_ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
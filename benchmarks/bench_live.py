@@ -0,0 +1,37 @@
+"""Full page reruns per tab over a teaching day: 10-second autorefresh vs occupancy transitions.
+
+Usage: python -m benchmarks.bench_live [--sections 3000] [--day Mon]
+
+Counts what the scheduler would wake a session for between 08:00 and
+22:00; checks in between cost a fragment run comparing two integers.
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.data_processing import expand_schedule
+from utils.live import CHECK_INTERVAL
+from utils.occupancy import get_occupancy_index
+
+OPEN_MIN, CLOSE_MIN = 8 * 60, 22 * 60
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=3000)
+    parser.add_argument('--day', default='Mon')
+    args = parser.parse_args()
+
+    database.insert_data(expand_schedule(generate_export(args.sections, seed=6)))
+    transitions = get_occupancy_index().transitions(args.day)
+    woken = int(np.count_nonzero((transitions > OPEN_MIN) & (transitions <= CLOSE_MIN)))
+    hours = (CLOSE_MIN - OPEN_MIN) / 60
+    polled = int(hours * 3600 / CHECK_INTERVAL)
+
+    print(f"autorefresh: {polled / hours:6.0f} reruns/hour per tab")
+    print(f"transitions: {woken / hours:6.0f} reruns/hour per tab "
+          f"({(polled - woken) / hours:.0f} avoided)")
+
+if __name__ == "__main__":
+    main()
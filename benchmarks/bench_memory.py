@@ -0,0 +1,68 @@
+"""Schedule memory: get_schedule_data() frames vs the shared compact schedule, in total and per session.
+
+Usage: python -m benchmarks.bench_memory [--meetings 10000 1000000] [--sessions 20]
+
+For each size the schedule is stored, then --sessions callers each keep
+the result of one query, as concurrent page runs do. Per-session bytes
+are the traced allocations of those callers divided by their number:
+once with the cache's old deep copies, once with shallow copies of
+get_schedule_data(), and once with get_compact_schedule().
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.generator import generate_export
+from utils import cache, database
+from utils.cache import clear_cache, estimate_size
+from utils.data_processing import expand_schedule
+
+# Meetings per generated section, on average (multi-day patterns, two-room sections).
+MEETINGS_PER_SECTION = 1.58
+
+def per_session(query, sessions: int) -> float:
+    """Bytes allocated per caller holding one result of `query` (the first call is not counted)."""
+    query()
+    gc.collect()
+    tracemalloc.start()
+    held = [query() for _ in range(sessions)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / sessions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--meetings', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--sessions', type=int, default=20)
+    args = parser.parse_args()
+
+    for target in args.meetings:
+        expanded = expand_schedule(generate_export(int(target / MEETINGS_PER_SECTION), seed=20))
+        database.insert_data(expanded)
+        clear_cache()
+
+        full = database.get_schedule_data()
+        start = time.perf_counter()
+        compact = database.get_compact_schedule()
+        compact_s = time.perf_counter() - start
+        print(f"{len(full):,} meetings")
+        print(f"  get_schedule_data() frame   {estimate_size(full) / 1e6:9.1f} MB")
+        print(f"  compact schedule            {estimate_size(compact) / 1e6:9.1f} MB   (loaded in {compact_s:.2f}s)")
+        del full, compact
+
+        copy_on_write = cache._COPY_ON_WRITE
+        try:
+            cache._COPY_ON_WRITE = False
+            deep = per_session(database.get_schedule_data, args.sessions)
+        finally:
+            cache._COPY_ON_WRITE = copy_on_write
+        shallow = per_session(database.get_schedule_data, args.sessions)
+        compact_session = per_session(database.get_compact_schedule, args.sessions)
+        print(f"  per session, deep copies    {deep / 1e6:9.2f} MB")
+        print(f"  per session, shallow copies {shallow / 1e6:9.2f} MB")
+        print(f"  per session, compact        {compact_session / 1e6:9.2f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Occupancy queries: OccupancyIndex vs the pages' pandas boolean masks.
+
+Usage: python -m benchmarks.bench_occupancy [--rooms 10000] [--queries 200]
+
+Results of both approaches are compared for every query.
+"""
+import argparse
+import datetime
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.generator import generate_export
+from utils.data_processing import expand_schedule
+from utils.occupancy import OccupancyIndex
+from utils.time_parsing import times_to_minutes
+
+def build_schedule(rooms: int) -> pd.DataFrame:
+    df = expand_schedule(generate_export(rooms * 6, n_rooms=rooms, seed=5))
+    return pd.DataFrame({
+        'Meeting Day': df['meeting_day'],
+        'Room': df['room'],
+        'Start Time': df['start_time'],
+        'End Time': df['end_time'],
+        'start_min': times_to_minutes(df['start_time']),
+        'end_min': times_to_minutes(df['end_time']),
+    })
+
+def as_time(minute: int) -> datetime.time:
+    return datetime.time(minute // 60, minute % 60)
+
+def mask_occupied(df: pd.DataFrame, day: str, minute: int) -> set:
+    df_today = df[df['Meeting Day'] == day]
+    now_time = as_time(minute)
+    current = df_today[(df_today['Start Time'] <= now_time) & (df_today['End Time'] >= now_time)]
+    return set(current['Room'])
+
+def mask_free(df: pd.DataFrame, rooms: list, day: str, start: int, end: int) -> list:
+    df_today = df[df['Meeting Day'] == day]
+    busy = df_today[(df_today['Start Time'] < as_time(end)) & (df_today['End Time'] > as_time(start))]
+    busy_rooms = set(busy['Room'])
+    return [room for room in rooms if room not in busy_rooms]
+
+def mask_next_free(df: pd.DataFrame, room: str, day: str, minute: int) -> int:
+    classes = df[(df['Meeting Day'] == day) & (df['Room'] == room)].sort_values('start_min')
+    free_at = minute
+    for start, end in zip(classes['start_min'], classes['end_min']):
+        if start <= free_at <= end:
+            free_at = end
+    return free_at
+
+def bench(label: str, queries: list, mask_fn, index_fn) -> None:
+    start = time.perf_counter()
+    expected = [mask_fn(*q) for q in queries]
+    mask_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [index_fn(*q) for q in queries]
+    index_s = time.perf_counter() - start
+    assert actual == expected, f"{label}: index and pandas masks disagree"
+    per = 1000 / len(queries)
+    print(f"{label:<16} pandas {mask_s * per:9.3f} ms/query   index {index_s * per:9.4f} ms/query   "
+          f"{mask_s / index_s:8.0f}x")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    df = build_schedule(args.rooms)
+    rooms = list(df['Room'].unique())
+    start = time.perf_counter()
+    index = OccupancyIndex(df, rooms)
+    print(f"{len(df)} meetings in {len(rooms)} rooms; index built in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(0)
+    days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
+    points = [(rng.choice(days), rng.randrange(7 * 60, 22 * 60)) for _ in range(args.queries)]
+    windows = [(d, m, m + rng.choice((50, 75, 120))) for d, m in points]
+    room_points = [(rng.choice(rooms), d, m) for d, m in points]
+
+    bench("occupied at t", points,
+          lambda d, m: mask_occupied(df, d, m), index.rooms_occupied_at)
+    bench("free in [a, b]", windows,
+          lambda d, a, b: mask_free(df, rooms, d, a, b), index.free_rooms)
+    bench("next free", room_points,
+          lambda r, d, m: mask_next_free(df, r, d, m), index.next_free)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Free-room search: bitset RoomFinder vs intersecting OccupancyIndex.free_rooms per day.
+
+Usage: python -m benchmarks.bench_room_finder [--rooms 10000] [--queries 200]
+
+Queries are term-long searches over 1-3 days and 5-minute aligned
+windows; both approaches must return the same set of rooms.
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_occupancy import build_schedule
+from utils.occupancy import OccupancyIndex
+from utils.compact import DAYS
+from utils.room_finder import RoomFinder
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=10_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    df = build_schedule(args.rooms)
+    rooms = list(df['Room'].unique())
+    start = time.perf_counter()
+    finder = RoomFinder(df, rooms)
+    print(f"{len(df)} meetings in {len(rooms)} rooms; bitsets built in {time.perf_counter() - start:.2f}s "
+          f"({finder.bits.nbytes / 1e6:.1f} MB)")
+    index = OccupancyIndex(df, rooms)
+
+    rng = random.Random(0)
+    queries = []
+    for _ in range(args.queries):
+        days = rng.sample(DAYS[:5], rng.choice((1, 2, 3)))  # weekday searches
+        start_min = rng.randrange(8 * 12, 20 * 12) * 5
+        queries.append([(days, start_min, start_min + rng.choice((50, 75, 120)))])
+
+    start = time.perf_counter()
+    expected = []
+    for windows in queries:
+        free = set(rooms)
+        for days, lo, hi in windows:
+            for day in days:
+                free &= set(index.free_rooms(day, lo, hi))
+        expected.append(free)
+    index_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = [finder.free_mask(windows) for windows in queries]
+    mask_s = time.perf_counter() - start
+    start = time.perf_counter()
+    ranked = [finder.find(windows) for windows in queries]
+    ranked_s = time.perf_counter() - start
+    assert [set(finder.rooms[m]) for m in masks] == expected, "bitset search and interval index disagree"
+    assert [set(r['Room']) for r in ranked] == expected, "ranked results and interval index disagree"
+
+    per = 1000 / len(queries)
+    print(f"interval index      {index_s * per:8.2f} ms/query")
+    print(f"bitset search       {mask_s * per:8.2f} ms/query")
+    print(f"bitset search+rank  {ranked_s * per:8.2f} ms/query")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Cold-start profile: import time and first render of every page in a fresh interpreter.
+
+Usage: python -m benchmarks.bench_startup [--pages pages/1_*.py ...] [--top 8] [--sections 3000]
+
+For each page, its top-level imports are timed with `python -X importtime`
+and the slowest packages are listed; then the page is rendered twice with
+streamlit's AppTest in a new process, timing the first (cold) render and
+a rerun. Run it before and after a change to catch cold-start regressions.
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+loaded = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.session_state['logged_in'] = True
+at.run()
+first = time.perf_counter()
+at.run()
+rerun = time.perf_counter()
+print(json.dumps({
+    'streamlit_s': loaded - start,
+    'first_render_s': first - loaded,
+    'rerun_s': rerun - first,
+    'errors': [str(e.value) for e in at.exception],
+}))
+"""
+
+def page_imports(path: str) -> str:
+    """The page's top-level import statements, as source."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return "\n".join(
+        ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+def import_profile(source: str, env: dict) -> list:
+    """(cumulative_us, module) for each package imported at top level, slowest first."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', source],
+        env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            # Top-level entries are not indented; nested ones are counted in them.
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', nargs='*', default=sorted(glob.glob('pages/*.py')) + ['app.py'])
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--sections', type=int, default=3000)
+    args = parser.parse_args()
+
+    from benchmarks.generator import generate_export
+    from utils import database
+    from utils.data_processing import expand_schedule
+
+    database.insert_data(expand_schedule(generate_export(args.sections, seed=17)))
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+
+    report = {}
+    for page in args.pages:
+        imports = import_profile(page_imports(page), env)
+        total = sum(us for us, _ in imports)
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD, os.path.abspath(page)],
+            env=env, capture_output=True, text=True, check=True
+        )
+        render = json.loads(result.stdout.strip().splitlines()[-1])
+        report[page] = dict(render, imports_s=total / 1e6)
+
+        print(f"{page}")
+        print(f"  imports {total / 1000:7.0f} ms   first render {render['first_render_s'] * 1000:7.0f} ms"
+              f"   rerun {render['rerun_s'] * 1000:6.0f} ms   (streamlit {render['streamlit_s'] * 1000:.0f} ms)")
+        for us, name in imports[:args.top]:
+            print(f"    {us / 1000:7.1f} ms  {name}")
+        if render['errors']:
+            print(f"  errors: {render['errors']}")
+
+    out = os.path.join(tempfile.gettempdir(), 'startup-profile.json')
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {out}")
+
+if __name__ == "__main__":
+    main()
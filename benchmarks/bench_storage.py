@@ -0,0 +1,97 @@
+"""Read latency of the SQLite and Arrow snapshot backends through get_schedule_data.
+
+Usage: python -m benchmarks.bench_storage [--sections 50000] [--repeat 50]
+
+Cold reads run in a fresh interpreter (the snapshot file already exists,
+as it would after an upload); warm reads repeat in one process. Both
+bypass the shared query cache. Results of the two backends are compared
+for every query, and their room and instructor lists, first.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+QUERIES = {
+    'full week': {},
+    'one day': {'meeting_day': 'Mon'},
+    'rooms': {'meeting_day': 'Wed', 'rooms': ['101', '102', '103']},
+    'at minute': {'meeting_day': 'Tue', 'at_minute': 11 * 60},
+}
+
+def run_queries(repeat: int) -> dict:
+    from utils import database
+    timings = {}
+    for name, kwargs in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            database.get_schedule_data.uncached(**kwargs)
+        timings[name] = (time.perf_counter() - start) / repeat
+    return timings
+
+def child(repeat: int) -> None:
+    start = time.perf_counter()
+    from utils import database
+    database.get_schedule_data.uncached(meeting_day='Mon')
+    cold = time.perf_counter() - start
+    print(json.dumps({'cold': cold, 'warm': run_queries(repeat)}))
+
+def compare() -> None:
+    from utils import database
+    for name, kwargs in QUERIES.items():
+        frames = []
+        for backend in ("sqlite", "arrow"):
+            database.STORAGE_BACKEND = backend
+            df = database.get_schedule_data.uncached(**kwargs)
+            frames.append(df.sort_values(['Meeting Day', 'Room', 'start_min', 'Course']).reset_index(drop=True))
+        pd.testing.assert_frame_equal(frames[0], frames[1], check_dtype=False)
+    for getter in (database.get_all_rooms, database.get_all_instructors):
+        lists = []
+        for backend in ("sqlite", "arrow"):
+            database.STORAGE_BACKEND = backend
+            lists.append(getter.uncached())
+        assert lists[0] == lists[1], f"{getter.__name__} differs between backends"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.repeat)
+        return
+
+    os.environ.setdefault("SCHEDULE_DATABASE_FILE", os.path.join(tempfile.mkdtemp(), "bench.db"))
+    from benchmarks.generator import generate_export
+    from utils import database
+    from utils.data_processing import expand_schedule
+
+    export = generate_export(args.sections, seed=8)
+    # A few sections without an instructor, so the backends are compared on blanks too.
+    export.loc[export.index[::50], 'Instructor'] = None
+    database.STORAGE_BACKEND = "arrow"
+    database.insert_data(expand_schedule(export))
+    compare()
+
+    results = {}
+    for backend in ("sqlite", "arrow"):
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_storage', '--child', '--repeat', str(args.repeat)],
+            env=dict(os.environ, SCHEDULE_BACKEND=backend), capture_output=True, text=True, check=True
+        ).stdout
+        results[backend] = json.loads(out.strip().splitlines()[-1])
+
+    print(f"{'query':<12} {'sqlite ms':>10} {'arrow ms':>10}")
+    print(f"{'cold':<12} {results['sqlite']['cold'] * 1000:>10.1f} {results['arrow']['cold'] * 1000:>10.1f}")
+    for name in QUERIES:
+        print(f"{name:<12} {results['sqlite']['warm'][name] * 1000:>10.1f} "
+              f"{results['arrow']['warm'][name] * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Peak memory of streaming ingest vs loading the whole export.
+
+Usage: python -m benchmarks.bench_streaming [--max-rows 2000000] [--full-max 500000]
+
+Each (size, mode) runs in a fresh interpreter and reports its peak RSS
+above the baseline left by imports, so numbers include SQLite's memory.
+'checked' streams as the upload page does, checking for conflicts before
+commit; generated exports have some, so it measures the check and the
+rollback, and its peak includes the conflicts returned.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generator import generate_export
+
+SIZES = (10_000, 100_000, 500_000, 2_000_000)
+WRITE_CHUNK = 100_000
+
+def write_csv(path: str, rows: int) -> None:
+    for i, start in enumerate(range(0, rows, WRITE_CHUNK)):
+        chunk = generate_export(min(WRITE_CHUNK, rows - start), seed=i)
+        chunk.to_csv(path, mode='a' if i else 'w', header=not i, index=False)
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def child(mode: str, path: str) -> None:
+    import pandas as pd
+    from utils import database
+    from utils.data_processing import expand_schedule, iter_export_chunks
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode in ('stream', 'checked'):
+        with open(path, 'rb') as source:
+            chunks = iter_export_chunks(source, path)
+            summary = database.stream_insert(
+                (expand_schedule(c) for c in chunks), check_conflicts=mode == 'checked'
+            )
+            meetings = summary['meetings']
+    else:
+        df = expand_schedule(pd.read_csv(path))
+        database.insert_data(df)
+        meetings = len(df)
+    print(json.dumps({
+        'seconds': time.perf_counter() - start,
+        'meetings': meetings,
+        'peak_mb': peak_rss_mb() - baseline,
+    }))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-rows', type=int, default=2_000_000)
+    parser.add_argument('--full-max', type=int, default=500_000,
+                        help="largest size to also run the load-everything path on")
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="schedule-stream-")
+    print(f"{'rows':>10} {'mode':>7} {'meetings':>10} {'seconds':>8} {'peak MB':>8}")
+    for rows in (n for n in SIZES if n <= args.max_rows):
+        path = os.path.join(workdir, f"export-{rows}.csv")
+        write_csv(path, rows)
+        for mode in ('stream', 'checked', 'full'):
+            if mode == 'full' and rows > args.full_max:
+                continue
+            env = dict(os.environ, SCHEDULE_DATABASE_FILE=os.path.join(workdir, f"{mode}-{rows}.db"))
+            out = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_streaming', '--child', mode, path],
+                env=env, capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(f"{rows:>10} {mode:>7} {result['meetings']:>10} "
+                  f"{result['seconds']:>8.1f} {result['peak_mb']:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Term partitions: switching the active term vs re-uploading it, and scoped reads as terms pile up.
+
+Usage: python -m benchmarks.bench_terms [--sections 5000] [--terms 1 4 8] [--repeat 5]
+
+Stores --terms terms of --sections sections each (two buildings per
+term), then times set_active_term() against insert_data() of the same
+term, and the page queries of the active term with the shared query
+cache bypassed. Scoped reads should stay flat as terms are added.
+"""
+import argparse
+import time
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.data_processing import expand_schedule
+
+def timed(func, repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=5000)
+    parser.add_argument('--terms', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    halves = [
+        expand_schedule(generate_export(args.sections // 2, seed=21)),
+        expand_schedule(generate_export(args.sections // 2, seed=22)),
+    ]
+    stored = 0
+    for count in args.terms:
+        for n in range(stored, count):
+            for building, expanded in zip(["North", "South"], halves):
+                database.insert_data(expanded, term=f"Term {n + 1}", building=building)
+        stored = max(stored, count)
+        terms = [f"Term {n + 1}" for n in range(count)]
+
+        switches = iter(terms * (args.repeat + 1))
+        switch_ms = timed(lambda: database.set_active_term(next(switches)), args.repeat)
+        database.set_active_term(terms[-1])
+        upload_ms = timed(lambda: database.insert_data(halves[0], building="North"), args.repeat)
+
+        print(f"{count} term(s), {2 * count} partitions")
+        print(f"  switch active term      {switch_ms:9.2f} ms")
+        print(f"  re-upload one building  {upload_ms:9.2f} ms")
+        for label, query in [
+            ("schedule, Monday", lambda: database.get_schedule_data.uncached(meeting_day='Mon')),
+            ("schedule, one building", lambda: database.get_schedule_data.uncached(building="North")),
+            ("compact schedule", database.get_compact_schedule.uncached),
+            ("rooms", database.get_all_rooms.uncached),
+            ("room/day stats", database.get_room_day_stats.uncached),
+        ]:
+            print(f"  {label:23s} {timed(query, args.repeat):9.2f} ms")
+
+if __name__ == "__main__":
+    main()
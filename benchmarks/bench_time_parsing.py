@@ -0,0 +1,70 @@
+"""Benchmarks the cached time parser against the original strptime loop.
+
+Usage: python -m benchmarks.bench_time_parsing [--rows 1000000]
+
+Also checks that the regex fast path agrees with strptime on every
+hour/minute/suffix combination plus a set of awkward inputs.
+"""
+import argparse
+import datetime
+import itertools
+import time
+from typing import Optional
+
+import pandas as pd
+
+from benchmarks.generator import TIME_SLOTS
+from utils.time_parsing import (
+    TIME_FORMATS, parse_cache_info, parse_meeting_times, parse_time
+)
+
+def legacy_parse_time(time_str: str) -> Optional[datetime.time]:
+    """The original parse_time from utils.data_processing."""
+    time_str = time_str.strip().upper()
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(time_str, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+def parity_inputs():
+    for hour, minute, suffix in itertools.product(
+            range(0, 26), ('00', '5', '05', '30', '59', '60'), ('', 'am', 'PM', ' pm')):
+        yield f"{hour}:{minute}{suffix}"
+        yield f"{hour:02d}{minute}"
+        yield f"{hour}{suffix}"
+    yield from ('', 'TBA', ' 9:30am ', '12:00AM', '12:00PM', '0930', '930', '１:00PM')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    mismatches = [s for s in parity_inputs() if parse_time(s) != legacy_parse_time(s)]
+    assert not mismatches, f"fast path disagrees with strptime on: {mismatches[:10]}"
+
+    slots = TIME_SLOTS + ['TBA', '9:30 am-10:45 am']
+    meeting_times = pd.Series([slots[i % len(slots)] for i in range(args.rows)])
+
+    start = time.perf_counter()
+    for value in meeting_times:
+        if '-' in value:
+            for part in value.split('-'):
+                legacy_parse_time(part)
+        else:
+            legacy_parse_time(value)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = parse_meeting_times(meeting_times)
+    series_s = time.perf_counter() - start
+
+    failures = int(parsed.isna().any(axis=1).sum())
+    print(f"rows: {args.rows}  distinct: {meeting_times.nunique()}  parse failures: {failures}")
+    print(f"legacy strptime loop: {legacy_s:.3f}s")
+    print(f"parse_meeting_times:  {series_s:.3f}s ({legacy_s / series_s:.0f}x)")
+    print(f"cache: {parse_cache_info()}")
+
+if __name__ == "__main__":
+    main()
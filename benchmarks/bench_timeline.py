@@ -0,0 +1,76 @@
+"""Dashboard timeline cost per session refresh: per-session px.timeline vs the shared figure.
+
+Usage: python -m benchmarks.bench_timeline [--sections 3000] [--viewers 100] [--legacy-runs 2]
+
+Each refresh is timed through figure-to-JSON, the work st.plotly_chart
+does per session. The legacy build is slow, so it is timed over a few
+runs and reported per refresh.
+"""
+import argparse
+import datetime
+import time
+
+import plotly.express as px
+import plotly.io as pio
+
+from benchmarks.generator import generate_export
+from utils import database
+from utils.charts import timeline_at
+from utils.compact import with_times
+from utils.data_processing import expand_schedule
+from utils.occupancy import get_occupancy_index
+
+def legacy_refresh(df, now: datetime.datetime) -> str:
+    # The Dashboard's original create_timeline_chart, minus Streamlit.
+    df = df.copy()
+    df["Room"] = df["Room"].astype(str)
+    room_order = sorted(df["Room"].unique(), key=lambda x: int(x) if x.isdigit() else x)
+    df['Start'] = df['Start Time'].apply(lambda t: datetime.datetime.combine(now.date(), t))
+    df['End'] = df['End Time'].apply(lambda t: datetime.datetime.combine(now.date(), t))
+    fig = px.timeline(
+        df, x_start="Start", x_end="End", y="Room", color="Course",
+        hover_data=['Course Title', 'Instructor'],
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+        category_orders={"Room": room_order}
+    )
+    fig.update_yaxes(type="category", categoryorder="array", categoryarray=room_order)
+    fig.add_shape(type="line", x0=now, x1=now, y0=0, y1=1, xref="x", yref="paper")
+    return pio.to_json(fig.to_dict(), validate=False)
+
+def cached_refresh(day: str, now: datetime.datetime) -> str:
+    return pio.to_json(timeline_at(day, now).to_dict(), validate=False)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=3000)
+    parser.add_argument('--viewers', type=int, default=100)
+    parser.add_argument('--legacy-runs', type=int, default=2)
+    args = parser.parse_args()
+
+    database.insert_data(expand_schedule(generate_export(args.sections, seed=4)))
+    day = 'Mon'
+    df = with_times(get_occupancy_index().day_schedule(day))
+    now = datetime.datetime(2026, 10, 19, 11, 0)
+
+    start = time.perf_counter()
+    for _ in range(args.legacy_runs):
+        legacy_refresh(df, now)
+    legacy_s = (time.perf_counter() - start) / args.legacy_runs
+
+    # Two minutes of 10-second refreshes for every viewer: the shared
+    # figure is rebuilt once, and re-marked once per minute.
+    refreshes = 0
+    start = time.perf_counter()
+    for tick in range(12):
+        tick_now = now + datetime.timedelta(seconds=10 * tick)
+        for _ in range(args.viewers):
+            cached_refresh(day, tick_now)
+            refreshes += 1
+    cached_s = (time.perf_counter() - start) / refreshes
+
+    print(f"{len(df)} classes on {day}, {df['Course'].nunique()} courses")
+    print(f"per-session build: {legacy_s * 1000:8.1f} ms per refresh")
+    print(f"shared figure:     {cached_s * 1000:8.1f} ms per refresh ({refreshes} refreshes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Deterministic synthetic schedule exports for benchmarking.
+
+Usage: python -m benchmarks.generator [--sections 5000] [--rooms N] [--malformed 0.02] [--out export.xlsx]
+"""
+import argparse
+import random
+from typing import Optional
+
+import pandas as pd
+
+PATTERNS = [
+    'Monday, Wednesday, Friday', 'Tuesday, Thursday', 'Monday, Wednesday',
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+]
+
+TIME_SLOTS = [
+    '8:00am-8:50am', '9:05am-9:55am', '10:10am-11:00am', '11:15am-12:05pm',
+    '12:20pm-1:10pm', '1:25pm-2:15pm', '2:30pm-3:20pm', '3:35pm-4:25pm',
+    '8:00am-9:15am', '9:30am-10:45am', '11:00am-12:15pm', '12:30pm-1:45pm',
+    '2:00pm-3:15pm', '3:30pm-4:45pm', '5:00pm-6:15pm', '6:30pm-9:00pm',
+]
+
+# Meeting Times seen in real exports that expand_schedule() must skip.
+MALFORMED_TIMES = [
+    'TBA', '', '9:00am', '9:00am-', '-10:15am', '13:75-14:20',
+    '9:00am-10:00am-11:00am', 'noon-1:00pm', 'Online',
+]
+
+def generate_export(
+    n_rows: int,
+    n_rooms: Optional[int] = None,
+    seed: int = 0,
+    n_instructors: Optional[int] = None,
+    multi_room_rate: float = 0.05,
+    malformed_rate: float = 0.0
+) -> pd.DataFrame:
+    """Builds a registrar-style export with `n_rows` sections.
+
+    A `multi_room_rate` share of sections list two rooms ('101; 102') and a
+    `malformed_rate` share get a Meeting Time from MALFORMED_TIMES. The same
+    arguments always give the same export.
+    """
+    rng = random.Random(seed)
+    n_rooms = n_rooms or max(10, n_rows // 20)
+    rooms = [str(100 + i) for i in range(n_rooms)]
+    instructors = [f"Instructor {i}" for i in range(n_instructors or max(5, n_rows // 4))]
+
+    rows = []
+    for i in range(n_rows):
+        room = rng.choice(rooms)
+        if rng.random() < multi_room_rate:
+            room = f"{room}; {rng.choice(rooms)}"
+        rows.append({
+            'Course': f"SUBJ {1000 + i % 4000}",
+            'Course Title': f"Course Title {i % 4000}",
+            'Meeting Pattern': rng.choice(PATTERNS),
+            'Meeting Time': rng.choice(TIME_SLOTS),
+            'Instructor': rng.choice(instructors),
+            'Room Number(s)': room,
+        })
+        # Drawn only when asked for, so exports without malformed times
+        # stay identical to earlier versions of this generator.
+        if malformed_rate and rng.random() < malformed_rate:
+            rows[-1]['Meeting Time'] = rng.choice(MALFORMED_TIMES)
+    return pd.DataFrame(rows)
+
+def write_export(df: pd.DataFrame, path: str) -> None:
+    """Writes an export as CSV or XLSX, chosen by the file extension."""
+    if path.endswith('.xlsx'):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=5000)
+    parser.add_argument('--rooms', type=int)
+    parser.add_argument('--instructors', type=int)
+    parser.add_argument('--multi-room', type=float, default=0.05)
+    parser.add_argument('--malformed', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default="export.csv", help="a .csv or .xlsx path")
+    args = parser.parse_args()
+
+    df = generate_export(
+        args.sections, args.rooms, args.seed,
+        n_instructors=args.instructors,
+        multi_room_rate=args.multi_room,
+        malformed_rate=args.malformed
+    )
+    write_export(df, args.out)
+    print(f"Wrote {len(df)} sections to {args.out}")
+
+if __name__ == "__main__":
+    main()
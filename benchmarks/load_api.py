@@ -0,0 +1,106 @@
+"""Kiosk load test against the occupancy API (api.py).
+
+Usage: python -m benchmarks.load_api [--url http://127.0.0.1:8502] [--kiosks 200] [--seconds 10]
+
+Without --url, a server is started on a free port over a generated
+schedule. Each kiosk keeps one connection open and polls a mix of
+endpoints back to back, sending If-None-Match with the last ETag it saw,
+as a door display would. The client runs in this process, so on one
+machine it shares the CPU with the server.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import quote, urlsplit
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def kiosk(host: str, port: int, paths, deadline: float, latencies: list, statuses: dict) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        while time.perf_counter() < deadline:
+            path = random.choice(paths)
+            request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if path in etags:
+                request += f"If-None-Match: {etags[path]}\r\n"
+            start = time.perf_counter()
+            writer.write((request + "\r\n").encode('latin-1'))
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode('latin-1').split("\r\n")
+            headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+            await reader.readexactly(int(headers.get('Content-Length', 0)))
+            latencies.append(time.perf_counter() - start)
+            status = int(lines[0].split(" ")[1])
+            statuses[status] = statuses.get(status, 0) + 1
+            if 'ETag' in headers:
+                etags[path] = headers['ETag']
+    finally:
+        writer.close()
+
+async def run(host: str, port: int, paths, kiosks: int, seconds: float):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(kiosk(host, port, paths, deadline, latencies, statuses) for _ in range(kiosks)))
+    return latencies, statuses
+
+def start_server(sections: int):
+    from benchmarks.generator import generate_export
+    from utils import database
+    from utils.data_processing import expand_schedule
+
+    database.insert_data(expand_schedule(generate_export(sections, seed=12)))
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, 'api.py', '--host', '127.0.0.1', '--port', str(port)],
+        env=dict(os.environ), stdout=subprocess.PIPE, text=True
+    )
+    server.stdout.readline()  # "Serving ..." once it accepts connections
+    return server, port, database.get_all_rooms(), [i for i in database.get_all_instructors() if i]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url')
+    parser.add_argument('--kiosks', type=int, default=200)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--sections', type=int, default=3000)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+        rooms, instructors = ['101'], []
+    else:
+        os.environ.setdefault("SCHEDULE_DATABASE_FILE", os.path.join(tempfile.mkdtemp(), "api.db"))
+        server, port, rooms, instructors = start_server(args.sections)
+        host = "127.0.0.1"
+
+    paths = ["/rooms/free", "/schedule?day=Mon"]
+    paths += [f"/rooms/{quote(room)}/now" for room in random.sample(rooms, min(50, len(rooms)))]
+    paths += [f"/instructors/{quote(name)}/today" for name in random.sample(instructors, min(20, len(instructors)))]
+
+    try:
+        latencies, statuses = asyncio.run(run(host, port, paths, args.kiosks, args.seconds))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.kiosks} kiosks, {total} requests in {args.seconds:.0f}s: {total / args.seconds:,.0f} req/s")
+    print(f"latency p50 {latencies[total // 2] * 1000:.2f} ms, p99 {latencies[int(total * 0.99)] * 1000:.2f} ms")
+    print(f"statuses: {dict(sorted(statuses.items()))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Benchmark suite: ingest, queries and page data paths, compared against a stored baseline.
+
+Usage: python -m benchmarks.run [--sections 5000] [--repeat 5] [--out results.json]
+                                [--baseline benchmarks/baseline.json] [--tolerance 0.5]
+                                [--update-baseline] [--only query.]
+
+Every case runs on the same generated export (with multi-room sections and
+a share of malformed Meeting Times) and bypasses the shared query cache.
+The median of --repeat runs is recorded. With a baseline, any case whose
+median is more than --tolerance slower than the baseline's is reported
+as a regression and the exit status is 1. Timings depend on the machine:
+refresh the baseline with --update-baseline when moving to new hardware.
+"""
+import argparse
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.generator import generate_export, write_export
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Filters for get_schedule_data(); every combination is a case.
+DAY_FILTERS = [None, 'Mon']
+ROOM_FILTERS = [None, ['100', '101', '102']]
+INSTRUCTOR_FILTERS = [None, 'Instructor 7']
+MINUTE_FILTERS = [None, 11 * 60]
+
+class NamedBytes(io.BytesIO):
+    """An in-memory upload with a file name, like Streamlit's UploadedFile."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+def query_cases() -> List[Tuple[str, dict]]:
+    cases = []
+    for day, rooms, instructor, minute in itertools.product(
+        DAY_FILTERS, ROOM_FILTERS, INSTRUCTOR_FILTERS, MINUTE_FILTERS
+    ):
+        kwargs = {'meeting_day': day, 'rooms': rooms, 'instructor': instructor, 'at_minute': minute}
+        label = "+".join(name for name, value in kwargs.items() if value is not None) or "all"
+        cases.append((f"query.{label}", {k: v for k, v in kwargs.items() if v is not None}))
+    return cases
+
+def build_cases(sections: int, workdir: str) -> Dict[str, Callable[[], object]]:
+    import pandas as pd
+
+    from utils import charts, conflicts, database, occupancy, room_finder
+    from utils.calendars import calendar_archive
+    from utils.data_processing import expand_schedule
+    from utils.upload import load_and_process_data
+    from utils.tables import schedule_tables
+
+    export = generate_export(sections, seed=19, malformed_rate=0.02)
+    uploads = {}
+    for ext in ('csv', 'xlsx'):
+        path = os.path.join(workdir, f"export.{ext}")
+        write_export(export, path)
+        with open(path, 'rb') as f:
+            uploads[ext] = f.read()
+    expanded = expand_schedule(export)
+    database.insert_data(expanded)
+
+    load = load_and_process_data.__wrapped__
+    now = datetime.datetime(2026, 10, 19, 11, 0)
+    instructors = [name for name in database.get_all_instructors() if pd.notna(name) and name]
+
+    def dashboard():
+        index = occupancy.OccupancyIndex(database.get_compact_schedule.uncached(), database.get_all_rooms.uncached())
+        index.rooms_occupied_at('Mon', 11 * 60)
+        return charts.build_timeline(index.day_schedule('Mon'), now.date())
+
+    def active_classes():
+        index = occupancy.OccupancyIndex(database.get_compact_schedule.uncached(), database.get_all_rooms.uncached())
+        return index.classes_at('Mon', 11 * 60)
+
+    cases = {
+        'ingest.load_csv': lambda: load(NamedBytes(uploads['csv'], "export.csv")),
+        'ingest.load_xlsx': lambda: load(NamedBytes(uploads['xlsx'], "export.xlsx")),
+        'ingest.expand': lambda: expand_schedule(export),
+        'ingest.insert_data': lambda: database.insert_data(expanded),
+    }
+    for name, kwargs in query_cases():
+        cases[name] = lambda kwargs=kwargs: database.get_schedule_data.uncached(**kwargs)
+    cases.update({
+        'page.dashboard': dashboard,
+        'page.room_utilization': lambda: database.get_room_day_stats.uncached(),
+        'page.active_classes': active_classes,
+        'page.detailed_schedule': lambda: database.get_schedule_data.uncached(meeting_day='Mon', rooms=['100', '101']),
+        'page.instructor_schedules': lambda: schedule_tables(
+            database.get_instructor_schedules.uncached(instructors[:10])
+        ),
+        'page.room_calendar': lambda: database.get_calendars.uncached('room', ['100']),
+        'page.room_calendars_zip': lambda: calendar_archive(database.get_calendars.uncached('room'), 'ics'),
+        'page.conflicts': conflicts.get_conflicts.uncached,
+        'page.room_finder': lambda: room_finder.RoomFinder(
+            database.get_compact_schedule.uncached(), database.get_all_rooms.uncached()
+        ).find([(['Tue', 'Thu'], 14 * 60, 15 * 60 + 15)]),
+    })
+    return cases
+
+def run_cases(cases: Dict[str, Callable[[], object]], repeat: int) -> Dict[str, dict]:
+    results = {}
+    for name, case in cases.items():
+        case()  # warm-up: imports, connections, parse caches
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            case()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'median_ms': statistics.median(timings),
+            'min_ms': min(timings),
+            'max_ms': max(timings),
+            'runs': repeat,
+        }
+        print(f"{name:44s} {results[name]['median_ms']:9.2f} ms  (min {results[name]['min_ms']:.2f})")
+    return results
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Names and slowdowns of the cases slower than baseline by more than `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['median_ms'], result['median_ms']
+        # Sub-millisecond cases are noise-dominated; judge them on an absolute floor.
+        if after > max(before * (1 + tolerance), before + 1.0):
+            regressions.append(f"{name}: {before:.2f} ms -> {after:.2f} ms ({after / before - 1:+.0%})")
+    return regressions
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', default="benchmark-results.json")
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--only', default="", help="run only cases whose name starts with this")
+    args = parser.parse_args()
+
+    workdir = os.path.dirname(os.environ["SCHEDULE_DATABASE_FILE"])
+    cases = build_cases(args.sections, workdir)
+    cases = {name: case for name, case in cases.items() if name.startswith(args.only)}
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'sections': args.sections,
+            'repeat': args.repeat,
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': run_cases(cases, args.repeat),
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.out}")
+
+    if args.update_baseline:
+        if args.only and os.path.exists(args.baseline):
+            # Refresh just the selected cases, keeping the rest of the baseline.
+            with open(args.baseline) as f:
+                report['results'] = dict(json.load(f)['results'], **report['results'])
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Updated baseline {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['meta']['sections'] != args.sections:
+        print(f"Baseline was recorded with --sections {baseline['meta']['sections']}; not comparing")
+        return
+    regressions = compare(report['results'], baseline['results'], args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS against baseline {baseline['meta']['commit']} (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions against baseline {baseline['meta']['commit']} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
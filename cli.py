@@ -0,0 +1,257 @@
+"""Command-line ingest, queries and export, for cron jobs and scripts.
+
+Usage: python cli.py [--database PATH] COMMAND ...
+
+    ingest FILE_OR_DIR... [--term T] [--building B]   stream exports into the database
+    query free --day Tue Thu --start 14:00 --end 15:15  rooms free over a window
+    query at [--day Mon] [--time 11:30]                 classes in session (default: now)
+    query instructor NAME [--day Mon]                   an instructor's classes
+    export [--day Mon] [--format csv|json] [--out F]    the stored schedule
+    calendars room|instructor [NAME...] [--out DIR|F.zip]  weekly calendars (ICS or JSON)
+
+Queries and export read the active term unless --term is given, and every
+building unless --building is. Nothing here imports Streamlit; modules are
+imported by the command that needs them, so `--help` costs no more than
+the interpreter and a query little more than pandas.
+"""
+import argparse
+import os
+import signal
+import sys
+import time
+
+def _day(value: str) -> str:
+    # Checked here rather than with choices=: utils.compact pulls in pandas, which --help must not.
+    from utils.compact import DAYS
+
+    if value not in DAYS:
+        raise argparse.ArgumentTypeError(f"not a day: {value!r} (one of {', '.join(DAYS)})")
+    return value
+
+def _minutes(value: str) -> int:
+    from utils.time_parsing import parse_minutes
+
+    minutes = parse_minutes(value)
+    if minutes is None:
+        raise argparse.ArgumentTypeError(f"not a time: {value!r}")
+    return minutes
+
+def _export_paths(paths) -> list:
+    """Files named on the command line, with directories expanded to the exports inside."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(
+                    os.path.join(root, name) for name in sorted(names)
+                    if name.lower().endswith(('.csv', '.xlsx'))
+                )
+        else:
+            files.append(path)
+    return files
+
+def _progress_bar(name: str, started: float):
+    def update(rows_read, fraction):
+        width = 30
+        filled = int(width * (fraction or 0.0))
+        bar = "#" * filled + "." * (width - filled) if fraction is not None else "?" * width
+        sys.stderr.write(
+            f"\r{name[-30:]:30s} [{bar}] {rows_read:>10,} rows {time.perf_counter() - started:6.1f}s"
+        )
+        sys.stderr.flush()
+    return update
+
+def ingest(args) -> int:
+    from utils.data_processing import expand_schedule, iter_export_chunks
+    from utils.database import stream_insert
+
+    files = _export_paths(args.paths)
+    if not files:
+        print("No CSV or XLSX exports found", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    rows = {'read': 0}
+
+    def chunks():
+        # Every file streams into the same transaction.
+        for path in files:
+            name = os.path.basename(path)
+            update = _progress_bar(name, started)
+
+            def counted(rows_read, fraction, done=rows['read']):
+                rows['read'] = done + rows_read
+                update(rows_read, fraction)
+
+            with open(path, 'rb') as source:
+                for chunk in iter_export_chunks(source, name, args.chunk_size, progress=counted):
+                    yield expand_schedule(chunk)
+            sys.stderr.write("\n")
+
+    summary = stream_insert(chunks(), args.term, args.building)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Wrote {summary['meetings']:,} meetings from {rows['read']:,} rows in {len(files)} file(s) "
+        f"in {elapsed:.2f}s ({rows['read'] / elapsed:,.0f} rows/s)"
+    )
+    if summary['skipped_rows']:
+        print(f"Skipped {summary['skipped_rows']:,} rows with an unreadable Meeting Time")
+    return 0
+
+def _write(df, args) -> None:
+    """Writes a query result as a table, CSV or JSON lines, to --out or stdout."""
+    out = open(args.out, 'w', newline='') if getattr(args, 'out', None) else sys.stdout
+    try:
+        if args.format == 'csv':
+            df.to_csv(out, index=False)
+        elif args.format == 'json':
+            df.to_json(out, orient='records', lines=True)
+        elif df.empty:
+            print("(none)", file=out)
+        else:
+            print(df.to_string(index=False), file=out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+def _hhmm(minutes):
+    return minutes.map(lambda m: f"{m // 60:02d}:{m % 60:02d}")
+
+def _classes(df):
+    """Query rows as printed: day, 'HH:MM' start and end, then what and where."""
+    from utils.compact import DAYS
+
+    order = {day: i for i, day in enumerate(DAYS)}
+    df = df.assign(day=df['Meeting Day'].astype(str).map(order)).sort_values(['day', 'start_min', 'Room'])
+    return df.assign(Start=_hhmm(df['start_min']), End=_hhmm(df['end_min']))[
+        ['Meeting Day', 'Start', 'End', 'Course', 'Course Title', 'Instructor', 'Room']
+    ]
+
+def query(args) -> int:
+    from utils import database
+
+    scope = {'term': args.term, 'building': args.building}
+    if args.what == 'free':
+        from utils.room_finder import RoomFinder
+
+        if args.end <= args.start:
+            print("--end must be after --start", file=sys.stderr)
+            return 2
+        finder = RoomFinder(database.get_compact_schedule(**scope), database.get_all_rooms(**scope))
+        free = finder.find([(args.day, args.start, args.end)], args.rooms)
+        _write(free.assign(**{col: _hhmm(free[col]) for col in ['Free From', 'Free Until']}), args)
+    elif args.what == 'at':
+        from utils import clock
+
+        now = clock.now()
+        day = args.day or now.strftime('%a')
+        minute = args.time if args.time is not None else clock.minute_of_day(now)
+        _write(_classes(database.get_classes_at(day, minute, **scope)), args)
+    else:
+        df = database.get_instructor_schedules([args.name], meeting_day=args.day, **scope)
+        if df.empty and args.name not in database.get_all_instructors(**scope):
+            print(f"Unknown instructor: {args.name}", file=sys.stderr)
+            return 1
+        _write(_classes(df), args)
+    return 0
+
+def export(args) -> int:
+    from utils import database
+    from utils.compact import DAYS
+
+    df = database.get_schedule_data(meeting_day=args.day, term=args.term, building=args.building)
+    order = {day: i for i, day in enumerate(DAYS)}
+    df = df.assign(day=df['Meeting Day'].map(order)).sort_values(['day', 'start_min', 'Room'], kind='stable')
+    df = df.assign(
+        **{'Start Time': df['start_time'], 'End Time': df['end_time']}
+    )[['Course', 'Course Title', 'Meeting Day', 'Start Time', 'End Time', 'Instructor', 'Room']]
+    _write(df, args)
+    return 0
+
+def calendars(args) -> int:
+    from utils import database
+    from utils.calendars import calendar_archive, calendar_filename
+
+    found = database.get_calendars(
+        args.kind, args.names or None, args.format, term=args.term, building=args.building
+    )
+    if args.out.lower().endswith('.zip'):
+        with open(args.out, 'wb') as f:
+            f.write(calendar_archive(found, args.format))
+    else:
+        os.makedirs(args.out, exist_ok=True)
+        for name, document in found.items():
+            path = os.path.join(args.out, calendar_filename(name, args.format))
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(document)
+    print(f"Wrote {len(found):,} {args.kind} calendar(s) to {args.out}")
+    missing = sorted(set(args.names) - set(found))
+    if missing:
+        print(f"No classes for: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help="SQLite file (default: $SCHEDULE_DATABASE_FILE or data/schedule_data.db)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def scoped(sub: argparse.ArgumentParser, building_default=None) -> None:
+        sub.add_argument('--term', help="term name (default: the active term)")
+        sub.add_argument('--building', default=building_default)
+
+    def formatted(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+
+    sub = commands.add_parser('ingest', help="stream exports into the database, replacing their partition")
+    sub.add_argument('paths', nargs='+', metavar='FILE_OR_DIR')
+    sub.add_argument('--chunk-size', type=int, default=50_000)
+    scoped(sub, building_default='')
+    sub.set_defaults(run=ingest)
+
+    sub = commands.add_parser('query', help="free rooms, classes in session, an instructor's classes")
+    queries = sub.add_subparsers(dest='what', required=True)
+    free = queries.add_parser('free', help="rooms free on every --day over [--start, --end)")
+    free.add_argument('--day', nargs='+', type=_day, required=True, metavar='DAY')
+    free.add_argument('--start', type=_minutes, required=True)
+    free.add_argument('--end', type=_minutes, required=True)
+    free.add_argument('--rooms', nargs='+')
+    at = queries.add_parser('at', help="classes in session at a time (default: now)")
+    at.add_argument('--day', type=_day, metavar='DAY')
+    at.add_argument('--time', type=_minutes)
+    instructor = queries.add_parser('instructor', help="an instructor's classes")
+    instructor.add_argument('name')
+    instructor.add_argument('--day', type=_day, metavar='DAY')
+    for q in (free, at, instructor):
+        scoped(q)
+        formatted(q)
+    sub.set_defaults(run=query)
+
+    sub = commands.add_parser('export', help="write the stored schedule")
+    sub.add_argument('--day', type=_day, metavar='DAY')
+    sub.add_argument('--out')
+    scoped(sub)
+    sub.add_argument('--format', choices=['csv', 'json'], default='csv')
+    sub.set_defaults(run=export)
+
+    sub = commands.add_parser('calendars', help="write weekly calendars built at ingest, one file per room or instructor")
+    sub.add_argument('kind', choices=['room', 'instructor'])
+    sub.add_argument('names', nargs='*', metavar='NAME', help="default: every one in scope")
+    sub.add_argument('--out', default='.', help="directory, or a .zip file (default: current directory)")
+    scoped(sub)
+    sub.add_argument('--format', choices=['ics', 'json'], default='ics')
+    sub.set_defaults(run=calendars)
+    return parser
+
+def main() -> None:
+    args = build_parser().parse_args()
+    if hasattr(signal, 'SIGPIPE'):
+        # Piped into `head`: stop quietly rather than with a traceback.
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+    if args.database:
+        # Read by utils.database when it is first imported.
+        os.environ["SCHEDULE_DATABASE_FILE"] = args.database
+    sys.exit(args.run(args))
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,98 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from utils.database import get_schedule_data, get_all_rooms
+from utils import clock
+from utils.aggregates import DAY_CLOSE_MIN, DAY_OPEN_MIN, SLOT_MINUTES, decode_slots
+from utils.charts import room_order
+from utils.compact import with_times
+from utils.database import get_all_rooms, get_room_day_stats
+from utils.live import live_updates
+from utils.metrics import rerun, timed
+from utils.occupancy import get_occupancy_index
+from utils.scope import building_scope
 import datetime
-import pytz
-from streamlit_autorefresh import st_autorefresh
 
 st.set_page_config(page_title="Room Utilization", page_icon="🏫")
-st_autorefresh(interval=10000, key="util_refresh")  # 10-second refresh
+live_updates()  # rerun when room status changes
 
-def get_now_central():
-    central = pytz.timezone("US/Central")
-    return datetime.datetime.now(central)
+def room_heatmap(stats: pd.DataFrame, metric: str) -> None:
+    import plotly.express as px  # deferred: the slowest import on this page
 
-def room_heatmap(df: pd.DataFrame) -> None:
     st.markdown("### Room Utilization Heatmap")
+    if stats.empty:
+        st.info("No schedule data for the selected filters")
+        return
     
     # Ensure "Room" is a string (discrete category)
-    df["Room"] = df["Room"].astype(str)
-    heatmap_data = df.pivot_table(
-        index='Room',
-        columns='Meeting Day',
-        values='Course',
-        aggfunc='count',
-        fill_value=0
-    )
+    stats["Room"] = stats["Room"].astype(str)
+    heatmap_data = stats.pivot(index='Room', columns='Meeting Day', values=metric)
     heatmap_data.index = heatmap_data.index.astype(str)
-    room_order = sorted(heatmap_data.index, key=lambda x: int(x) if x.isdigit() else x)
-    heatmap_data = heatmap_data.reindex(room_order)
+    rooms = room_order(heatmap_data.index)
+    heatmap_data = heatmap_data.reindex(rooms)
     
     days_order = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri']
-    heatmap_data = heatmap_data.reindex(columns=days_order)
+    heatmap_data = heatmap_data.reindex(columns=days_order).fillna(0)
     
-    fig = px.imshow(
-        heatmap_data,
-        labels=dict(x="Day", y="Room", color="Classes"),
-        color_continuous_scale='Blues',
-        aspect="auto"
-    )
-    fig.update_yaxes(type="category", categoryorder="array", categoryarray=room_order)
-    fig.update_layout(
-        height=500,
-        hoverlabel=dict(bgcolor="white", font_size=14, font_family="sans-serif")
-    )
+    with timed('chart.room_heatmap'):
+        fig = px.imshow(
+            heatmap_data,
+            labels=dict(x="Day", y="Room", color="Utilization %" if metric == 'Utilization' else metric),
+            color_continuous_scale='Blues',
+            aspect="auto"
+        )
+        fig.update_yaxes(type="category", categoryorder="array", categoryarray=rooms)
+        fig.update_layout(
+            height=500,
+            hoverlabel=dict(bgcolor="white", font_size=14, font_family="sans-serif")
+        )
+    st.plotly_chart(fig, use_container_width=True)
+
+def time_of_day_heatmap(stats: pd.DataFrame) -> None:
+    import plotly.express as px
+
+    st.markdown("### Occupancy by Time of Day")
+
+    stats["Room"] = stats["Room"].astype(str)
+    rooms = room_order(stats["Room"])
+    slots = stats.set_index("Room")["slots"].reindex(rooms)
+    labels = [
+        datetime.time(m // 60, m % 60).strftime('%I:%M %p')
+        for m in range(0, 24 * 60, SLOT_MINUTES)
+    ]
+    grid = pd.DataFrame(
+        [decode_slots(s).astype(int) for s in slots],
+        index=rooms,
+        columns=labels
+    ).iloc[:, DAY_OPEN_MIN // SLOT_MINUTES:DAY_CLOSE_MIN // SLOT_MINUTES]
+
+    with timed('chart.time_of_day_heatmap'):
+        fig = px.imshow(
+            grid,
+            labels=dict(x="Time", y="Room", color="In Use"),
+            color_continuous_scale='Blues',
+            aspect="auto"
+        )
+        fig.update_yaxes(type="category", categoryorder="array", categoryarray=rooms)
+        fig.update_layout(height=500, coloraxis_showscale=False)
     st.plotly_chart(fig, use_container_width=True)
 
 def main():
     st.title("🏫 Room Utilization Analysis")
     st.markdown("---")
 
+    building = building_scope()
     with st.sidebar:
         st.header("🔍 Filters")
         selected_day = st.selectbox("Select Day", ["All", "Mon", "Tue", "Wed", "Thu", "Fri"])
-        selected_rooms = st.multiselect("Select Rooms", get_all_rooms())
+        selected_rooms = st.multiselect("Select Rooms", get_all_rooms(building=building))
 
     st.markdown("### Real-Time Room Status")
     
-    now = get_now_central()
+    now = clock.now()
     today_abbr = now.strftime('%a')
-    df_today = get_schedule_data(meeting_day=today_abbr)
-    now_time = now.time()
-    
-    all_rooms = get_all_rooms()
-    current_classes = df_today[(df_today['Start Time'] <= now_time) & (df_today['End Time'] >= now_time)]
+    now_minute = clock.minute_of_day(now)
+    index = get_occupancy_index(building)
+    all_rooms = index.rooms
+    current_classes = with_times(index.classes_at(today_abbr, now_minute))
     occupied_rooms = current_classes['Room'].unique().tolist()
     available_rooms = list(set(all_rooms) - set(occupied_rooms))
     
@@ -92,6 +122,8 @@ def main():
                         """)
                         if len(classes) > 1:
                             st.caption(f"+ {len(classes)-1} more concurrent classes")
+                        free_at = index.next_free(room, today_abbr, now_minute)
+                        st.caption(f"Free at {datetime.time(free_at // 60, free_at % 60).strftime('%I:%M %p')}")
         else:
             st.info("No rooms currently in use")
     with col2:
@@ -112,8 +144,14 @@ def main():
     st.markdown("---")
     st.markdown("### Weekly Patterns")
     
-    df_filtered = get_schedule_data(meeting_day=None if selected_day=="All" else selected_day, rooms=selected_rooms)
-    room_heatmap(df_filtered)
+    metric = st.radio("Show", ["Classes", "Utilization"], horizontal=True)
+    stats = get_room_day_stats(
+        meeting_day=None if selected_day=="All" else selected_day, rooms=selected_rooms, building=building
+    )
+    room_heatmap(stats, metric)
+    if selected_day != "All" and not stats.empty:
+        time_of_day_heatmap(stats)
 
 if __name__ == "__main__":
-    main()
+    with rerun("Room Utilization"):
+        main()
@@ -1,36 +1,28 @@
 import streamlit as st
-import datetime
-import pytz
-from utils.database import get_schedule_data
+from utils import clock
+from utils.compact import with_times
+from utils.occupancy import get_occupancy_index
+from utils.metrics import rerun
+from utils.scope import building_scope
 
 st.set_page_config(page_title="Active Classes", page_icon="📚")
 
-def get_now_central():
-    central = pytz.timezone("US/Central")
-    return datetime.datetime.now(central)
-
 def main():
     st.title("📚 Active Classes")
-    df = get_schedule_data()
-    
-    now = get_now_central()
-    now_time = now.time()
+    now = clock.now()
     today_abbr = now.strftime('%a')
     
-    active_classes = df[
-        (df['Meeting Day'] == today_abbr) &
-        (df['Start Time'] <= now_time) &
-        (df['End Time'] >= now_time)
-    ]
+    active_classes = get_occupancy_index(building_scope()).classes_at(today_abbr, clock.minute_of_day(now))
     
     if active_classes.empty:
         st.warning("No active classes at the moment.")
     else:
         st.dataframe(
-            active_classes[['Course', 'Course Title', 'Room', 'Instructor', 'Start Time', 'End Time']]
-            .sort_values('Start Time'),
+            with_times(active_classes.sort_values('start_min'))
+            [['Course', 'Course Title', 'Room', 'Instructor', 'Start Time', 'End Time']],
             use_container_width=True
         )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with rerun("Active Classes"):
+        main()
\ No newline at end of file
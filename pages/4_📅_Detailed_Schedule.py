@@ -1,18 +1,19 @@
+import pandas as pd
 import streamlit as st
+from utils.compact import DAYS
 from utils.database import get_schedule_data, get_all_rooms
-import datetime
-import pytz
+from utils.downloads import calendar_download
+from utils import clock
+from utils.metrics import rerun
+from utils.scope import building_scope
 
 st.set_page_config(page_title="Detailed Schedule", page_icon="📅")
 
-def get_now_central():
-    central = pytz.timezone("US/Central")
-    return datetime.datetime.now(central)
-
 def main():
     st.title("📅 Detailed Schedule")
     
-    now = get_now_central()
+    now = clock.now()
+    building = building_scope()
     with st.sidebar:
         st.header("Filters")
         weekday = now.weekday()  # 0-6
@@ -22,18 +23,25 @@ def main():
             ["All", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
             index=default_day_index
         )
-        selected_rooms = st.multiselect("Rooms", get_all_rooms())
+        selected_rooms = st.multiselect("Rooms", get_all_rooms(building=building))
         
     df = get_schedule_data(
         meeting_day=None if selected_day == "All" else selected_day[:3],
-        rooms=selected_rooms
+        rooms=selected_rooms,
+        building=building
     )
     
+    # Weekday order, not alphabetical: Mon, Tue, Wed, ...
+    df = df.assign(**{'Meeting Day': pd.Categorical(df['Meeting Day'], categories=DAYS)})
     st.dataframe(
-        df[['Course', 'Course Title', 'Meeting Day', 'Room', 'Instructor', 'Start Time', 'End Time']]
-        .sort_values(['Meeting Day', 'Start Time']),
+        df.sort_values(['Meeting Day', 'start_min', 'Room'])
+        [['Course', 'Course Title', 'Meeting Day', 'Room', 'Instructor', 'Start Time', 'End Time']],
         use_container_width=True
     )
 
+    st.subheader("Room Calendars")
+    calendar_download('room', selected_rooms or None, building, key="room_calendars")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with rerun("Detailed Schedule"):
+        main()
\ No newline at end of file
@@ -1,51 +1,71 @@
+import html
+import pandas as pd
 import streamlit as st
-from utils.database import get_schedule_data, get_all_instructors
-import datetime
-import pytz
+from utils.database import get_instructor_schedules, get_all_instructors
+from utils.tables import schedule_tables
+from utils.downloads import calendar_download
+from utils import clock
+from utils.metrics import rerun
+from utils.scope import building_scope
 
 st.set_page_config(page_title="Instructor Schedules", page_icon="🧑🏫")
 
-def get_now_central():
-    central = pytz.timezone("US/Central")
-    return datetime.datetime.now(central)
+# Instructors rendered per page; one query and one table each, however long the list.
+PAGE_SIZE = 10
 
 def main():
     st.title("🧑🏫 Instructor Schedules")
     
-    instructors = get_all_instructors()
+    building = building_scope()
+    instructors = [name for name in get_all_instructors(building=building) if pd.notna(name) and name]
     if not instructors:
         st.info("No instructors found in the database.")
         return
-    instructor = st.selectbox("Select Instructor", instructors)
-    
-    df = get_schedule_data(instructor=instructor)
-    
-    if not df.empty:
-        now = get_now_central()
-        with st.sidebar:
-            st.header("Filters")
-            weekday = now.weekday()
-            default_day_index = weekday + 1 if weekday < 5 else 0
-            selected_day = st.selectbox(
-                "Day",
-                ["All", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
-                index=default_day_index
-            )
-            
-        df = get_schedule_data(
-            meeting_day=None if selected_day == "All" else selected_day[:3],
-            instructor=instructor
+
+    now = clock.now()
+    with st.sidebar:
+        st.header("Filters")
+        weekday = now.weekday()
+        default_day_index = weekday + 1 if weekday < 5 else 0
+        selected_day = st.selectbox(
+            "Day",
+            ["All", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+            index=default_day_index
         )
-        for _, row in df.iterrows():
-            st.markdown(f"""
-            <div class="card" style="margin-bottom: 10px; color: #8e44ad;">
-                <b>{row['Course']}</b> - {row['Room']}<br>
-                {row['Start Time'].strftime('%I:%M %p')} - {row['End Time'].strftime('%I:%M %p')}<br>
-                <small>{row['Course Title']}</small>
-            </div>
-            """, unsafe_allow_html=True)
+
+    show_all = st.checkbox("Show all instructors")
+    if show_all:
+        selected = instructors
     else:
-        st.info("No classes scheduled for this instructor.")
+        selected = st.multiselect("Select Instructors", instructors, default=instructors[:1])
+    if not selected:
+        st.info("Select at least one instructor.")
+        return
+
+    pages = -(-len(selected) // PAGE_SIZE)
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+    shown = selected[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+
+    df = get_instructor_schedules(
+        shown,
+        meeting_day=None if selected_day == "All" else selected_day[:3],
+        building=building
+    )
+    tables = schedule_tables(df)
+    for instructor in shown:
+        table = tables.get(instructor)
+        st.markdown(f"""
+        <div class="card" style="margin-bottom: 10px;">
+            <b style="color: #8e44ad;">{html.escape(instructor)}</b><br>
+            {table if table is not None else "<small>No classes scheduled.</small>"}
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.subheader("Instructor Calendars")
+    calendar_download('instructor', None if show_all else selected, building, key="instructor_calendars")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with rerun("Instructor Schedules"):
+        main()
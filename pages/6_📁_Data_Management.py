@@ -1,27 +1,218 @@
 import streamlit as st
-from utils.data_processing import load_and_process_data
-from utils.database import insert_data
+import datetime
+from utils.data_processing import expand_schedule, iter_export_chunks
+from utils.database import (
+    apply_delta, get_active_term, get_partitions, get_terms, insert_data, set_active_term, stream_insert
+)
+from utils.batch import collect_exports, process_exports
+from utils.cache import cache_stats
+from utils.conflicts import conflict_summary, conflict_table, find_conflicts
+from utils.delta import normalize_meetings
+from utils.live import get_scheduler
+from utils.metrics import rerun
+from utils.upload import load_and_process_data
 
 st.set_page_config(page_title="Data Management", page_icon="📁")
 
+def stream_upload(uploaded_file, term: str, building: str) -> None:
+    """Expands and writes a large export chunk by chunk, with a progress bar.
+
+    Conflicts are checked in the database before the write commits. If
+    there are any nothing is saved, and they are shown until the file is
+    streamed again with "Save despite conflicts" ticked.
+    """
+    target = (uploaded_file.name, term, building)
+    blocked = st.session_state.get('stream_conflicts')
+    allow_conflicts = False
+    if blocked is not None and blocked[0] == target:
+        st.error("Nothing was saved")
+        allow_conflicts = conflict_gate(blocked[1], "stream")
+    if not st.button("Stream to Database"):
+        return
+
+    progress_bar = st.progress(0.0, text="Reading export...")
+
+    def update(rows_read, fraction):
+        progress_bar.progress(fraction or 0.0, text=f"{rows_read:,} rows processed")
+
+    try:
+        chunks = iter_export_chunks(uploaded_file, uploaded_file.name, progress=update)
+        summary = stream_insert(
+            (expand_schedule(chunk) for chunk in chunks), term, building, check_conflicts=not allow_conflicts
+        )
+    except Exception as e:
+        st.error(f"Data processing error: {str(e)}")
+        return
+
+    if len(summary.get('conflicts', ())):
+        st.session_state['stream_conflicts'] = (target, summary['conflicts'])
+        st.rerun()
+    st.session_state.pop('stream_conflicts', None)
+
+    progress_bar.progress(1.0, text="Done")
+    st.success(f"Data saved to database! {summary['meetings']} entries written.")
+    if summary['skipped_rows']:
+        st.warning(f"Skipped {summary['skipped_rows']} rows with an unreadable Meeting Time")
+
+def target_inputs(key: str):
+    """Term and building inputs for an upload; returns both stripped."""
+    col1, col2 = st.columns(2)
+    term = col1.text_input("Term", value=get_active_term(), key=f"{key}_term").strip()
+    building = col2.text_input(
+        "Building", key=f"{key}_building", help="Leave empty for an export that covers every building."
+    ).strip()
+    return term, building
+
+def conflict_gate(conflicts, key: str) -> bool:
+    """Shows the conflicts of a schedule about to be saved; returns whether saving is allowed."""
+    if conflicts.empty:
+        return True
+    counts = conflict_summary(conflicts)
+    st.warning(
+        f"Found {counts['Room']} double-booked room pairs and "
+        f"{counts['Instructor']} instructor conflicts"
+    )
+    with st.expander("View Conflicts"):
+        st.dataframe(conflict_table(conflicts), use_container_width=True)
+    return st.checkbox("Save despite conflicts", key=f"{key}_allow_conflicts")
+
+def batch_upload(uploaded_files, term: str, building: str) -> None:
+    """Parses many exports in worker processes, then saves the merged rows in one transaction."""
+    names = tuple(f.name for f in uploaded_files)
+    if st.button(f"Process {len(uploaded_files)} Files"):
+        exports = collect_exports(uploaded_files)
+        progress_bar = st.progress(0.0, text=f"Processing {len(exports)} exports...")
+
+        def update(name, done, total):
+            progress_bar.progress(done / total, text=f"{done} of {total} done: {name}")
+
+        result = process_exports(exports, progress=update)
+        # Checked once here rather than on every rerun of the page.
+        st.session_state['batch'] = (names, result, find_conflicts(normalize_meetings(result.schedule)))
+
+    batch = st.session_state.get('batch')
+    if batch is None or batch[0] != names:
+        return
+    _, result, conflicts = batch
+    failed = result.files[result.files['Error'] != '']
+    st.success(
+        f"Loaded {len(result.schedule)} entries from {len(result.files) - len(failed)} files, "
+        f"{result.duplicates} duplicates dropped"
+    )
+    if len(failed):
+        st.error(f"{len(failed)} files could not be read and are left out")
+    st.dataframe(result.files, use_container_width=True, hide_index=True)
+
+    allow_save = conflict_gate(conflicts, "batch")
+    replace_all = st.checkbox(
+        "Replace all existing data",
+        key="batch_replace",
+        help="By default only the rows that differ from the stored schedule of this "
+             "term and building are written."
+    )
+    if st.button("Save Batch to Database", disabled=result.schedule.empty or not allow_save):
+        if replace_all:
+            insert_data(result.schedule, term, building)
+            st.success("Data saved to database!")
+        else:
+            summary = apply_delta(result.schedule, term, building)
+            st.success(
+                f"Data saved to database! {summary['added']} added, "
+                f"{summary['removed']} removed, {summary['moved']} moved rooms, "
+                f"{summary['unchanged']} unchanged."
+            )
+        del st.session_state['batch']
+
 def main():
     st.title("📁 Data Management")
     st.warning("This is an admin-only page. Changes made here will affect the entire application.")
 
+    with st.expander("Terms and Buildings"):
+        terms = get_terms()
+        active = get_active_term()
+        selected_term = st.selectbox("Active Term", terms, index=terms.index(active))
+        if selected_term != active and st.button(f"Switch to {selected_term}"):
+            set_active_term(selected_term)
+            st.success(f"Now showing {selected_term}")
+        partitions = get_partitions()
+        st.dataframe(
+            partitions[['term', 'building', 'active']].rename(columns={
+                'term': 'Term', 'building': 'Building', 'active': 'Active'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
     with st.expander("Upload Schedule Data"):
+        term, building = target_inputs("upload")
         uploaded_file = st.file_uploader("Upload Schedule", type=["csv", "xlsx"])
-        if uploaded_file:
+        stream = st.checkbox(
+            "Stream directly to database",
+            help="For very large exports: rows are expanded and written in chunks without "
+                 "loading the whole file. Replaces the existing data of this term and building."
+        )
+        if uploaded_file and not term:
+            st.error("Enter the term this schedule is for")
+        elif uploaded_file and stream:
+            stream_upload(uploaded_file, term, building)
+        elif uploaded_file:
             df = load_and_process_data(uploaded_file)
             if df is not None:
                 st.success(f"Loaded {len(df)} entries")
-                
-                # Convert time columns to strings (to match the database schema format)
-                df['start_time'] = df['start_time'].apply(lambda x: x.strftime('%H:%M:%S') if x else None)
-                df['end_time'] = df['end_time'].apply(lambda x: x.strftime('%H:%M:%S') if x else None)
-                
-                if st.button("Save to Database"):
-                    insert_data(df)
-                    st.success("Data saved to database!")
+
+                allow_save = conflict_gate(find_conflicts(normalize_meetings(df)), "upload")
+
+                replace_all = st.checkbox(
+                    "Replace all existing data",
+                    help="By default only the rows that differ from the stored schedule of this "
+                         "term and building are written."
+                )
+                if st.button("Save to Database", disabled=not allow_save):
+                    if replace_all:
+                        insert_data(df, term, building)
+                        st.success("Data saved to database!")
+                    else:
+                        summary = apply_delta(df, term, building)
+                        st.success(
+                            f"Data saved to database! {summary['added']} added, "
+                            f"{summary['removed']} removed, {summary['moved']} moved rooms, "
+                            f"{summary['unchanged']} unchanged."
+                        )
+
+    with st.expander("Batch Upload"):
+        st.caption("Many department exports at once, or zip archives of them. Files are parsed "
+                   "in parallel and merged, and rows that appear in more than one file are kept once.")
+        term, building = target_inputs("batch")
+        uploaded_files = st.file_uploader(
+            "Upload Schedules", type=["csv", "xlsx", "zip"], accept_multiple_files=True
+        )
+        if uploaded_files and not term:
+            st.error("Enter the term these schedules are for")
+        elif uploaded_files:
+            batch_upload(uploaded_files, term, building)
+
+    with st.expander("Query Cache"):
+        stats = cache_stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Hit Rate", f"{stats['hit_rate']:.0%}")
+        col2.metric("Hits / Misses", f"{stats['hits']} / {stats['misses']}")
+        col3.metric("Memory", f"{stats['bytes'] / 1e6:.1f} MB")
+        st.caption(f"{stats['entries']} cached results, {stats['evictions']} evictions")
+
+    with st.expander("Live Updates"):
+        live = get_scheduler().stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Reruns Avoided / Hour", f"{live['avoided_per_hour']:.0f}")
+        col2.metric("Checks / Reruns", f"{live['checks']} / {live['reruns']}")
+        next_transition = live['next_transition']
+        if next_transition is None:
+            next_change = "—"
+        elif next_transition >= 24 * 60:
+            next_change = "Midnight"
+        else:
+            next_change = datetime.time(next_transition // 60, next_transition % 60).strftime('%I:%M %p')
+        col3.metric("Next Change", next_change)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with rerun("Data Management"):
+        main()
\ No newline at end of file
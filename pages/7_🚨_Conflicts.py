@@ -0,0 +1,49 @@
+import streamlit as st
+from utils.conflicts import conflict_summary, conflict_table, get_conflicts
+from utils.metrics import rerun
+from utils.scope import building_scope
+
+st.set_page_config(page_title="Conflicts", page_icon="🚨")
+
+def main():
+    st.title("🚨 Scheduling Conflicts")
+    st.caption("Rooms and instructors booked for overlapping classes in the stored schedule.")
+
+    conflicts = get_conflicts(building_scope())
+    counts = conflict_summary(conflicts)
+
+    with st.sidebar:
+        st.header("Filters")
+        selected_kind = st.selectbox("Type", ["All", "Room", "Instructor"])
+        selected_day = st.selectbox("Day", ["All", "Mon", "Tue", "Wed", "Thu", "Fri"])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">🏫 {counts['Room']}</div>
+            <div class="metric-label">Double-Booked Rooms</div>
+        </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">👩🏫 {counts['Instructor']}</div>
+            <div class="metric-label">Instructor Conflicts</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    if selected_kind != "All":
+        conflicts = conflicts[conflicts['kind'] == selected_kind]
+    if selected_day != "All":
+        conflicts = conflicts[conflicts['meeting_day'] == selected_day]
+
+    if conflicts.empty:
+        st.success("No conflicts found")
+        return
+
+    st.dataframe(conflict_table(conflicts), use_container_width=True)
+
+if __name__ == "__main__":
+    with rerun("Conflicts"):
+        main()
@@ -0,0 +1,68 @@
+import streamlit as st
+import datetime
+from utils.database import get_all_rooms
+from utils.compact import DAYS
+from utils.room_finder import find_free_rooms
+from utils.metrics import rerun
+from utils.scope import building_scope
+
+st.set_page_config(page_title="Room Finder", page_icon="🔎")
+
+def to_minutes(t: datetime.time) -> int:
+    return t.hour * 60 + t.minute
+
+def format_minutes(minute: int) -> str:
+    if minute >= 24 * 60:
+        return "End of day"
+    return datetime.time(minute // 60, minute % 60).strftime('%I:%M %p')
+
+def window_inputs(key: str, default_days, default_start, default_end):
+    col1, col2, col3 = st.columns([2, 1, 1])
+    days = col1.multiselect("Days", DAYS, default=default_days, key=f"{key}_days")
+    start = col2.time_input("From", default_start, step=300, key=f"{key}_start")
+    end = col3.time_input("To", default_end, step=300, key=f"{key}_end")
+    return days, to_minutes(start), to_minutes(end)
+
+def main():
+    st.title("🔎 Room Finder")
+    st.caption("Rooms free for the whole term on every selected day and time.")
+
+    building = building_scope()
+    windows = [window_inputs("first", ["Tue", "Thu"], datetime.time(14, 0), datetime.time(15, 15))]
+    if st.checkbox("Also free at another time"):
+        windows.append(window_inputs("second", ["Mon", "Wed", "Fri"], datetime.time(9, 0), datetime.time(9, 50)))
+    selected_rooms = st.multiselect("Only these rooms", get_all_rooms(building=building))
+
+    for days, start, end in windows:
+        if not days:
+            st.info("Pick at least one day")
+            return
+        if end <= start:
+            st.error("End time must be after start time")
+            return
+
+    results = find_free_rooms(windows, selected_rooms, building)
+    st.markdown(f"""
+    <div class="metric-card" style="background-color: #dcfce7; color: #065f46;">
+        <div class="metric-value" style="color: #065f46;">✅ {len(results)}</div>
+        <div class="metric-label" style="color: #064e3b;">Free Rooms</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if results.empty:
+        st.warning("No room is free for all of these times")
+        return
+
+    st.caption("Tightest fit first: rooms whose free gap around the requested times is smallest.")
+    st.dataframe(
+        results.assign(**{
+            'Free From': results['Free From'].map(format_minutes),
+            'Free Until': results['Free Until'].map(format_minutes),
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+if __name__ == "__main__":
+    with rerun("Room Finder"):
+        main()
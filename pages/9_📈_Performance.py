@@ -0,0 +1,75 @@
+import streamlit as st
+import pandas as pd
+from utils.cache import cache_stats
+from utils.metrics import METRICS_PORT, prometheus_text, rerun, rerun_stats, reset_metrics, stage_stats
+
+st.set_page_config(page_title="Performance", page_icon="📈")
+
+def main():
+    st.title("📈 Performance")
+    if not st.session_state.get("logged_in"):
+        st.info("This is an admin-only page. Log in on the main page to view it.")
+        return
+    st.caption("Timings recorded by this server process since it started (or since the last reset).")
+
+    stats = cache_stats()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Cache Hit Rate", f"{stats['hit_rate']:.0%}")
+    col2.metric("Cached Results", stats['entries'])
+    col3.metric("Cache Memory", f"{stats['bytes'] / 1e6:.1f} MB")
+
+    st.markdown("### Reruns by Page")
+    reruns = pd.DataFrame(rerun_stats())
+    if reruns.empty:
+        st.info("No page has run yet")
+    else:
+        st.dataframe(
+            reruns.rename(columns={
+                'page': 'Page',
+                'reruns': 'Reruns',
+                'queries_per_rerun': 'Queries / Rerun',
+                'cache_hit_rate': 'Cache Hit Rate',
+                'last_queries': 'Last Rerun Queries',
+                'last_cache_hits': 'Last Rerun Cache Hits',
+                'last_cache_misses': 'Last Rerun Cache Misses',
+            }).style.format({'Queries / Rerun': "{:.1f}", 'Cache Hit Rate': "{:.0%}"}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    st.markdown("### Stages")
+    stages = pd.DataFrame(stage_stats())
+    if not stages.empty:
+        category = st.selectbox("Category", ["All", "rerun", "db", "transform", "chart"])
+        if category != "All":
+            stages = stages[stages['stage'].str.startswith(f"{category}.")]
+        st.dataframe(
+            stages.rename(columns={
+                'stage': 'Stage',
+                'count': 'Calls',
+                'p50_ms': 'p50 (ms)',
+                'p95_ms': 'p95 (ms)',
+                'mean_ms': 'Mean (ms)',
+            }).style.format({'p50 (ms)': "{:.1f}", 'p95 (ms)': "{:.1f}", 'Mean (ms)': "{:.1f}"}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        "Download Prometheus Metrics",
+        prometheus_text(),
+        file_name="metrics.txt",
+        mime="text/plain"
+    )
+    if col2.button("Reset Metrics"):
+        reset_metrics()
+        st.rerun()
+    if METRICS_PORT:
+        st.caption(f"Prometheus can scrape these metrics at :{METRICS_PORT}/metrics")
+    else:
+        st.caption("Set SCHEDULE_METRICS_PORT to serve these metrics at /metrics for Prometheus")
+
+if __name__ == "__main__":
+    with rerun("Performance"):
+        main()
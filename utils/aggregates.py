@@ -0,0 +1,118 @@
+import sqlite3
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Width of one occupancy bitmap slot, and the slots in a day.
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+# The teaching day. Utilization is occupied time within these hours, as a
+# share of them; the free-room search measures slack up to them.
+DAY_OPEN_MIN = 8 * 60
+DAY_CLOSE_MIN = 22 * 60
+
+def room_day_stats(meetings: pd.DataFrame) -> pd.DataFrame:
+    """Aggregates meetings (room_id, meeting_day, start_min, end_min) per room and day.
+
+    Overlapping classes are counted once in occupied_min. `slots` packs one
+    bit per SLOT_MINUTES of the day, most significant bit first, set when
+    any class overlaps that slot.
+    """
+    columns = ['room_id', 'meeting_day', 'class_count', 'occupied_min', 'utilization', 'slots']
+    if meetings.empty:
+        return pd.DataFrame(columns=columns)
+
+    meetings = meetings.assign(
+        start_min=meetings['start_min'].clip(0, 24 * 60),
+        end_min=meetings['end_min'].clip(0, 24 * 60),
+    ).sort_values(['room_id', 'meeting_day', 'start_min'])
+    groups, keys = pd.MultiIndex.from_frame(meetings[['room_id', 'meeting_day']]).factorize()
+    start = meetings['start_min'].to_numpy(dtype='int64')
+    end = np.maximum(meetings['end_min'].to_numpy(dtype='int64'), start)
+
+    def union_minutes(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        # With rows sorted by start, a class only adds the part of it past
+        # the latest end seen so far in its room and day.
+        reach = pd.Series(hi).groupby(groups).cummax().groupby(groups).shift(fill_value=0)
+        covered = np.maximum(hi - np.maximum(lo, reach.to_numpy()), 0)
+        return np.bincount(groups, weights=covered, minlength=len(keys)).astype('int64')
+
+    open_min = union_minutes(start.clip(DAY_OPEN_MIN, DAY_CLOSE_MIN), end.clip(DAY_OPEN_MIN, DAY_CLOSE_MIN))
+
+    # Slot occupancy of every (room, day) from +1/-1 edges.
+    edges = np.zeros((len(keys), SLOTS_PER_DAY + 1), dtype='int32')
+    busy = end > start
+    np.add.at(edges, (groups[busy], start[busy] // SLOT_MINUTES), 1)
+    np.add.at(edges, (groups[busy], -(-end[busy] // SLOT_MINUTES)), -1)
+    slots = np.packbits(np.cumsum(edges[:, :-1], axis=1) > 0, axis=1)
+    return pd.DataFrame({
+        'room_id': keys.get_level_values(0),
+        'meeting_day': keys.get_level_values(1),
+        'class_count': np.bincount(groups, minlength=len(keys)),
+        'occupied_min': union_minutes(start, end),
+        'utilization': (open_min * 100 / (DAY_CLOSE_MIN - DAY_OPEN_MIN)).round(1),
+        'slots': [row.tobytes() for row in slots],
+    })[columns]
+
+# Meetings read at a time when rebuilding the aggregates.
+REFRESH_BATCH_ROWS = 50_000
+
+def _stats_in_batches(conn: sqlite3.Connection, where: str = "", params: Sequence = ()) -> pd.DataFrame:
+    """room_day_stats() of the meetings matching `where`, read REFRESH_BATCH_ROWS at a time.
+
+    Rows arrive in (room, day) index order, so every (room, day) but the
+    last of a batch is complete; that one is carried into the next batch.
+    Memory follows the batch size and the number of rooms, not the size
+    of the partition.
+    """
+    batches = pd.read_sql_query(
+        f"SELECT room_id, meeting_day, start_min, end_min FROM meetings {where} ORDER BY room_id, meeting_day",
+        conn, params=list(params), chunksize=REFRESH_BATCH_ROWS
+    )
+    stats, carry = [], None
+    for batch in batches:
+        if batch.empty:
+            continue
+        if carry is not None:
+            batch = pd.concat([carry, batch], ignore_index=True)
+        last = batch[['room_id', 'meeting_day']].iloc[-1]
+        tail = (batch['room_id'] == last['room_id']) & (batch['meeting_day'] == last['meeting_day'])
+        carry = batch[tail]
+        if not tail.all():
+            stats.append(room_day_stats(batch[~tail]))
+    if carry is not None:
+        stats.append(room_day_stats(carry))
+    if not stats:
+        return room_day_stats(pd.DataFrame(columns=['room_id', 'meeting_day', 'start_min', 'end_min']))
+    return pd.concat(stats, ignore_index=True)
+
+def refresh_room_day_stats(conn: sqlite3.Connection, partition_id: Optional[int] = None) -> None:
+    """Rebuilds room_day_stats from the meetings table; call inside the ingest transaction.
+
+    With `partition_id`, only that partition's rows are rebuilt. Without
+    it the whole table is, in its pre-partition (schema v5) form.
+    """
+    if partition_id is None:
+        stats = _stats_in_batches(conn)
+        conn.execute("DELETE FROM room_day_stats")
+        conn.executemany(
+            "INSERT INTO room_day_stats (room_id, meeting_day, class_count, occupied_min, utilization, slots) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            stats.astype(object).itertuples(index=False, name=None)
+        )
+        return
+
+    stats = _stats_in_batches(conn, "WHERE partition_id = ?", [partition_id])
+    stats.insert(0, 'partition_id', partition_id)
+    conn.execute("DELETE FROM room_day_stats WHERE partition_id = ?", (partition_id,))
+    conn.executemany(
+        "INSERT INTO room_day_stats (partition_id, room_id, meeting_day, class_count, occupied_min, "
+        "utilization, slots) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        stats.astype(object).itertuples(index=False, name=None)
+    )
+
+def decode_slots(slots: bytes) -> np.ndarray:
+    """Unpacks a `slots` bitmap into SLOTS_PER_DAY booleans."""
+    return np.unpackbits(np.frombuffer(slots, dtype='uint8'))[:SLOTS_PER_DAY].astype(bool)
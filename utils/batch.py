@@ -0,0 +1,129 @@
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_processing import KEEP_COLUMNS, check_columns, expand_schedule
+from utils.metrics import timed
+
+EXPORT_EXTENSIONS = ('.csv', '.xlsx')
+
+# Worker processes for batch ingest; by default one per core.
+INGEST_WORKERS = int(os.environ.get("SCHEDULE_INGEST_WORKERS", 0)) or os.cpu_count() or 1
+
+# (file name, contents) of one export.
+Export = Tuple[str, bytes]
+
+class BatchResult(NamedTuple):
+    schedule: pd.DataFrame  # expanded rows of every file, duplicates dropped
+    files: pd.DataFrame     # per file: File, Meetings, Skipped Rows, Error
+    duplicates: int         # rows dropped because another file (or row) had them
+
+def _add_export(exports: List[Export], name: str, data: bytes) -> None:
+    if name.lower().endswith('.zip'):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or member.filename.startswith('__MACOSX/'):
+                    continue
+                if member.filename.lower().endswith(EXPORT_EXTENSIONS):
+                    exports.append((member.filename, archive.read(member)))
+    elif name.lower().endswith(EXPORT_EXTENSIONS):
+        exports.append((name, data))
+
+def collect_exports(sources: Iterable) -> List[Export]:
+    """(name, contents) of every CSV/XLSX export in `sources`.
+
+    A source is an uploaded file, a path to a file or a directory (walked
+    recursively), or a zip archive of exports in either form. Other files
+    are ignored.
+    """
+    exports: List[Export] = []
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            if os.path.isdir(source):
+                for root, dirs, files in os.walk(source):
+                    dirs.sort()
+                    for name in sorted(files):
+                        with open(os.path.join(root, name), 'rb') as f:
+                            _add_export(exports, os.path.relpath(os.path.join(root, name), source), f.read())
+            else:
+                with open(source, 'rb') as f:
+                    _add_export(exports, os.path.basename(source), f.read())
+        else:
+            data = source.getvalue() if hasattr(source, 'getvalue') else source.read()
+            _add_export(exports, source.name, data)
+    return exports
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Workers must not fork the app process itself, which has threads of its
+    # own. Where available they fork from a clean server process that has
+    # already imported this module, so each starts in milliseconds.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['utils.batch'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+def parse_export(name: str, data: bytes) -> Tuple[pd.DataFrame, int]:
+    """Reads and expands one export; returns the rows and the number skipped for their Meeting Time.
+
+    Runs in the worker processes. Raises ValueError if required columns
+    are missing.
+    """
+    source = io.BytesIO(data)
+    df = pd.read_csv(source) if name.lower().endswith('.csv') else pd.read_excel(source)
+    check_columns(df.columns)
+    expanded = expand_schedule(df)
+    return expanded, expanded.attrs['time_parse_failures']
+
+@timed('transform.batch_ingest')
+def process_exports(
+    exports: List[Export],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None
+) -> BatchResult:
+    """Parses and expands many exports in parallel and merges them.
+
+    Files are spread over a process pool of `workers` (INGEST_WORKERS by
+    default); a single file or worker runs in this process. A file that
+    fails is reported in `files` and left out. Rows that appear more than
+    once across the batch, such as a cross-listed class in two
+    departments' exports, are kept once. `progress(name, done, total)` is
+    called as each file finishes, in completion order.
+    """
+    workers = min(workers or INGEST_WORKERS, len(exports)) or 1
+    # Keyed by position in `exports`: two archives may hold the same file name.
+    frames, rows = {}, {}
+
+    def record(i, parse):
+        try:
+            frames[i], skipped = parse()
+            rows[i] = {'Meetings': len(frames[i]), 'Skipped Rows': skipped, 'Error': ''}
+        except Exception as e:
+            rows[i] = {'Meetings': 0, 'Skipped Rows': 0, 'Error': str(e)}
+        if progress:
+            progress(exports[i][0], len(rows), len(exports))
+
+    if workers == 1:
+        for i, (name, data) in enumerate(exports):
+            record(i, lambda: parse_export(name, data))
+    else:
+        with ProcessPoolExecutor(workers, mp_context=_pool_context()) as pool:
+            futures = {pool.submit(parse_export, name, data): i for i, (name, data) in enumerate(exports)}
+            for future in as_completed(futures):
+                record(futures[future], future.result)
+
+    # Merge in the order the files were given, whatever order they finished in.
+    ordered = [frames[i] for i in range(len(exports)) if i in frames]
+    schedule = pd.concat(ordered, ignore_index=True) if ordered else pd.DataFrame(columns=KEEP_COLUMNS)
+    total = len(schedule)
+    schedule = schedule.drop_duplicates(ignore_index=True)
+    files = pd.DataFrame(
+        [dict(File=name, **rows[i]) for i, (name, _) in enumerate(exports)],
+        columns=['File', 'Meetings', 'Skipped Rows', 'Error']
+    )
+    return BatchResult(schedule=schedule, files=files, duplicates=total - len(schedule))
@@ -0,0 +1,183 @@
+import functools
+import inspect
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import pandas as pd
+
+from utils.metrics import increment
+
+# Upper bound on the memory held by cached results, in bytes.
+CACHE_MAX_BYTES = int(os.environ.get("SCHEDULE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a cached result."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+# Under Copy-on-Write (always on from pandas 3) a caller's writes copy only
+# the columns they touch, so a shallow copy is enough to protect an entry.
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.options.mode.copy_on_write
+
+def _defensive_copy(value: Any) -> Any:
+    # Pages mutate what they get back (e.g. df["Room"] = ...), so every
+    # caller receives its own copy of a shared entry.
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=not _COPY_ON_WRITE)
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+class ResultCache:
+    """A process-wide, memory-bounded LRU of query results tagged with a data version.
+
+    An entry is only served while its version matches the current one, and
+    concurrent misses on the same key wait for a single computation.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any, int]]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable, version: Any):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+        return False, None
+
+    def get_or_compute(self, key: Hashable, version: Any, compute: Callable[[], Any]) -> Any:
+        """Returns the cached result for `key` at `version`, computing it at most once."""
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if not found:
+                key_lock = self._inflight.setdefault(key, threading.Lock())
+        if found:
+            increment('cache.hit')
+            return value
+
+        with key_lock:
+            try:
+                with self._lock:
+                    found, value = self._lookup(key, version)
+                    if not found:
+                        self.misses += 1
+                increment('cache.hit' if found else 'cache.miss')
+                if found:
+                    return value
+                value = compute()
+                self._store(key, version, value)
+            finally:
+                with self._lock:
+                    if self._inflight.get(key) is key_lock:
+                        del self._inflight[key]
+        return value
+
+    def _store(self, key: Hashable, version: Any, value: Any) -> None:
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current footprint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+_cache = ResultCache()
+
+def cached_query(kind: str, version: Callable[[], Any]) -> Callable:
+    """Caches a query function's results per (kind, arguments) until `version()` changes.
+
+    List arguments (e.g. room filters) are frozen into tuples for the key.
+    """
+    def freeze(value):
+        return tuple(value) if isinstance(value, list) else value
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (kind, tuple(freeze(a) for a in args),
+                   tuple(sorted((k, freeze(v)) for k, v in kwargs.items())))
+            value = _cache.get_or_compute(key, version(), lambda: func(*args, **kwargs))
+            return _defensive_copy(value)
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+def shared_instance(version: Callable[[], Any]) -> Callable:
+    """Keeps one process-wide result of a builder per arguments, rebuilt when `version()` changes.
+
+    For structures built from the whole schedule (indexes, finders) that
+    every session reads and none modifies: unlike cached_query() results
+    they live outside the LRU, are never evicted and are not copied.
+    """
+    def decorator(build: Callable) -> Callable:
+        built: Dict[Hashable, Tuple[Any, Any]] = {}
+        lock = threading.Lock()
+        signature = inspect.signature(build)
+
+        @functools.wraps(build)
+        def wrapper(*args, **kwargs):
+            # f(), f(None) and f(building=None) share one instance.
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(bound.arguments.items())
+            current = version()
+            entry = built.get(key)
+            if entry is None or entry[0] != current:
+                with lock:
+                    entry = built.get(key)
+                    if entry is None or entry[0] != current:
+                        entry = built[key] = (current, build(*args, **kwargs))
+            return entry[1]
+        return wrapper
+    return decorator
+
+def cache_stats() -> Dict[str, Any]:
+    """Returns hit/miss metrics for the shared query cache."""
+    return _cache.stats()
+
+def clear_cache() -> None:
+    """Drops every cached result."""
+    _cache.clear()
@@ -0,0 +1,222 @@
+import datetime
+import io
+import json
+import re
+import sqlite3
+import zipfile
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import clock
+from utils.compact import DAYS
+
+# Calendars built per partition at ingest: one per room and one per instructor.
+KINDS = ['room', 'instructor']
+
+# iCalendar BYDAY codes, in DAYS order.
+_ICS_DAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+# Longest iCalendar content line, in octets, before it must be folded.
+_ICS_LINE_OCTETS = 75
+
+def _week_start() -> datetime.date:
+    # Weekly events start in the week the calendar is built; RRULE repeats them.
+    today = clock.now().date()
+    return today - datetime.timedelta(days=today.weekday())
+
+# Escapes for iCalendar TEXT values (RFC 5545 3.3.11).
+_ICS_ESCAPES = str.maketrans({'\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n'})
+
+def _fold(line: str) -> str:
+    """Folds a content line longer than 75 octets onto continuation lines."""
+    data = line.encode('utf-8')
+    if len(data) <= _ICS_LINE_OCTETS:
+        return line
+    parts, start, limit = [], 0, _ICS_LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1  # never split a UTF-8 sequence
+        parts.append(data[start:end].decode('utf-8'))
+        start, limit = end, _ICS_LINE_OCTETS - 1
+    return '\r\n '.join(parts)
+
+def _content_lines(name: str, values: pd.Series) -> list:
+    """Escaped, folded `name:value` lines; each distinct value is formatted once."""
+    codes, uniques = pd.factorize(values)
+    lines = np.array([_fold(f"{name}:{value.translate(_ICS_ESCAPES)}") for value in uniques.tolist()], dtype=object)
+    return lines[codes].tolist()
+
+_json_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+def _json_values(values: pd.Series) -> list:
+    """JSON for each value ('' as null); each distinct value is encoded once."""
+    codes, uniques = pd.factorize(values)
+    encoded = np.array([_json_encode(value or None) for value in uniques.tolist()], dtype=object)
+    return encoded[codes].tolist()
+
+# 'HH:MM' and iCalendar 'HHMMSS' for every minute of the day, indexed by minute.
+_HHMM = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)], dtype=object)
+_ICS_TIMES = [f"{m // 60:02d}{m % 60:02d}00" for m in range(24 * 60)]
+
+def calendar_rows(
+    meetings: pd.DataFrame, week_start: Optional[datetime.date] = None, kinds: List[str] = KINDS
+) -> pd.DataFrame:
+    """Builds the weekly calendar of every room and every instructor in `meetings` in one pass.
+
+    `meetings` has course, course_title, instructor, room, meeting_day,
+    start_min, end_min and row_hash (each event's UID), with '' for missing
+    text. Returns kind, name, events (a JSON array) and vevents (iCalendar
+    VEVENT blocks), each calendar's classes ordered by weekday (Mon first)
+    and then start time.
+    Events recur weekly from the week of `week_start` (default: this week).
+    Rows without an instructor get no instructor calendar. `kinds` limits
+    the calendars built to some of KINDS.
+    """
+    columns = ['kind', 'name', 'events', 'vevents']
+    meetings = meetings[meetings['meeting_day'].isin(DAYS)].drop_duplicates(
+        ['course', 'course_title', 'instructor', 'room', 'meeting_day', 'start_min', 'end_min']
+    )
+    if meetings.empty:
+        return pd.DataFrame(columns=columns)
+
+    day = pd.Categorical(meetings['meeting_day'], categories=DAYS).codes
+    meetings = meetings.assign(day=day).sort_values(['day', 'start_min', 'room', 'course'], kind='stable')
+    meetings = meetings.reset_index(drop=True)
+    day = meetings['day'].to_numpy()
+    start = meetings['start_min'].to_numpy(dtype='int64').clip(0, 24 * 60 - 1)
+    end = meetings['end_min'].to_numpy(dtype='int64').clip(0, 24 * 60 - 1)
+
+    # Each distinct text is escaped once, then every meeting's event is one format call.
+    events = np.array([
+        f'{{"day":"{DAYS[d]}","start":"{_HHMM[s]}","end":"{_HHMM[e]}",'
+        f'"course":{course},"title":{title},"instructor":{instructor},"room":{room}}}'
+        for d, s, e, course, title, instructor, room in zip(
+            day.tolist(), start.tolist(), end.tolist(),
+            _json_values(meetings['course']),
+            _json_values(meetings['course_title']),
+            _json_values(meetings['instructor']),
+            _json_values(meetings['room'])
+        )
+    ], dtype=object)
+
+    week_start = week_start or _week_start()
+    dates = [(week_start + datetime.timedelta(days=d)).strftime('%Y%m%d') for d in range(7)]
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    summary = meetings['course'].where(
+        meetings['course_title'] == '', meetings['course'] + ' ' + meetings['course_title']
+    )
+    uids = meetings['row_hash'].to_numpy(dtype='int64').view('uint64').tolist()
+    # Rooms and instructors share each meeting's event; its UID is the same in both calendars.
+    vevents = np.array([
+        f"BEGIN:VEVENT\r\nUID:{uid:016x}@schedule_management\r\nDTSTAMP:{stamp}\r\n"
+        f"DTSTART:{dates[d]}T{_ICS_TIMES[s]}\r\nDTEND:{dates[d]}T{_ICS_TIMES[e]}\r\n"
+        f"RRULE:FREQ=WEEKLY;BYDAY={_ICS_DAYS[d]}\r\n{what}\r\n{where}\r\n{who}\r\nEND:VEVENT\r\n"
+        for uid, d, s, e, what, where, who in zip(
+            uids, day.tolist(), start.tolist(), end.tolist(),
+            _content_lines('SUMMARY', summary),
+            _content_lines('LOCATION', meetings['room']),
+            _content_lines('DESCRIPTION', meetings['instructor'])
+        )
+    ], dtype=object)
+
+    frames = []
+    for kind in kinds:
+        key = meetings[kind]
+        keep = (key != '').to_numpy()
+        codes, names = pd.factorize(key[keep], sort=True)
+        # Each name's rows together, still in weekday order; one str.join per calendar.
+        order = np.argsort(codes, kind='stable')
+        ends = np.cumsum(np.bincount(codes, minlength=len(names))).tolist()
+        spans = list(zip([0] + ends[:-1], ends))
+        kind_events, kind_vevents = events[keep][order].tolist(), vevents[keep][order].tolist()
+        frames.append(pd.DataFrame({
+            'kind': kind,
+            'name': names,
+            'events': ['[' + ','.join(kind_events[a:b]) + ']' for a, b in spans],
+            'vevents': [''.join(kind_vevents[a:b]) for a, b in spans],
+        }))
+    return pd.concat(frames, ignore_index=True)[columns]
+
+# Meetings read at a time when rebuilding a partition's calendars.
+REFRESH_BATCH_ROWS = 50_000
+
+def refresh_calendars(conn: sqlite3.Connection, partition_id: int) -> None:
+    """Rebuilds one partition's stored calendars from the meetings table; call inside the ingest transaction.
+
+    Each kind's meetings are read REFRESH_BATCH_ROWS at a time in (room or
+    instructor) index order, so every calendar but the last of a batch is
+    complete and is written at once; the last one is carried into the next
+    batch. Memory follows the batch size, not the size of the partition.
+    """
+    conn.execute("DELETE FROM calendars WHERE partition_id = ?", (partition_id,))
+    week_start = _week_start()
+
+    def write(meetings: pd.DataFrame, kind: str) -> None:
+        calendars = calendar_rows(meetings, week_start, [kind])
+        calendars.insert(0, 'partition_id', partition_id)
+        conn.executemany(
+            "INSERT INTO calendars (partition_id, kind, name, events, vevents) VALUES (?, ?, ?, ?, ?)",
+            calendars.astype(object).itertuples(index=False, name=None)
+        )
+
+    # The column each kind's calendars are named by.
+    names = {'room': 'r.name', 'instructor': 'i.name'}
+    for kind in KINDS:
+        batches = pd.read_sql_query(f"""
+            SELECT c.code AS course, c.title AS course_title, i.name AS instructor, r.name AS room,
+                   m.meeting_day, m.start_min, m.end_min, m.row_hash, m.{kind}_id AS calendar_id
+            FROM meetings m
+            JOIN rooms r ON r.id = m.room_id
+            JOIN instructors i ON i.id = m.instructor_id
+            JOIN courses c ON c.id = m.course_id
+            WHERE m.partition_id = ? AND {names[kind]} != ''
+            ORDER BY m.{kind}_id
+        """, conn, params=[partition_id], chunksize=REFRESH_BATCH_ROWS)
+        carry = None
+        for batch in batches:
+            if batch.empty:
+                continue
+            if carry is not None:
+                batch = pd.concat([carry, batch], ignore_index=True)
+            tail = batch['calendar_id'] == batch['calendar_id'].iloc[-1]
+            carry = batch[tail]
+            if not tail.all():
+                write(batch[~tail], kind)
+        if carry is not None:
+            write(carry, kind)
+
+def ics_document(name: str, vevents: List[str]) -> str:
+    """A VCALENDAR of stored VEVENT blocks, from one or more partitions."""
+    return (
+        'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//schedule_management//Weekly Calendar//EN\r\n'
+        'CALSCALE:GREGORIAN\r\n' + _fold('X-WR-CALNAME:' + name.translate(_ICS_ESCAPES)) + '\r\n'
+        'X-WR-TIMEZONE:America/Chicago\r\n' + ''.join(vevents) + 'END:VCALENDAR\r\n'
+    )
+
+def json_document(kind: str, name: str, events: List[str]) -> str:
+    """A calendar's JSON from stored event arrays; parts from several partitions are merged in weekday order."""
+    if len(events) == 1:
+        body = events[0]
+    else:
+        order = {day: i for i, day in enumerate(DAYS)}
+        merged = sorted(
+            (event for part in events for event in json.loads(part)),
+            key=lambda e: (order[e['day']], e['start'], e['room'])
+        )
+        body = json.dumps(merged, ensure_ascii=False, separators=(',', ':'))
+    return f'{{"kind":{json.dumps(kind)},"name":{json.dumps(name, ensure_ascii=False)},"events":{body}}}'
+
+def calendar_filename(name: str, fmt: str) -> str:
+    """A file name for a room's or instructor's calendar."""
+    return (re.sub(r'[^\w.-]+', '_', name).strip('_') or 'calendar') + '.' + fmt
+
+def calendar_archive(calendars: Dict[str, str], fmt: str) -> bytes:
+    """Zips calendar documents (name -> text), one file each."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, document in calendars.items():
+            archive.writestr(calendar_filename(name, fmt), document)
+    return buffer.getvalue()
@@ -0,0 +1,137 @@
+import datetime
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cached_query
+from utils.compact import text
+from utils.database import get_data_version
+from utils.metrics import timed
+from utils.occupancy import get_occupancy_index
+
+if TYPE_CHECKING:
+    # plotly is imported on first use; it is the slowest import on the Dashboard.
+    import plotly.graph_objects as go
+
+def room_order(rooms) -> List[str]:
+    """Distinct room names, numeric ones first in numeric order."""
+    return sorted(
+        set(str(room) for room in rooms),
+        key=lambda x: (0, int(x), '') if x.isdigit() else (1, 0, x)
+    )
+
+@timed('chart.timeline')
+def build_timeline(schedule: pd.DataFrame, base_date: datetime.date) -> 'go.Figure':
+    """Builds the day's timeline without the current-time marker.
+
+    All classes go into a single horizontal bar trace colored by course,
+    as px.timeline draws them, so the figure stays small however many
+    courses meet that day.
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    starts = pd.Timestamp(base_date) + pd.to_timedelta(schedule['start_min'].to_numpy(dtype='int64'), unit='min')
+    durations = (schedule['end_min'] - schedule['start_min']).to_numpy(dtype='int64') * 60_000
+    codes, _ = pd.factorize(schedule['Course'])
+    rooms = schedule['Room'].astype(str)
+    order = room_order(rooms)
+
+    fig = go.Figure(go.Bar(
+        base=starts,
+        x=durations,
+        y=rooms,
+        orientation='h',
+        marker_color=np.asarray(qualitative.Pastel, dtype=object)[codes % len(qualitative.Pastel)],
+        customdata=np.column_stack([
+            text(schedule['Course']),
+            text(schedule['Course Title']),
+            text(schedule['Instructor']),
+            (starts + pd.to_timedelta(durations, unit='ms')).strftime('%I:%M %p'),
+        ]),
+        hovertemplate=(
+            "<b>%{customdata[0]}</b> %{customdata[1]}<br>"
+            "Room %{y}, %{base|%I:%M %p} - %{customdata[3]}<br>"
+            "%{customdata[2]}<extra></extra>"
+        ),
+        showlegend=False
+    ))
+    fig.update_yaxes(type="category", categoryorder="array", categoryarray=order)
+    fig.update_layout(
+        title="Live Schedule Timeline",
+        barmode='overlay',
+        height=600,
+        xaxis_title="Time",
+        yaxis_title="Rooms",
+        xaxis=dict(
+            type='date',
+            tickformat="%I:%M %p"
+        ),
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=14,
+            font_family="sans-serif",
+            font_color="black"
+        )
+    )
+    return fig
+
+@cached_query('timeline', version=get_data_version)
+def get_timeline(day: str, base_date: datetime.date, building: Optional[str] = None) -> 'go.Figure':
+    """The static timeline for `day`, built once per data version and shared by every session.
+
+    Callers must not modify the returned figure; use timeline_at().
+    """
+    return build_timeline(get_occupancy_index(building).day_schedule(day), base_date)
+
+@timed('chart.timeline_marker')
+def _with_marker(static: 'go.Figure', now: datetime.datetime) -> 'go.Figure':
+    import plotly.graph_objects as go
+
+    # Shares the static trace; only the layout is copied and patched.
+    fig = go.Figure(data=static.data, layout=static.layout, skip_invalid=True)
+    fig.add_shape(
+        type="line",
+        x0=now,
+        x1=now,
+        y0=0,
+        y1=1,
+        xref="x",
+        yref="paper",
+        line=dict(
+            color="red",
+            width=2,
+            dash="dash"
+        )
+    )
+    fig.add_annotation(
+        x=now,
+        y=1,
+        xref="x",
+        yref="paper",
+        text="Current Time",
+        showarrow=False,
+        yanchor="bottom",
+        font=dict(color="red")
+    )
+    return fig
+
+# Building -> (key, marked figure).
+_marked: Dict[Optional[str], Tuple[tuple, 'go.Figure']] = {}
+_marked_lock = threading.Lock()
+
+def timeline_at(day: str, now: datetime.datetime, building: Optional[str] = None) -> 'go.Figure':
+    """The timeline for `day` with the current-time marker at `now`, to the minute.
+
+    The marked figure is rebuilt at most once per minute and data version,
+    however many sessions refresh in between.
+    """
+    now = now.replace(second=0, microsecond=0)
+    key = (get_data_version(), day, now)
+    with _marked_lock:
+        entry = _marked.get(building)
+        if entry is None or entry[0] != key:
+            entry = _marked[building] = (key, _with_marker(get_timeline(day, now.date(), building), now))
+        return entry[1]
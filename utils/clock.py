@@ -0,0 +1,60 @@
+import contextlib
+import contextvars
+import datetime
+from typing import Callable, Iterator, Optional
+
+import pytz
+
+# Every wall-clock time in the schedule is US/Central.
+TIMEZONE = pytz.timezone("US/Central")
+
+# Replaces the system clock when set, e.g. by tests.
+_source: Optional[Callable[[], datetime.datetime]] = None
+
+# The time pinned for the current page run, if any. Each Streamlit session
+# runs its script in its own thread, so runs never see each other's.
+_pinned: contextvars.ContextVar[Optional[datetime.datetime]] = contextvars.ContextVar('pinned_now', default=None)
+
+def set_clock(source: Optional[Callable[[], datetime.datetime]]) -> None:
+    """Makes now() read `source` instead of the system clock; None restores the system clock.
+
+    `source` may return naive datetimes, taken as Central wall-clock time.
+    """
+    global _source
+    _source = source
+
+def localize(moment: datetime.datetime) -> datetime.datetime:
+    """`moment` as an aware US/Central datetime.
+
+    Naive values are Central wall-clock times. In the hour repeated when
+    DST ends, the standard-time reading is used; a time in the hour
+    skipped when DST starts is moved an hour later, past the gap.
+    """
+    if moment.tzinfo is None:
+        return TIMEZONE.normalize(TIMEZONE.localize(moment, is_dst=False))
+    return moment.astimezone(TIMEZONE)
+
+def now() -> datetime.datetime:
+    """The current US/Central time; within pinned(), the time read when it was entered."""
+    pinned_now = _pinned.get()
+    if pinned_now is not None:
+        return pinned_now
+    if _source is not None:
+        return localize(_source())
+    return datetime.datetime.now(TIMEZONE)
+
+@contextlib.contextmanager
+def pinned() -> Iterator[datetime.datetime]:
+    """Reads the clock once; now() returns that time until the block exits.
+
+    Wraps each page run, so everything a rerun shows agrees on the minute.
+    """
+    token = _pinned.set(now())
+    try:
+        yield _pinned.get()
+    finally:
+        _pinned.reset(token)
+
+def minute_of_day(moment: datetime.datetime) -> int:
+    """Minutes since midnight on the wall clock, the unit schedule times are stored in."""
+    return moment.hour * 60 + moment.minute
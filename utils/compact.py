@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from utils.time_parsing import minutes_to_times
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Repeated strings, stored once each as categories.
+TEXT_COLUMNS = ['Course', 'Course Title', 'Instructor', 'Room']
+
+def compact_schedule(schedule: pd.DataFrame) -> pd.DataFrame:
+    """get_schedule_data() rows in their smallest form.
+
+    Text columns become categoricals, 'Meeting Day' a categorical over
+    DAYS (one byte per row) and the minute columns int16. There are no
+    datetime.time columns; with_times() adds them to the rows being shown.
+    """
+    frame = pd.DataFrame({col: pd.Categorical(schedule[col]) for col in TEXT_COLUMNS})
+    frame['Meeting Day'] = pd.Categorical(schedule['Meeting Day'], categories=DAYS)
+    frame['start_min'] = schedule['start_min'].to_numpy(dtype='int16')
+    frame['end_min'] = schedule['end_min'].to_numpy(dtype='int16')
+    return frame
+
+def lookup_categorical(ids: np.ndarray, keys: np.ndarray, values: pd.Series) -> pd.Categorical:
+    """A categorical of `values` looked up by id, for rows holding `ids` into a (keys, values) table.
+
+    Built from integer codes, so no string is touched per row. Missing
+    values and unknown ids become NaN.
+    """
+    # An empty read comes back with object columns.
+    ids, keys = ids.astype('int64'), keys.astype('int64')
+    codes, categories = pd.factorize(values)
+    lookup = np.full(int(keys.max(initial=0)) + 2, -1, dtype='int32')
+    lookup[keys] = codes
+    ids = np.where((ids >= 0) & (ids < len(lookup) - 1), ids, len(lookup) - 1)
+    return pd.Categorical.from_codes(lookup[ids], categories=categories)
+
+def with_times(df: pd.DataFrame) -> pd.DataFrame:
+    """`df` plus 'Start Time' and 'End Time' as datetime.time, for display."""
+    return df.assign(
+        **{'Start Time': minutes_to_times(df['start_min']), 'End Time': minutes_to_times(df['end_min'])}
+    )
+
+def text(values: pd.Series) -> pd.Series:
+    """A categorical (or object) column as plain strings, missing values as ''."""
+    return values.astype(object).fillna('').astype(str)
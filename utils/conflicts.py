@@ -0,0 +1,163 @@
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import cached_query
+from utils.compact import DAYS
+from utils.database import get_data_version, get_schedule_data
+from utils.metrics import timed
+from utils.time_parsing import minutes_to_times
+
+# (kind, column) pairs checked for double bookings.
+RESOURCES = [('Room', 'room'), ('Instructor', 'instructor')]
+
+CONFLICT_COLUMNS = [
+    'kind', 'meeting_day', 'resource', 'course_a', 'course_b',
+    'room_a', 'room_b', 'instructor_a', 'instructor_b', 'start_min', 'end_min'
+]
+
+def overlapping_pairs(groups: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+    """Returns every pair of positions (i, j) in the same group whose intervals overlap.
+
+    Intervals are half-open, so back-to-back classes do not overlap. Sorts
+    once and sweeps: each interval pairs with the later-starting intervals
+    of its group that start before it ends, found with one searchsorted,
+    for O(n log n + k) over k pairs.
+    """
+    order = np.lexsort((starts, groups))
+    g, s, e = groups[order], starts[order], ends[order]
+
+    # A sortable (group, minute) key; minutes stay below 2**16.
+    keys = g.astype('int64') << 16 | s
+    stop = np.searchsorted(keys, g.astype('int64') << 16 | e, side='left')
+    counts = np.maximum(stop - np.arange(len(keys)) - 1, 0)
+
+    left = np.repeat(np.arange(len(keys)), counts)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts)
+    right = left + 1 + offsets
+    # Zero-length classes can start inside a class yet not overlap it.
+    keep = s[right] < e[left]
+    return order[left[keep]], order[right[keep]]
+
+@timed('transform.conflicts')
+def find_conflicts(meetings: pd.DataFrame, resources: List[Tuple[str, str]] = RESOURCES) -> pd.DataFrame:
+    """Finds double-booked rooms and instructors in normalized meeting rows.
+
+    Expects normalize_meetings() columns. Pairs of the same course are not
+    conflicts (multi-room sections, combined sections), nor are meetings
+    without an instructor. Returns one row per overlapping pair with the
+    overlap in start_min/end_min. `resources` limits the check to some of
+    the RESOURCES.
+    """
+    meetings = meetings.reset_index(drop=True)
+    starts = meetings['start_min'].to_numpy(dtype='int64')
+    ends = meetings['end_min'].to_numpy(dtype='int64')
+    course = meetings['course'].to_numpy()
+    course_codes, _ = pd.factorize(course)
+    days = meetings['meeting_day'].to_numpy()
+    day_codes, _ = pd.factorize(days)
+
+    found = []
+    for kind, column in resources:
+        resource = meetings[column].to_numpy()
+        candidates = np.flatnonzero(resource != '')
+        resource_codes, uniques = pd.factorize(resource[candidates])
+        groups = day_codes[candidates] * len(uniques) + resource_codes
+        i, j = overlapping_pairs(groups, starts[candidates], ends[candidates])
+        i, j = candidates[i], candidates[j]
+        distinct = course_codes[i] != course_codes[j]
+        i, j = i[distinct], j[distinct]
+        found.append(pd.DataFrame({
+            'kind': kind,
+            'meeting_day': days[i],
+            'resource': resource[i],
+            'course_a': course[i],
+            'course_b': course[j],
+            'room_a': meetings['room'].to_numpy()[i],
+            'room_b': meetings['room'].to_numpy()[j],
+            'instructor_a': meetings['instructor'].to_numpy()[i],
+            'instructor_b': meetings['instructor'].to_numpy()[j],
+            'start_min': np.maximum(starts[i], starts[j]),
+            'end_min': np.minimum(ends[i], ends[j]),
+        }, columns=CONFLICT_COLUMNS))
+    return pd.concat(found, ignore_index=True)
+
+# Meetings read at a time when checking a stored partition.
+CHECK_BATCH_ROWS = 50_000
+
+def partition_conflicts(conn: sqlite3.Connection, partition_id: int) -> pd.DataFrame:
+    """find_conflicts() over one stored partition; call inside the ingest transaction.
+
+    Each resource's meetings are read CHECK_BATCH_ROWS at a time in
+    (resource, day) index order. Only meetings of the same resource and day
+    can conflict, so every group but the last of a batch is complete; that
+    one is carried into the next batch. Memory follows the batch size and
+    the number of conflicts, not the size of the partition.
+    """
+    found = []
+    for kind, column in RESOURCES:
+        batches = pd.read_sql_query(f"""
+            SELECT c.code AS course, i.name AS instructor, m.meeting_day, r.name AS room,
+                   m.start_min, m.end_min, m.{column}_id AS resource_id
+            FROM meetings m
+            JOIN rooms r ON r.id = m.room_id
+            JOIN instructors i ON i.id = m.instructor_id
+            JOIN courses c ON c.id = m.course_id
+            WHERE m.partition_id = ?
+            ORDER BY m.{column}_id, m.meeting_day
+        """, conn, params=[partition_id], chunksize=CHECK_BATCH_ROWS)
+        carry = None
+        for batch in batches:
+            if batch.empty:
+                continue
+            if carry is not None:
+                batch = pd.concat([carry, batch], ignore_index=True)
+            last = batch[['resource_id', 'meeting_day']].iloc[-1]
+            tail = (batch['resource_id'] == last['resource_id']) & (batch['meeting_day'] == last['meeting_day'])
+            carry = batch[tail]
+            if not tail.all():
+                found.append(find_conflicts(batch[~tail], [(kind, column)]))
+        if carry is not None:
+            found.append(find_conflicts(carry, [(kind, column)]))
+    if not found:
+        return pd.DataFrame(columns=CONFLICT_COLUMNS)
+    return pd.concat(found, ignore_index=True)
+
+def conflict_summary(conflicts: pd.DataFrame) -> Dict[str, int]:
+    """Counts conflicting pairs per kind."""
+    counts = conflicts['kind'].value_counts()
+    return {kind: int(counts.get(kind, 0)) for kind, _ in RESOURCES}
+
+def conflict_table(conflicts: pd.DataFrame) -> pd.DataFrame:
+    """Conflicts with display column names and overlap times, sorted by day and time."""
+    table = pd.DataFrame({
+        'Type': conflicts['kind'],
+        'Meeting Day': conflicts['meeting_day'],
+        'Room / Instructor': conflicts['resource'],
+        'Course A': conflicts['course_a'],
+        'Course B': conflicts['course_b'],
+        'Rooms': conflicts['room_a'] + ' / ' + conflicts['room_b'],
+        'Overlap Start': minutes_to_times(conflicts['start_min']),
+        'Overlap End': minutes_to_times(conflicts['end_min']),
+    })
+    day_order = {day: i for i, day in enumerate(DAYS)}
+    order = np.lexsort((
+        conflicts['start_min'].to_numpy(),
+        conflicts['meeting_day'].map(day_order).fillna(len(day_order)).to_numpy(),
+    ))
+    return table.iloc[order].reset_index(drop=True)
+
+@cached_query('conflicts', version=get_data_version)
+def get_conflicts(building: Optional[str] = None) -> pd.DataFrame:
+    """Conflicts in the active term (one building, or all), computed once per data version."""
+    schedule = get_schedule_data(building=building)
+    return find_conflicts(pd.DataFrame({
+        'course': schedule['Course'].fillna(''),
+        'instructor': schedule['Instructor'].fillna(''),
+        'meeting_day': schedule['Meeting Day'],
+        'room': schedule['Room'],
+        'start_min': schedule['start_min'],
+        'end_min': schedule['end_min'],
+    }))
@@ -0,0 +1,108 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# Applied to every connection. journal_mode=WAL is persistent in the file, so
+# readers keep reading the last committed snapshot while an upload is written.
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',      # durable enough under WAL, far fewer fsyncs
+    'cache_size': -32000,         # ~32 MB page cache per connection
+    'mmap_size': 268435456,       # map up to 256 MB of the file
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+}
+
+# Upper bound on concurrently open read connections per database file.
+READ_POOL_SIZE = 8
+
+class ConnectionPool:
+    """A pool of read connections plus one serialized write connection.
+
+    Connections are opened lazily, tuned with PRAGMAS and shared across
+    threads, so every Streamlit session and rerun in the process reuses them.
+    """
+
+    def __init__(self, path: str, size: int = READ_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer = None
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        for name, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._connect(read_only=True)
+                except Exception:
+                    self._opened -= 1
+                    raise
+        # Pool exhausted: wait for another thread to hand one back.
+        return self._idle.get()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrows a read-only connection for the duration of the block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Holds the single write connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            try:
+                yield self._writer
+                self._writer.commit()
+            except Exception:
+                self._writer.rollback()
+                raise
+
+    def close(self) -> None:
+        """Closes every idle connection and the write connection."""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._opened -= 1
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(path: str) -> ConnectionPool:
+    """Returns the process-wide pool for a database file, creating it once."""
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(path, ConnectionPool(path))
+    return pool
@@ -1,86 +1,128 @@
+import os
 import pandas as pd
-import datetime
-from typing import Optional
-import streamlit as st
+import numpy as np
+from typing import Callable, Iterator, Optional
+from utils.metrics import timed
+from utils.time_parsing import parse_meeting_times, minutes_to_times
 
 DAYS_MAP = {
     'monday': 'Mon', 'tuesday': 'Tue', 'wednesday': 'Wed',
     'thursday': 'Thu', 'friday': 'Fri'
 }
 
-def parse_time(time_str: str) -> Optional[datetime.time]:
-    """Parses a time string into a datetime.time object."""
-    time_str = time_str.strip().upper()
-    for fmt in ("%I:%M%p", "%I%p", "%H:%M", "%H%M"):
-        try:
-            return datetime.datetime.strptime(time_str, fmt).time()
-        except ValueError:
-            continue
-    return None
+REQUIRED_COLUMNS = {'Course', 'Course Title', 'Meeting Pattern',
+                    'Meeting Time', 'Instructor', 'Room Number(s)'}
+
+KEEP_COLUMNS = [
+    'Course', 'Course Title', 'meeting_day',
+    'start_time', 'end_time', 'Instructor', 'room'
+]
+
+# Source rows per chunk on the streaming ingest path.
+STREAM_CHUNK_SIZE = 50_000
+
+def check_columns(columns) -> None:
+    if not REQUIRED_COLUMNS.issubset(columns):
+        missing = REQUIRED_COLUMNS - set(columns)
+        raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
 
-@st.cache_data(ttl=3600, show_spinner="Processing schedule data...")
-def load_and_process_data(uploaded_file) -> Optional[pd.DataFrame]:
-    """Loads and processes the uploaded schedule data."""
-    if not uploaded_file:
-        return None
+def _iter_xlsx_chunks(source, chunk_size: int) -> Iterator[pd.DataFrame]:
+    import openpyxl
 
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
     try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        else:
-            df = pd.read_excel(uploaded_file)
-
-        # Validate required columns
-        required_columns = {'Course', 'Course Title', 'Meeting Pattern', 
-                            'Meeting Time', 'Instructor', 'Room Number(s)'}
-        if not required_columns.issubset(df.columns):
-            missing = required_columns - set(df.columns)
-            st.error(f"Missing required columns: {', '.join(missing)}")
-            return None
-
-        # Clean data: remove rows missing critical information and trim whitespace
-        df = df.dropna(subset=['Meeting Pattern', 'Meeting Time', 'Room Number(s)'])
-        df['Room Number(s)'] = df['Room Number(s)'].astype(str).str.strip()
-        
-        # Expand each row for multiple meeting days and multiple rooms
-        expanded = []
-        for _, row in df.iterrows():
-            rooms = [r.strip() for r in str(row['Room Number(s)']).split(';')]
-            days = [d.strip().lower() for d in str(row['Meeting Pattern']).split(',')]
-            
-            # Strip meeting time and split into start/end times
-            meeting_time_str = str(row['Meeting Time']).strip()
-            if '-' in meeting_time_str:
-                start_time_str, end_time_str = meeting_time_str.split('-')
-                start_time = parse_time(start_time_str)
-                end_time = parse_time(end_time_str)
-            else:
-                start_time = parse_time(meeting_time_str)
-                end_time = None
-
-            # Only add row if both start_time and end_time are available
-            if start_time and end_time:
-                for day in days:
-                    for room in rooms:
-                        if day in DAYS_MAP:
-                            new_row = row.to_dict()
-                            new_row['meeting_day'] = DAYS_MAP[day]
-                            new_row['room'] = room
-                            new_row['start_time'] = start_time
-                            new_row['end_time'] = end_time
-                            expanded.append(new_row)
-        
-        df_expanded = pd.DataFrame(expanded)
-        
-        # Keep only the needed columns
-        keep_columns = [
-            'Course', 'Course Title', 'meeting_day',
-            'start_time', 'end_time', 'Instructor', 'room'
-        ]
-        df_expanded = df_expanded[keep_columns].dropna(subset=['start_time', 'end_time'])
-
-        return df_expanded
-
-    except Exception as e:
-        st.error(f"Data processing error: {str(e)}")
-        return None
\ No newline at end of file
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(c) if c is not None else '' for c in next(rows, ())]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+def iter_export_chunks(
+    source,
+    filename: str,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    progress: Optional[Callable[[int, Optional[float]], None]] = None
+) -> Iterator[pd.DataFrame]:
+    """Reads a CSV/XLSX export `chunk_size` source rows at a time.
+
+    XLSX files are streamed with openpyxl's read-only mode. Raises ValueError
+    if required columns are missing. `progress(rows_read, fraction)` is
+    called after every chunk; fraction is None when it cannot be estimated.
+    """
+    if filename.endswith('.csv'):
+        chunks = pd.read_csv(source, chunksize=chunk_size)
+    else:
+        chunks = _iter_xlsx_chunks(source, chunk_size)
+
+    size = getattr(source, 'size', None)
+    if size is None:
+        try:
+            size = os.fstat(source.fileno()).st_size
+        except (AttributeError, OSError):
+            pass
+    rows_read = 0
+    for chunk in chunks:
+        if rows_read == 0:
+            check_columns(chunk.columns)
+        rows_read += len(chunk)
+        if progress:
+            fraction = None
+            if size and filename.endswith('.csv') and hasattr(source, 'tell'):
+                fraction = min(source.tell() / size, 1.0)
+            progress(rows_read, fraction)
+        yield chunk
+
+@timed('transform.expand')
+def expand_schedule(df: pd.DataFrame) -> pd.DataFrame:
+    """Expands each section into one row per meeting day and room.
+
+    Works column-wise: meeting times are parsed once per distinct string,
+    patterns and room lists are split with vectorized string ops and
+    exploded, and day names are mapped through DAYS_MAP as a categorical.
+    Rows come out in the same order as the original row-by-row expansion
+    (source row, then day, then room). The number of source rows dropped
+    for an unparseable Meeting Time is kept in
+    `attrs['time_parse_failures']`.
+    """
+    df = df.dropna(subset=['Meeting Pattern', 'Meeting Time', 'Room Number(s)'])
+    rooms = df['Room Number(s)'].astype(str).str.strip()
+
+    # Parse each distinct meeting time once and broadcast the result.
+    minutes = parse_meeting_times(df['Meeting Time'])
+    invalid = minutes.isna().any(axis=1).to_numpy()
+    minutes = minutes[~invalid]
+    df = df[~invalid]
+
+    expanded = pd.DataFrame({
+        'Course': df['Course'],
+        'Course Title': df['Course Title'],
+        'days': df['Meeting Pattern'].astype(str).str.split(','),
+        'start_time': minutes_to_times(minutes['start_min']),
+        'end_time': minutes_to_times(minutes['end_min']),
+        'Instructor': df['Instructor'],
+        'room': rooms[~invalid].str.split(';'),
+    })
+
+    # One row per day; days outside DAYS_MAP map to code -1 and are dropped.
+    expanded = expanded.explode('days')
+    day_codes = pd.Categorical(
+        expanded['days'].str.strip().str.lower(), categories=list(DAYS_MAP)
+    ).codes
+    expanded = expanded[day_codes >= 0]
+    day_abbrs = np.array(list(DAYS_MAP.values()), dtype=object)
+    expanded['meeting_day'] = day_abbrs[day_codes[day_codes >= 0]]
+
+    # One row per room within each day.
+    expanded = expanded.explode('room')
+    expanded['room'] = expanded['room'].str.strip()
+
+    expanded = expanded[KEEP_COLUMNS].reset_index(drop=True).infer_objects()
+    expanded.attrs['time_parse_failures'] = int(invalid.sum())
+    return expanded
@@ -1,52 +1,378 @@
-import sqlite3
+import os
+import threading
+import time
 import pandas as pd
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+from utils.aggregates import refresh_room_day_stats
+from utils.cache import cached_query
+from utils.calendars import calendar_archive, ics_document, json_document, refresh_calendars
+from utils.compact import DAYS, compact_schedule, lookup_categorical
+from utils.connection import ConnectionPool, get_pool
+from utils.schema import migrate
+from utils.delta import diff_meetings, normalize_meetings
+from utils.metrics import timed
+from utils.time_parsing import minutes_to_times
 
-DATABASE_FILE = "data/schedule_data.db"
+if TYPE_CHECKING:
+    # pyarrow is only imported once the Arrow backend is used.
+    from utils.snapshot import Snapshot, SnapshotStore
+
+DATABASE_FILE = os.environ.get("SCHEDULE_DATABASE_FILE", "data/schedule_data.db")
+
+# Where reads are served from: "sqlite", or "arrow" for memory-mapped
+# snapshots written next to the database after each upload. SQLite stays
+# the system of record either way.
+STORAGE_BACKEND = os.environ.get("SCHEDULE_BACKEND", "sqlite")
+if STORAGE_BACKEND not in ("sqlite", "arrow"):
+    raise ValueError(f"Unknown SCHEDULE_BACKEND: {STORAGE_BACKEND}")
+_snapshots: Dict[str, 'SnapshotStore'] = {}
+
+# Seconds a data version read is reused before asking SQLite again. Uploads
+# from this process are seen immediately, other processes' within this window.
+DATA_VERSION_MAX_AGE = 1.0
+_data_version = {'value': None, 'checked_at': 0.0}
+
+# Database files whose schema this process has already brought up to date.
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+def _pool() -> ConnectionPool:
+    create_database()
+    return get_pool(DATABASE_FILE)
 
 def create_database() -> None:
-    """Creates the database table if it doesn't exist."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS schedule (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course TEXT,
-            course_title TEXT,
-            meeting_day TEXT,
-            start_time TEXT,
-            end_time TEXT,
-            instructor TEXT,
-            room TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
-
-def insert_data(df: pd.DataFrame) -> None:
-    """Inserts data from a DataFrame into the database."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    
-    # Rename columns to match the database schema
-    df = df.rename(columns={
-        'Course': 'course',
-        'Course Title': 'course_title',
-        'Instructor': 'instructor'
+    """Creates or upgrades the database schema, once per process."""
+    if DATABASE_FILE in _schema_ready:
+        return
+    with _schema_lock:
+        if DATABASE_FILE not in _schema_ready:
+            with get_pool(DATABASE_FILE).writer() as conn:
+                migrate(conn)
+            _schema_ready.add(DATABASE_FILE)
+
+def _bump_data_version(conn) -> None:
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+def get_data_version() -> Tuple[int, int]:
+    """Returns (active term id, data version), which changes whenever what the pages read changes.
+
+    The data version counts changes to the stored schedule only; switching
+    the active term moves the first part and leaves the snapshot alone.
+    """
+    now = time.monotonic()
+    if _data_version['value'] is None or now - _data_version['checked_at'] > DATA_VERSION_MAX_AGE:
+        with timed('db.data_version'), _pool().reader() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta WHERE key IN ('active_term', 'data_version')"))
+        _data_version.update(value=(meta['active_term'], meta['data_version']), checked_at=now)
+    return _data_version['value']
+
+@timed('db.snapshot_build')
+def _load_snapshot():
+    # One read transaction, so the rows match the version they are named after.
+    with _pool().reader() as conn:
+        conn.execute("BEGIN")
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            schedule = pd.read_sql_query("SELECT * FROM schedule", conn)
+            rooms = [r[0] for r in conn.execute("SELECT name FROM rooms ORDER BY id")]
+            instructors = [r[0] for r in conn.execute("SELECT NULLIF(name, '') FROM instructors ORDER BY id")]
+        finally:
+            conn.rollback()
+    name = f"schedule-{meta['database_id']:x}-v{meta['data_version']}"
+    from utils.snapshot import build_snapshot
+    return name, build_snapshot(schedule, rooms, instructors)
+
+def _snapshot() -> 'Snapshot':
+    """Returns the snapshot of the current data version, writing it on first use.
+
+    It holds every partition, so it does not depend on the active term.
+    """
+    from utils.snapshot import SnapshotStore
+    if DATABASE_FILE not in _snapshots:
+        _snapshots[DATABASE_FILE] = SnapshotStore(f"{DATABASE_FILE}-snapshots")
+    store = _snapshots[DATABASE_FILE]
+    if 'database_id' not in _data_version:
+        with _pool().reader() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'database_id'").fetchone()
+        _data_version['database_id'] = row[0]
+    return store.get(f"schedule-{_data_version['database_id']:x}-v{get_data_version()[1]}", _load_snapshot)
+
+def _publish() -> None:
+    """Runs after every write; builds the snapshot of a new data version before readers ask for it."""
+    _data_version['value'] = None
+    if STORAGE_BACKEND == "arrow":
+        _snapshot()
+
+# Display names of the `schedule` view's columns, as the pages show them.
+DISPLAY_COLUMNS = {
+    'course': 'Course',
+    'course_title': 'Course Title',
+    'instructor': 'Instructor',
+    'room': 'Room',
+    'meeting_day': 'Meeting Day'
+}
+
+# Keys per SELECT when resolving new lookup rows.
+LOOKUP_BATCH_SIZE = 500
+
+def _lookup_ids(
+    conn, table: str, columns: List[str], values: pd.DataFrame,
+    known: Optional[Dict[tuple, int]] = None
+) -> pd.Series:
+    """Ensures every distinct key in `values` exists in a lookup table and returns row ids.
+
+    `known` caches key -> id across calls (e.g. the chunks of one ingest),
+    so only keys not seen before touch the table.
+    """
+    known = {} if known is None else known
+    keys = values.drop_duplicates()
+    key_tuples = list(keys.itertuples(index=False, name=None))
+    missing = [key for key in key_tuples if key not in known]
+    if missing:
+        names = ', '.join(columns)
+        row = '(' + ', '.join(['?'] * len(columns)) + ')'
+        conn.executemany(f"INSERT OR IGNORE INTO {table} ({names}) VALUES {row}", missing)
+        for i in range(0, len(missing), LOOKUP_BATCH_SIZE):
+            batch = missing[i:i + LOOKUP_BATCH_SIZE]
+            found = conn.execute(
+                f"SELECT {names}, id FROM {table} WHERE ({names}) IN (VALUES {', '.join([row] * len(batch))})",
+                [value for key in batch for value in key]
+            )
+            known.update((tuple(r[:-1]), r[-1]) for r in found)
+    keys = keys.assign(id=[known[key] for key in key_tuples])
+    return values.merge(keys, how='left', on=list(values.columns))['id']
+
+def _write_meetings(
+    conn, meetings: pd.DataFrame, partition_id: int, known: Optional[Dict[str, dict]] = None
+) -> None:
+    """Inserts normalized meeting rows into a partition, creating lookup rows as needed."""
+    known = known if known is not None else {}
+    rows = pd.DataFrame({
+        'course_id': _lookup_ids(
+            conn, 'courses', ['code', 'title'],
+            meetings[['course', 'course_title']].set_axis(['code', 'title'], axis=1),
+            known.setdefault('courses', {})
+        ),
+        'instructor_id': _lookup_ids(
+            conn, 'instructors', ['name'], meetings[['instructor']], known.setdefault('instructors', {})
+        ),
+        'room_id': _lookup_ids(conn, 'rooms', ['name'], meetings[['room']], known.setdefault('rooms', {})),
     })
-    
-    # Replace existing data with the new dataset.
-    df.to_sql('schedule', conn, if_exists='replace', index=False)
-    conn.close()
+    rows = rows.join(meetings[['meeting_day', 'start_min', 'end_min', 'row_hash', 'slot_hash']])
+    rows['partition_id'] = partition_id
+    conn.executemany(
+        "INSERT INTO meetings (course_id, instructor_id, room_id, meeting_day, start_min, end_min, "
+        "row_hash, slot_hash, partition_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows.astype(object).itertuples(index=False, name=None)
+    )
+
+def _partition_id(conn, term: Optional[str], building: str) -> int:
+    """Returns the id of the (term, building) partition, creating it if needed.
+
+    `term` None means the active term.
+    """
+    if term is None:
+        term_id = conn.execute("SELECT value FROM meta WHERE key = 'active_term'").fetchone()[0]
+    else:
+        conn.execute("INSERT OR IGNORE INTO terms (name) VALUES (?)", (term,))
+        term_id = conn.execute("SELECT id FROM terms WHERE name = ?", (term,)).fetchone()[0]
+    conn.execute("INSERT OR IGNORE INTO partitions (term_id, building) VALUES (?, ?)", (term_id, building))
+    return conn.execute(
+        "SELECT id FROM partitions WHERE term_id = ? AND building = ?", (term_id, building)
+    ).fetchone()[0]
+
+def _prune_lookups(conn) -> None:
+    """Drops lookup rows the stored meetings no longer reference."""
+    conn.execute("DELETE FROM rooms WHERE id NOT IN (SELECT room_id FROM meetings)")
+    conn.execute("DELETE FROM instructors WHERE id NOT IN (SELECT instructor_id FROM meetings)")
+    conn.execute("DELETE FROM courses WHERE id NOT IN (SELECT course_id FROM meetings)")
+
+@timed('db.insert')
+def insert_data(df: pd.DataFrame, term: Optional[str] = None, building: str = '') -> None:
+    """Replaces one partition of the stored schedule with the rows of an expanded DataFrame.
+
+    The partition is (`term`, `building`); `term` None means the active
+    term. Other partitions are left as they are.
+    """
+    meetings = normalize_meetings(df)
+
+    # Replace existing data with the new dataset in a single transaction, so
+    # readers see either the old schedule or the new one.
+    with _pool().writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        partition_id = _partition_id(conn, term, building)
+        conn.execute("DELETE FROM meetings WHERE partition_id = ?", (partition_id,))
+        _write_meetings(conn, meetings, partition_id)
+        _prune_lookups(conn)
+        refresh_room_day_stats(conn, partition_id)
+        refresh_calendars(conn, partition_id)
+        _bump_data_version(conn)
+    _publish()
+
+@timed('db.apply_delta')
+def apply_delta(df: pd.DataFrame, term: Optional[str] = None, building: str = '') -> Dict[str, int]:
+    """Brings one partition in line with an expanded DataFrame by changing only what differs.
+
+    Rows are matched on content hashes; a class that only changed room is
+    updated in place. Everything happens in one transaction and the data
+    version is bumped only if something changed. Returns counts of added,
+    removed, moved and unchanged meetings. The partition is chosen as in
+    insert_data().
+    """
+    incoming = normalize_meetings(df)
+
+    with _pool().writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        partition_id = _partition_id(conn, term, building)
+        stored = pd.read_sql_query(
+            "SELECT id, row_hash, slot_hash FROM meetings WHERE partition_id = ?", conn, params=[partition_id]
+        )
+        delta = diff_meetings(stored, incoming)
+
+        if len(delta.moved):
+            room_ids = _lookup_ids(conn, 'rooms', ['name'], delta.moved[['room']])
+            conn.executemany(
+                "UPDATE meetings SET room_id = ?, row_hash = ? WHERE id = ?",
+                zip(room_ids.tolist(), delta.moved['row_hash'].tolist(), delta.moved['id'].tolist())
+            )
+        conn.executemany(
+            "DELETE FROM meetings WHERE id = ?", ((i,) for i in delta.removed_ids.tolist())
+        )
+        _write_meetings(conn, delta.added, partition_id)
+
+        summary = delta.summary()
+        if summary['added'] or summary['removed'] or summary['moved']:
+            _prune_lookups(conn)
+            refresh_room_day_stats(conn, partition_id)
+            refresh_calendars(conn, partition_id)
+            _bump_data_version(conn)
+    _publish()
+    return summary
+
+@timed('db.stream_insert')
+def stream_insert(
+    chunks: Iterable[pd.DataFrame], term: Optional[str] = None, building: str = '',
+    check_conflicts: bool = False
+) -> Dict[str, Any]:
+    """Replaces one partition with expanded chunks, writing each as it arrives.
+
+    Only one chunk is held in memory at a time. All chunks go into a single
+    transaction, so readers keep seeing the previous schedule until the
+    last one is written. The partition is chosen as in insert_data().
+    Returns the number of meetings written and of source rows skipped for
+    an unreadable Meeting Time.
+
+    With `check_conflicts`, the new rows are checked with
+    partition_conflicts() before committing, and the conflicts found are
+    returned under 'conflicts'. If there are any, the transaction is rolled
+    back and the previous schedule stays.
+    """
+    summary: Dict[str, Any] = {'meetings': 0, 'skipped_rows': 0}
+    known: Dict[str, dict] = {}
+    with _pool().writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        partition_id = _partition_id(conn, term, building)
+        conn.execute("DELETE FROM meetings WHERE partition_id = ?", (partition_id,))
+        for chunk in chunks:
+            summary['skipped_rows'] += chunk.attrs.get('time_parse_failures', 0)
+            if chunk.empty:
+                continue
+            _write_meetings(conn, normalize_meetings(chunk), partition_id, known)
+            summary['meetings'] += len(chunk)
+        if check_conflicts:
+            # utils.conflicts reads through this module, so it is imported late.
+            from utils.conflicts import partition_conflicts
+            summary['conflicts'] = partition_conflicts(conn, partition_id)
+            if len(summary['conflicts']):
+                conn.rollback()
+                return summary
+        _prune_lookups(conn)
+        refresh_room_day_stats(conn, partition_id)
+        refresh_calendars(conn, partition_id)
+        _bump_data_version(conn)
+    _publish()
+    return summary
+
+def set_active_term(term: str) -> None:
+    """Makes `term` the one the pages show.
+
+    Only the meta pointer changes: the data version and with it the
+    snapshot stay as they are, while get_data_version() still moves so
+    cached queries are re-run for the new term.
+    """
+    with _pool().writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT id FROM terms WHERE name = ?", (term,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown term: {term}")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'active_term'", (row[0],))
+    _publish()
+
+@cached_query('partitions', version=get_data_version)
+def get_partitions() -> pd.DataFrame:
+    """Retrieves every (term, building) partition: id, term, building and whether its term is active."""
+    with timed('db.partitions'), _pool().reader() as conn:
+        return pd.read_sql_query("""
+            SELECT p.id, t.name AS term, p.building,
+                   t.id = (SELECT value FROM meta WHERE key = 'active_term') AS active
+            FROM partitions p
+            JOIN terms t ON t.id = p.term_id
+            ORDER BY t.id, p.building
+        """, conn).astype({'active': bool})
+
+@cached_query('terms', version=get_data_version)
+def get_terms() -> List[str]:
+    """Retrieves the names of all stored terms, oldest first."""
+    with timed('db.terms'), _pool().reader() as conn:
+        return [r[0] for r in conn.execute("SELECT name FROM terms ORDER BY id")]
 
+@cached_query('active_term', version=get_data_version)
+def get_active_term() -> str:
+    """Retrieves the name of the term the pages show by default."""
+    with timed('db.terms'), _pool().reader() as conn:
+        return conn.execute(
+            "SELECT name FROM terms WHERE id = (SELECT value FROM meta WHERE key = 'active_term')"
+        ).fetchone()[0]
+
+def get_buildings(term: Optional[str] = None) -> List[str]:
+    """Retrieves the buildings stored for `term` (the active term if None); '' is an upload without one."""
+    partitions = get_partitions()
+    rows = partitions[partitions['active']] if term is None else partitions[partitions['term'] == term]
+    return rows['building'].tolist()
+
+@cached_query('scope', version=get_data_version)
+def _scope(term: Optional[str], building: Optional[str]) -> List[int]:
+    """Ids of the partitions a query reads: `term` (None: active) and `building` (None: all of them)."""
+    partitions = get_partitions()
+    rows = partitions[partitions['active']] if term is None else partitions[partitions['term'] == term]
+    if building is not None:
+        rows = rows[rows['building'] == building]
+    return rows['id'].tolist()
+
+@cached_query('schedule', version=get_data_version)
 def get_schedule_data(
     meeting_day: Optional[str] = None,
     rooms: Optional[List[str]] = None,
-    instructor: Optional[str] = None
+    instructor: Optional[str] = None,
+    at_minute: Optional[int] = None,
+    instructors: Optional[List[str]] = None,
+    term: Optional[str] = None,
+    building: Optional[str] = None
 ) -> pd.DataFrame:
-    """Retrieves schedule data from the database with optional filters."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    query = "SELECT * FROM schedule WHERE 1=1"
-    params = []
+    """Retrieves schedule data from the database with optional filters.
+
+    Only the partitions of `term` (the active term if None) and `building`
+    (every building if None) are read.
+    """
+    partitions = _scope(term, building)
+    in_scope = ', '.join(['?'] * len(partitions))
+    if STORAGE_BACKEND == "arrow":
+        with timed('db.schedule'):
+            df = _snapshot().select(meeting_day, rooms, instructor, at_minute, instructors, partitions)
+        return df.rename(columns=DISPLAY_COLUMNS)
+
+    query = f"SELECT * FROM schedule WHERE partition_id IN ({in_scope})"
+    params = list(partitions)
 
     if meeting_day:
         query += " AND meeting_day = ?"
@@ -54,47 +380,250 @@ def get_schedule_data(
 
     if rooms:
         placeholders = ', '.join(['?'] * len(rooms))
-        query += f" AND room IN ({placeholders})"
+        query += f" AND room_id IN (SELECT id FROM rooms WHERE name IN ({placeholders}))"
         params.extend(rooms)
 
     if instructor:
-        query += " AND instructor = ?"
+        query += " AND instructor_id = (SELECT id FROM instructors WHERE name = ?)"
         params.append(instructor)
 
-    df = pd.read_sql_query(query, conn, params=params)
+    if instructors is not None:
+        # One pass over the (instructor, meeting_day) index for the whole set.
+        placeholders = ', '.join(['?'] * len(instructors))
+        query += f" AND instructor_id IN (SELECT id FROM instructors WHERE name IN ({placeholders}))"
+        params.extend(instructors)
 
-    # Convert time strings back into time objects.
-    # Since the times in the DB are stored in '%H:%M:%S' format and are in US/Central,
-    # we directly localize them to US/Central.
-    df['Start Time'] = pd.to_datetime(df['start_time'], format='%H:%M:%S') \
-                         .dt.tz_localize('US/Central').dt.time
-    df['End Time'] = pd.to_datetime(df['end_time'], format='%H:%M:%S') \
-                         .dt.tz_localize('US/Central').dt.time
+    if at_minute is not None:
+        query += " AND start_min <= ? AND end_min >= ?"
+        params.extend([at_minute, at_minute])
+
+    with timed('db.schedule'), _pool().reader() as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+
+    # Stored times are Central wall-clock minutes; no timezone is attached,
+    # so each is one lookup (utils.clock handles "now" and DST).
+    with timed('transform.time_columns'):
+        df['Start Time'] = minutes_to_times(df['start_min'])
+        df['End Time'] = minutes_to_times(df['end_min'])
 
     # Rename columns for display purposes.
-    df = df.rename(columns={
-        'course': 'Course',
-        'course_title': 'Course Title',
-        'instructor': 'Instructor',
+    return df.rename(columns=DISPLAY_COLUMNS)
+
+@cached_query('instructor_schedules', version=get_data_version)
+def get_instructor_schedules(
+    instructors: List[str],
+    meeting_day: Optional[str] = None,
+    term: Optional[str] = None,
+    building: Optional[str] = None
+) -> pd.DataFrame:
+    """Retrieves the classes of several instructors in one query.
+
+    Rows come back grouped by instructor in the order given, then by
+    weekday and start time.
+    """
+    df = get_schedule_data.uncached(
+        meeting_day, instructors=list(instructors), term=term, building=building
+    )
+    order = {name: i for i, name in enumerate(instructors)}
+    days = {day: i for i, day in enumerate(DAYS)}
+    keys = pd.DataFrame({
+        'instructor': df['Instructor'].map(order),
+        'day': df['Meeting Day'].map(days),
+        'start': df['start_min']
+    })
+    return df.loc[keys.sort_values(['instructor', 'day', 'start'], kind='stable').index].reset_index(drop=True)
+
+@cached_query('compact_schedule', version=get_data_version)
+def get_compact_schedule(term: Optional[str] = None, building: Optional[str] = None) -> pd.DataFrame:
+    """Retrieves the schedule of a term (and building) in its compact form (see utils.compact).
+
+    One instance per data version and scope is shared by every caller;
+    each gets a shallow copy that shares its columns.
+    """
+    partitions = _scope(term, building)
+    in_scope = ', '.join(['?'] * len(partitions))
+    if STORAGE_BACKEND == "arrow":
+        with timed('db.compact_schedule'):
+            table = _snapshot().rows(partitions)
+            # Dictionary-encoded columns arrive as categoricals without decoding.
+            df = table.select(['course', 'course_title', 'instructor', 'room', 'meeting_day',
+                               'start_min', 'end_min']).to_pandas()
+        with timed('transform.compact'):
+            return compact_schedule(df.rename(columns=DISPLAY_COLUMNS))
+
+    # Integer ids straight from `meetings`, decoded against the small lookup
+    # tables, instead of one string per row and column through the view.
+    day_codes = " ".join(f"WHEN '{day}' THEN {i}" for i, day in enumerate(DAYS))
+    with timed('db.compact_schedule'), _pool().reader() as conn:
+        conn.execute("BEGIN")
+        try:
+            meetings = pd.read_sql_query(f"""
+                SELECT course_id, instructor_id, room_id,
+                       CASE meeting_day {day_codes} ELSE -1 END AS day,
+                       start_min, end_min
+                FROM meetings
+                WHERE partition_id IN ({in_scope})
+            """, conn, params=partitions)
+            courses = pd.read_sql_query(
+                "SELECT id, NULLIF(code, '') AS code, NULLIF(title, '') AS title FROM courses", conn
+            )
+            instructors = pd.read_sql_query("SELECT id, NULLIF(name, '') AS name FROM instructors", conn)
+            rooms = pd.read_sql_query("SELECT id, name FROM rooms", conn)
+        finally:
+            conn.rollback()
+
+    with timed('transform.compact'):
+        course_ids = meetings['course_id'].to_numpy()
+        return pd.DataFrame({
+            'Course': lookup_categorical(course_ids, courses['id'].to_numpy(), courses['code']),
+            'Course Title': lookup_categorical(course_ids, courses['id'].to_numpy(), courses['title']),
+            'Instructor': lookup_categorical(
+                meetings['instructor_id'].to_numpy(), instructors['id'].to_numpy(), instructors['name']
+            ),
+            'Room': lookup_categorical(meetings['room_id'].to_numpy(), rooms['id'].to_numpy(), rooms['name']),
+            'Meeting Day': pd.Categorical.from_codes(meetings['day'].to_numpy(dtype='int8'), categories=DAYS),
+            'start_min': meetings['start_min'].to_numpy(dtype='int16'),
+            'end_min': meetings['end_min'].to_numpy(dtype='int16'),
+        })
+
+def get_classes_at(
+    meeting_day: str,
+    minute: int,
+    rooms: Optional[List[str]] = None,
+    term: Optional[str] = None,
+    building: Optional[str] = None
+) -> pd.DataFrame:
+    """Retrieves the classes in session at `minute` past midnight on a day.
+
+    Served from the (partition, meeting_day, start_min, end_min) index, or
+    from the (partition, room, meeting_day) index when rooms are given.
+    """
+    return get_schedule_data(
+        meeting_day=meeting_day, rooms=rooms, at_minute=minute, term=term, building=building
+    )
+
+@cached_query('room_day_stats', version=get_data_version)
+def get_room_day_stats(
+    meeting_day: Optional[str] = None,
+    rooms: Optional[List[str]] = None,
+    term: Optional[str] = None,
+    building: Optional[str] = None
+) -> pd.DataFrame:
+    """Retrieves the per-room, per-day aggregates refreshed at ingest time.
+
+    One row per room and meeting day with Classes, Occupied Minutes,
+    Utilization (% of the teaching day) and the packed 15-minute `slots`
+    bitmap (see utils.aggregates.decode_slots), for the partitions of
+    `term` and `building` as in get_schedule_data().
+    """
+    partitions = _scope(term, building)
+    in_scope = ', '.join(['?'] * len(partitions))
+    query = f"""
+        SELECT r.name AS room, s.meeting_day, s.class_count, s.occupied_min, s.utilization, s.slots
+        FROM room_day_stats s
+        JOIN rooms r ON r.id = s.room_id
+        WHERE s.partition_id IN ({in_scope})
+    """
+    params = list(partitions)
+
+    if meeting_day:
+        query += " AND s.meeting_day = ?"
+        params.append(meeting_day)
+
+    if rooms:
+        placeholders = ', '.join(['?'] * len(rooms))
+        query += f" AND r.name IN ({placeholders})"
+        params.extend(rooms)
+
+    with timed('db.room_day_stats'), _pool().reader() as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+
+    return df.rename(columns={
         'room': 'Room',
-        'meeting_day': 'Meeting Day'
+        'meeting_day': 'Meeting Day',
+        'class_count': 'Classes',
+        'occupied_min': 'Occupied Minutes',
+        'utilization': 'Utilization'
     })
 
-    conn.close()
-    return df
-
-def get_all_instructors() -> List[str]:
-    """Retrieves a list of all instructors."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    instructors = pd.read_sql_query("SELECT DISTINCT instructor FROM schedule", conn)
-    conn.close()
-    return instructors['instructor'].tolist() if not instructors.empty else []
-
-def get_all_rooms() -> List[str]:
-    """Retrieves a list of all rooms."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    rooms_df = pd.read_sql_query("SELECT DISTINCT room FROM schedule", conn)
-    conn.close()
+@cached_query('instructors', version=get_data_version)
+def get_all_instructors(term: Optional[str] = None, building: Optional[str] = None) -> List[Optional[str]]:
+    """Retrieves a list of all instructors teaching in a term (and building); None stands for classes without one."""
+    partitions = _scope(term, building)
+    in_scope = ', '.join(['?'] * len(partitions))
+    if STORAGE_BACKEND == "arrow":
+        return _snapshot().instructors_in(partitions)
+    with timed('db.instructors'), _pool().reader() as conn:
+        instructors = pd.read_sql_query(f"""
+            SELECT NULLIF(name, '') AS instructor FROM instructors
+            WHERE id IN (SELECT instructor_id FROM meetings WHERE partition_id IN ({in_scope}))
+            ORDER BY id
+        """, conn, params=partitions)
+    # NULL arrives as NaN in a string column; the Arrow backend returns None.
+    names = instructors['instructor'].astype(object)
+    return names.where(names.notna(), None).tolist()
+
+@cached_query('rooms', version=get_data_version)
+def get_all_rooms(term: Optional[str] = None, building: Optional[str] = None) -> List[str]:
+    """Retrieves a list of all rooms used in a term (and building)."""
+    partitions = _scope(term, building)
+    in_scope = ', '.join(['?'] * len(partitions))
+    if STORAGE_BACKEND == "arrow":
+        return _snapshot().rooms_in(partitions)
+    # room_day_stats has a row for every (room, day) with a meeting, at a
+    # fraction of the size of meetings.
+    with timed('db.rooms'), _pool().reader() as conn:
+        rooms_df = pd.read_sql_query(f"""
+            SELECT name AS room FROM rooms
+            WHERE id IN (SELECT room_id FROM room_day_stats WHERE partition_id IN ({in_scope}))
+            ORDER BY id
+        """, conn, params=partitions)
     return rooms_df['room'].tolist() if not rooms_df.empty else []
 
-create_database()
\ No newline at end of file
+@cached_query('calendars', version=get_data_version)
+def get_calendars(
+    kind: str,
+    names: Optional[List[str]] = None,
+    fmt: str = 'ics',
+    term: Optional[str] = None,
+    building: Optional[str] = None
+) -> Dict[str, str]:
+    """Retrieves the weekly calendars built at ingest for rooms or instructors, as name -> document.
+
+    `kind` is 'room' or 'instructor' and `fmt` 'ics' or 'json'. `names`
+    None means every room (or instructor) in scope, read in one pass; a
+    name without classes in scope is left out. Calendars are stored ready
+    to serve, so this is a primary-key lookup and string joins.
+    """
+    partitions = _scope(term, building)
+    in_scope = ', '.join(['?'] * len(partitions))
+    params = [kind] + partitions
+    name_filter = ""
+    if names is not None:
+        name_filter = f"AND name IN ({', '.join(['?'] * len(names))})"
+        params += names
+    column = 'vevents' if fmt == 'ics' else 'events'
+    with timed('db.calendars'), _pool().reader() as conn:
+        rows = conn.execute(f"""
+            SELECT name, {column} FROM calendars
+            WHERE kind = ? AND partition_id IN ({in_scope}) {name_filter}
+            ORDER BY name, partition_id
+        """, params).fetchall()
+
+    parts: Dict[str, List[str]] = {}
+    for name, part in rows:
+        parts.setdefault(name, []).append(part)
+    if fmt == 'ics':
+        return {name: ics_document(name, vevents) for name, vevents in parts.items()}
+    return {name: json_document(kind, name, events) for name, events in parts.items()}
+
+@cached_query('calendar_archive', version=get_data_version)
+def get_calendar_archive(
+    kind: str,
+    names: Optional[List[str]] = None,
+    fmt: str = 'ics',
+    term: Optional[str] = None,
+    building: Optional[str] = None
+) -> bytes:
+    """get_calendars() as a zip of one file per calendar, built once per data version."""
+    return calendar_archive(get_calendars(kind, names, fmt, term, building), fmt)
@@ -0,0 +1,100 @@
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.time_parsing import times_to_minutes
+
+TEXT_COLUMNS = ['course', 'course_title', 'instructor', 'meeting_day', 'room']
+MINUTE_COLUMNS = ['start_min', 'end_min']
+
+# A meeting's full identity, and the same without the room: two rows that
+# share a slot hash but not a row hash are the same class in another room.
+ROW_HASH_COLUMNS = ['course', 'course_title', 'instructor', 'meeting_day', 'start_min', 'end_min', 'room']
+SLOT_HASH_COLUMNS = ['course', 'course_title', 'instructor', 'meeting_day', 'start_min', 'end_min']
+
+def normalize_meetings(df: pd.DataFrame) -> pd.DataFrame:
+    """Turns an expanded schedule into the columns stored per meeting.
+
+    Accepts load_and_process_data output, with start/end as datetime.time or
+    'HH:MM:SS' strings. Missing text becomes '' to match the lookup tables.
+    Adds row_hash and slot_hash.
+    """
+    df = df.rename(columns={
+        'Course': 'course',
+        'Course Title': 'course_title',
+        'Instructor': 'instructor'
+    }).reset_index(drop=True)
+    meetings = pd.DataFrame({col: df[col].fillna('').astype(str) for col in TEXT_COLUMNS})
+    meetings['start_min'] = times_to_minutes(df['start_time'])
+    meetings['end_min'] = times_to_minutes(df['end_time'])
+    return meetings.join(meeting_hashes(meetings))
+
+def _hash(meetings: pd.DataFrame, columns) -> np.ndarray:
+    # Fixed dtypes so hashes agree whether rows came from an upload or SQLite;
+    # viewed as int64 to fit an SQLite INTEGER.
+    frame = pd.DataFrame({
+        col: meetings[col].astype('int64') if col in MINUTE_COLUMNS else meetings[col].astype(object)
+        for col in columns
+    })
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view('int64')
+
+def meeting_hashes(meetings: pd.DataFrame) -> pd.DataFrame:
+    """Returns row_hash and slot_hash for normalized meeting rows."""
+    return pd.DataFrame({
+        'row_hash': _hash(meetings, ROW_HASH_COLUMNS),
+        'slot_hash': _hash(meetings, SLOT_HASH_COLUMNS),
+    }, index=meetings.index)
+
+class MeetingDelta(NamedTuple):
+    added: pd.DataFrame       # incoming rows to insert
+    removed_ids: np.ndarray   # stored meeting ids to delete
+    moved: pd.DataFrame       # stored 'id' plus the incoming row it becomes
+    unchanged: int
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'added': len(self.added),
+            'removed': len(self.removed_ids),
+            'moved': len(self.moved),
+            'unchanged': self.unchanged,
+        }
+
+def _match(left: pd.Series, right: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairs equal keys one-to-one, duplicates in order; returns matched positions."""
+    def numbered(keys: pd.Series, pos: str) -> pd.DataFrame:
+        values = keys.to_numpy()
+        return pd.DataFrame({
+            'key': values,
+            'n': pd.Series(values).groupby(values).cumcount().to_numpy(),
+            pos: np.arange(len(values)),
+        })
+    pairs = numbered(left, 'left').merge(numbered(right, 'right'), on=['key', 'n'])
+    return pairs['left'].to_numpy(), pairs['right'].to_numpy()
+
+def _without(frame: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    keep = np.ones(len(frame), dtype=bool)
+    keep[positions] = False
+    return frame[keep].reset_index(drop=True)
+
+def diff_meetings(stored: pd.DataFrame, incoming: pd.DataFrame) -> MeetingDelta:
+    """Diffs stored meetings (id, row_hash, slot_hash) against normalized incoming rows.
+
+    Identical rows are matched as a multiset. Of what is left, a removed and
+    an added row with the same slot hash become a single room move.
+    """
+    incoming = incoming.reset_index(drop=True)
+    stored = stored.reset_index(drop=True)
+    same_in, same_stored = _match(incoming['row_hash'], stored['row_hash'])
+    added = _without(incoming, same_in)
+    removed = _without(stored, same_stored)
+
+    move_in, move_stored = _match(added['slot_hash'], removed['slot_hash'])
+    moved = added.iloc[move_in].reset_index(drop=True)
+    moved.insert(0, 'id', removed['id'].to_numpy()[move_stored])
+    return MeetingDelta(
+        added=_without(added, move_in),
+        removed_ids=_without(removed, move_stored)['id'].to_numpy(dtype='int64'),
+        moved=moved,
+        unchanged=len(same_in),
+    )
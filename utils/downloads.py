@@ -0,0 +1,40 @@
+from typing import List, Optional
+
+import streamlit as st
+
+from utils.calendars import calendar_filename
+from utils.database import get_calendar_archive, get_calendars
+
+MIME_TYPES = {'ics': "text/calendar", 'json': "application/json"}
+
+def calendar_download(kind: str, names: Optional[List[str]], building: Optional[str], key: str) -> None:
+    """Download button for the weekly calendars of some rooms or instructors (`names` None: all of them).
+
+    One calendar downloads as a single file, several as a zip. Both are
+    served from the calendars stored at ingest.
+    """
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.radio(
+        "Calendar format", ['ics', 'json'], format_func=str.upper, horizontal=True,
+        key=f"{key}_format", label_visibility="collapsed"
+    )
+    calendars = get_calendars(kind, names, fmt=fmt, building=building)
+    if not calendars:
+        col2.caption("No classes to put in a calendar.")
+    elif len(calendars) == 1:
+        name, document = next(iter(calendars.items()))
+        col2.download_button(
+            f"Download calendar for {name}",
+            document,
+            file_name=calendar_filename(name, fmt),
+            mime=MIME_TYPES[fmt],
+            key=f"{key}_download"
+        )
+    else:
+        col2.download_button(
+            f"Download {len(calendars)} {kind} calendars (.zip)",
+            get_calendar_archive(kind, names, fmt=fmt, building=building),
+            file_name=f"{kind}_calendars_{fmt}.zip",
+            mime="application/zip",
+            key=f"{key}_download"
+        )
@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import streamlit as st
+
+from utils import clock
+from utils.database import get_data_version
+from utils.occupancy import get_occupancy_index
+
+# Seconds between a session's change checks; the old autorefresh interval,
+# so every check that finds nothing new is one full rerun avoided.
+CHECK_INTERVAL = 10
+
+# Seconds between the scheduler's looks at the clock and the data version.
+SCHEDULER_TICK = 1.0
+
+class TransitionScheduler:
+    """Background thread that bumps `epoch` when what the live pages show changes.
+
+    That is at the next class start or end of the current day, at midnight,
+    or when a new upload changes the data version. Sessions compare their
+    last seen epoch against it and only rerun when it moved.
+    """
+
+    def __init__(self):
+        self.epoch = 0
+        self.next_transition: Optional[int] = None
+        self._version: Optional[Tuple[int, int]] = None
+        self._day: Optional[str] = None
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.checks = 0
+        self.reruns = 0
+        self._thread = threading.Thread(target=self._run, name="transition-scheduler", daemon=True)
+        self._thread.start()
+
+    def _advance(self) -> None:
+        version = get_data_version()
+        now = clock.now()
+        day = now.strftime('%a')
+        minute = clock.minute_of_day(now)
+        due = self.next_transition is not None and minute >= self.next_transition
+        if version == self._version and day == self._day and not due:
+            return
+
+        transitions = get_occupancy_index().transitions(day)
+        later = transitions[np.searchsorted(transitions, minute, side='right'):]
+        with self._lock:
+            if self._version is not None:
+                self.epoch += 1
+            self._version, self._day = version, day
+            # No more changes today: the day rolling over is the next one.
+            self.next_transition = int(later[0]) if len(later) else 24 * 60
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._advance()
+            except Exception:
+                # A failed read (e.g. mid-migration) is retried on the next tick.
+                pass
+            time.sleep(SCHEDULER_TICK)
+
+    def record_check(self, rerun: bool) -> None:
+        with self._lock:
+            self.checks += 1
+            self.reruns += rerun
+
+    def stats(self) -> Dict[str, Any]:
+        """Session checks, the reruns they triggered, and reruns avoided per hour."""
+        with self._lock:
+            hours = (time.monotonic() - self._started_at) / 3600
+            avoided = self.checks - self.reruns
+            return {
+                'checks': self.checks,
+                'reruns': self.reruns,
+                'avoided': avoided,
+                'avoided_per_hour': avoided / hours if hours else 0.0,
+                'epoch': self.epoch,
+                'next_transition': self.next_transition,
+            }
+
+_scheduler: Optional[TransitionScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> TransitionScheduler:
+    """Returns the process-wide scheduler, starting it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = TransitionScheduler()
+    return _scheduler
+
+@st.fragment(run_every=CHECK_INTERVAL)
+def _watch() -> None:
+    scheduler = get_scheduler()
+    if st.session_state.pop('live_fresh', False):
+        return
+    changed = st.session_state.get('live_epoch') != scheduler.epoch
+    scheduler.record_check(changed)
+    if changed:
+        st.rerun()
+
+def live_updates() -> None:
+    """Reruns the page when occupancy changes or new data lands, instead of on a timer.
+
+    The check itself is a fragment run every CHECK_INTERVAL seconds that
+    only compares two integers.
+    """
+    st.session_state['live_epoch'] = get_scheduler().epoch
+    st.session_state['live_fresh'] = True
+    _watch()
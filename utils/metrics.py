@@ -0,0 +1,247 @@
+import bisect
+import contextlib
+import os
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+from utils import clock
+
+# Histogram bucket bounds in seconds, as exported to Prometheus.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Recent samples kept per histogram for the p50/p95 shown on the Performance page.
+RECENT_SAMPLES = 1024
+
+# Port for the Prometheus endpoint; unset leaves it off.
+METRICS_PORT = os.environ.get("SCHEDULE_METRICS_PORT")
+
+class Histogram:
+    """Bucketed counts of observed values, plus a window of recent ones for quantiles."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent: deque = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantile(self, q: float) -> float:
+        """The `q` quantile of the recent samples (0.0 when there are none)."""
+        samples = sorted(self.recent)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+class Registry:
+    """Process-wide histograms and counters, safe to update from any session thread.
+
+    Stage names are '<category>.<name>' (e.g. 'db.schedule', 'chart.timeline').
+    While a rerun() block is open on a thread, the stages and counters it
+    records are also tallied for that rerun.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Counter = Counter()
+        # Per page, the counts of its most recent rerun.
+        self._last_runs: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+        run = getattr(self._local, 'run', None)
+        if run is not None:
+            run[name.split('.', 1)[0]] += 1
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+        run = getattr(self._local, 'run', None)
+        if run is not None:
+            run[name] += amount
+
+    @contextlib.contextmanager
+    def rerun(self, page: str) -> Iterator[Counter]:
+        """Times one script run of `page` and records what it did.
+
+        Records 'rerun.<page>' plus, per page, the queries and cache
+        lookups the run made.
+        """
+        outer = getattr(self._local, 'run', None)
+        run = self._local.run = Counter()
+        start = time.perf_counter()
+        try:
+            yield run
+        finally:
+            self._local.run = outer
+            self.observe(f'rerun.{page}', time.perf_counter() - start)
+            with self._lock:
+                self.counters[f'reruns.{page}'] += 1
+                self.counters[f'rerun_queries.{page}'] += run['db']
+                self.counters[f'rerun_cache_hits.{page}'] += run['cache.hit']
+                self.counters[f'rerun_cache_misses.{page}'] += run['cache.miss']
+                self._last_runs[page] = dict(run)
+
+    def snapshot(self) -> List[dict]:
+        """One row per histogram: stage, count, p50, p95 and mean in milliseconds."""
+        with self._lock:
+            items = sorted(self.histograms.items())
+            return [
+                {
+                    'stage': name,
+                    'count': h.count,
+                    'p50_ms': h.quantile(0.5) * 1000,
+                    'p95_ms': h.quantile(0.95) * 1000,
+                    'mean_ms': h.total / h.count * 1000 if h.count else 0.0,
+                }
+                for name, h in items
+            ]
+
+    def reruns(self) -> List[dict]:
+        """Per page: reruns, average queries and cache hit rate per rerun, and the last rerun's counts."""
+        with self._lock:
+            rows = []
+            for key, runs in sorted(self.counters.items()):
+                if not key.startswith('reruns.'):
+                    continue
+                page = key[len('reruns.'):]
+                hits = self.counters[f'rerun_cache_hits.{page}']
+                lookups = hits + self.counters[f'rerun_cache_misses.{page}']
+                last = self._last_runs.get(page, {})
+                rows.append({
+                    'page': page,
+                    'reruns': runs,
+                    'queries_per_rerun': self.counters[f'rerun_queries.{page}'] / runs,
+                    'cache_hit_rate': hits / lookups if lookups else 0.0,
+                    'last_queries': last.get('db', 0),
+                    'last_cache_hits': last.get('cache.hit', 0),
+                    'last_cache_misses': last.get('cache.miss', 0),
+                })
+            return rows
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP schedule_stage_seconds Time spent per instrumented stage.",
+            "# TYPE schedule_stage_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float('inf'),), h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f'schedule_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'schedule_stage_seconds_sum{{stage="{name}"}} {h.total}')
+                lines.append(f'schedule_stage_seconds_count{{stage="{name}"}} {h.count}')
+            lines.append("# HELP schedule_events_total Counted events (cache lookups, reruns, queries per page).")
+            lines.append("# TYPE schedule_events_total counter")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'schedule_events_total{{event="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self._last_runs.clear()
+
+_registry = Registry()
+
+class timed(contextlib.ContextDecorator):
+    """Records the wall-clock time of a block or function under `stage`.
+
+        with timed('transform.time_columns'):
+            ...
+
+        @timed('chart.timeline')
+        def build_timeline(...): ...
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def _recreate_cm(self):
+        # A fresh timer per call, so decorated functions can run on many threads.
+        return timed(self.stage)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _registry.observe(self.stage, time.perf_counter() - self._start)
+        return False
+
+def increment(name: str, amount: int = 1) -> None:
+    """Adds to a process-wide counter (and to the open rerun's)."""
+    _registry.increment(name, amount)
+
+@contextlib.contextmanager
+def rerun(page: str) -> Iterator[Counter]:
+    """Context manager around one page run; see Registry.rerun().
+
+    The clock is pinned for the run (utils.clock.pinned), so the page reads
+    the current time once however many places ask for it.
+    """
+    if METRICS_PORT:
+        start_exporter(int(METRICS_PORT))
+    with clock.pinned(), _registry.rerun(page) as run:
+        yield run
+
+def stage_stats() -> List[dict]:
+    """Count, p50, p95 and mean per instrumented stage."""
+    return _registry.snapshot()
+
+def rerun_stats() -> List[dict]:
+    """Queries and cache hit rate per rerun, per page."""
+    return _registry.reruns()
+
+def prometheus_text() -> str:
+    """The metrics in Prometheus text format."""
+    return _registry.prometheus_text()
+
+def reset_metrics() -> None:
+    """Clears every histogram and counter."""
+    _registry.reset()
+
+_exporter: Optional[ThreadingHTTPServer] = None
+_exporter_lock = threading.Lock()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_exporter(port: int, host: str = "0.0.0.0") -> None:
+    """Serves GET /metrics on `port` from a daemon thread; later calls do nothing."""
+    global _exporter
+    if _exporter is not None:
+        return
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_exporter.serve_forever, name="metrics-exporter", daemon=True).start()
@@ -0,0 +1,157 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import shared_instance
+from utils.database import get_all_rooms, get_compact_schedule, get_data_version
+from utils.metrics import timed
+
+# (start_min, end_min, row position in the schedule frame)
+Interval = Tuple[int, int, int]
+
+class IntervalTree:
+    """A static centered interval tree over closed integer intervals.
+
+    Stabbing and overlap queries cost O(log n + k) for k results.
+    """
+
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, intervals: List[Interval]):
+        endpoints = sorted(p for start, end, _ in intervals for p in (start, end))
+        self.center = endpoints[len(endpoints) // 2] if endpoints else 0
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here)
+        self.by_end = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, lo: int, hi: int) -> List[Interval]:
+        """Returns the intervals with start <= hi and end >= lo."""
+        found = []
+        node = self
+        stack = []
+        while node is not None or stack:
+            if node is None:
+                node = stack.pop()
+            if hi < node.center:
+                # Every interval here ends at or after center > hi >= lo.
+                for interval in node.by_start:
+                    if interval[0] > hi:
+                        break
+                    found.append(interval)
+                node = node.left
+            elif lo > node.center:
+                # Every interval here starts at or before center < lo <= hi.
+                for interval in node.by_end:
+                    if interval[1] < lo:
+                        break
+                    found.append(interval)
+                node = node.right
+            else:
+                found.extend(node.by_start)
+                if node.right is not None:
+                    stack.append(node.right)
+                node = node.left
+        return found
+
+class OccupancyIndex:
+    """Per-day room occupancy built once from the full schedule.
+
+    Expects get_compact_schedule() or get_schedule_data() columns ('Meeting
+    Day', 'Room', 'start_min', 'end_min'); rows come back in the same form.
+    Occupancy is inclusive at both ends, matching the pages' `Start Time <=
+    now <= End Time` checks; window searches treat classes that merely touch
+    the window as not conflicting.
+    """
+
+    @timed('transform.occupancy_index')
+    def __init__(self, schedule: pd.DataFrame, rooms: Optional[List[str]] = None):
+        self.schedule = schedule.reset_index(drop=True)
+        self.rooms = list(rooms) if rooms is not None else list(self.schedule['Room'].unique())
+        self._trees: Dict[str, IntervalTree] = {}
+        self._starts: Dict[str, np.ndarray] = {}
+        self._day_positions: Dict[str, np.ndarray] = {}
+        self._busy: Dict[Tuple[str, str], Tuple[List[int], List[int]]] = {}
+
+        days = self.schedule['Meeting Day'].to_numpy()
+        room_names = self._room_names = self.schedule['Room'].to_numpy()
+        starts = self.schedule['start_min'].to_numpy()
+        ends = self.schedule['end_min'].to_numpy()
+        for day in pd.unique(days):
+            positions = self._day_positions[day] = np.flatnonzero(days == day)
+            self._trees[day] = IntervalTree(
+                [(int(starts[i]), int(ends[i]), int(i)) for i in positions]
+            )
+            self._starts[day] = np.sort(starts[positions])
+
+        # Merged busy blocks per (day, room) for next-free lookups.
+        order = np.lexsort((starts, room_names.astype(str), days.astype(str)))
+        for i in order:
+            key = (days[i], room_names[i])
+            block_starts, block_ends = self._busy.setdefault(key, ([], []))
+            if block_ends and starts[i] <= block_ends[-1]:
+                block_ends[-1] = max(block_ends[-1], int(ends[i]))
+            else:
+                block_starts.append(int(starts[i]))
+                block_ends.append(int(ends[i]))
+
+    def _positions(self, day: str, lo: int, hi: int) -> List[int]:
+        tree = self._trees.get(day)
+        return sorted(i for _, _, i in tree.overlapping(lo, hi)) if tree else []
+
+    def day_schedule(self, day: str) -> pd.DataFrame:
+        """Rows of the schedule meeting on `day`."""
+        return self.schedule.iloc[self._day_positions.get(day, [])]
+
+    def classes_at(self, day: str, minute: int) -> pd.DataFrame:
+        """Rows of the schedule in session at `minute` on `day`."""
+        return self.schedule.iloc[self._positions(day, minute, minute)]
+
+    def rooms_occupied_at(self, day: str, minute: int) -> Set[str]:
+        """Rooms with a class in session at `minute` on `day`."""
+        return set(self._room_names[self._positions(day, minute, minute)])
+
+    def upcoming_count(self, day: str, minute: int) -> int:
+        """Number of classes on `day` starting after `minute`."""
+        starts = self._starts.get(day)
+        return 0 if starts is None else len(starts) - int(np.searchsorted(starts, minute, side='right'))
+
+    def transitions(self, day: str) -> np.ndarray:
+        """Sorted minutes of `day` at which the set of classes in session changes."""
+        positions = self._day_positions.get(day, [])
+        starts = self.schedule['start_min'].to_numpy()[positions]
+        ends = self.schedule['end_min'].to_numpy()[positions]
+        # A class is in session through its end minute, so it leaves one minute later.
+        return np.unique(np.concatenate([starts, ends + 1]))
+
+    def next_free(self, room: str, day: str, minute: int) -> int:
+        """Minute at which `room` is next free on `day` (`minute` itself if free now)."""
+        block_starts, block_ends = self._busy.get((day, room), ([], []))
+        i = bisect_right(block_starts, minute) - 1
+        if i >= 0 and block_ends[i] >= minute:
+            return block_ends[i]
+        return minute
+
+    def free_rooms(self, day: str, start: int, end: int) -> List[str]:
+        """Rooms with no class overlapping the window [start, end] on `day`."""
+        # Integer minutes: start < end_min and start_min < end, i.e. back-to-back is free.
+        busy = set(self._room_names[self._positions(day, start + 1, end - 1)])
+        return [room for room in self.rooms if room not in busy]
+
+@shared_instance(version=get_data_version)
+def get_occupancy_index(building: Optional[str] = None) -> OccupancyIndex:
+    """Returns the process-wide occupancy index of the active term, rebuilt when the data version changes.
+
+    Covers one building, or every building of the term if None.
+    """
+    return OccupancyIndex(get_compact_schedule(building=building), get_all_rooms(building=building))
@@ -0,0 +1,138 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregates import DAY_CLOSE_MIN, DAY_OPEN_MIN
+from utils.cache import shared_instance
+from utils.compact import DAYS
+from utils.database import get_all_rooms, get_compact_schedule, get_data_version
+from utils.metrics import timed
+
+# Width of one occupancy bit, and the bits in a day.
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+# (days, start_min, end_min): free on every one of these days over [start, end).
+Window = Tuple[Sequence[str], int, int]
+
+def _slot_range(start: int, end: int) -> Tuple[int, int]:
+    # Widened to whole slots, so a search never claims a partly busy slot is free.
+    return start // SLOT_MINUTES, -(-end // SLOT_MINUTES)
+
+class RoomFinder:
+    """Per-room, per-day occupancy bitsets of SLOT_MINUTES slots for free-room search.
+
+    Expects get_compact_schedule() or get_schedule_data() columns ('Meeting
+    Day', 'Room', 'start_min', 'end_min'). A class holds [start_min, end_min),
+    so back-to-back bookings are free, as in OccupancyIndex.free_rooms.
+    """
+
+    @timed('transform.room_finder')
+    def __init__(self, schedule: pd.DataFrame, rooms: Optional[List[str]] = None):
+        self.rooms = np.asarray(
+            list(rooms) if rooms is not None else list(schedule['Room'].unique()), dtype=object
+        )
+        positions = {room: i for i, room in enumerate(self.rooms)}
+        # Position of each room in natural order (numeric names first), the ranking's tie-break.
+        natural = sorted(
+            range(len(self.rooms)),
+            key=lambda i: (0, int(self.rooms[i]), '') if str(self.rooms[i]).isdigit() else (1, 0, str(self.rooms[i]))
+        )
+        self._natural_rank = np.empty(len(self.rooms), dtype='int64')
+        self._natural_rank[natural] = np.arange(len(self.rooms))
+        day_positions = {day: i for i, day in enumerate(DAYS)}
+        room_codes = schedule['Room'].map(positions).to_numpy()
+        day_codes = schedule['Meeting Day'].map(day_positions).to_numpy()
+        known = ~(pd.isna(room_codes) | pd.isna(day_codes))
+
+        lo, hi = _slot_range(
+            schedule['start_min'].to_numpy(dtype='int64')[known],
+            schedule['end_min'].to_numpy(dtype='int64')[known]
+        )
+        rows = room_codes[known].astype('int64') * len(DAYS) + day_codes[known].astype('int64')
+        busy_rows = hi > lo
+
+        edges = np.zeros((len(self.rooms) * len(DAYS), SLOTS_PER_DAY + 1), dtype='int16')
+        np.add.at(edges, (rows[busy_rows], lo[busy_rows].clip(0, SLOTS_PER_DAY)), 1)
+        np.add.at(edges, (rows[busy_rows], hi[busy_rows].clip(0, SLOTS_PER_DAY)), -1)
+        busy = np.cumsum(edges[:, :-1], axis=1, dtype='int16') > 0
+        self.busy = busy.reshape(len(self.rooms), len(DAYS), SLOTS_PER_DAY)
+        # Packed copy for the bitwise search.
+        self.bits = np.packbits(self.busy, axis=2)
+
+    def _window_mask(self, start: int, end: int) -> np.ndarray:
+        lo, hi = _slot_range(start, end)
+        mask = np.zeros(SLOTS_PER_DAY, dtype=bool)
+        mask[max(lo, 0):min(hi, SLOTS_PER_DAY)] = True
+        return np.packbits(mask)
+
+    def free_mask(self, windows: Sequence[Window], candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean per room: free on all days of all windows."""
+        clash = np.zeros(len(self.rooms), dtype=bool)
+        for days, start, end in windows:
+            mask = self._window_mask(start, end)
+            day_index = [DAYS.index(day) for day in days]
+            clash |= (self.bits[:, day_index, :] & mask).any(axis=(1, 2))
+        free = ~clash
+        if candidates is not None:
+            free &= candidates
+        return free
+
+    def find(self, windows: Sequence[Window], rooms: Optional[List[str]] = None) -> pd.DataFrame:
+        """Rooms free in every window, tightest fit first.
+
+        Slack is the free time around each window up to the neighbouring
+        classes (or DAY_OPEN_MIN/DAY_CLOSE_MIN), summed over its days; a
+        low slack means the booking fills a gap instead of splitting a
+        long free stretch.
+        """
+        candidates = np.isin(self.rooms, rooms) if rooms else None
+        matches = np.flatnonzero(self.free_mask(windows, candidates))
+
+        open_slot, close_slot = DAY_OPEN_MIN // SLOT_MINUTES, DAY_CLOSE_MIN // SLOT_MINUTES
+        slack = np.zeros(len(matches), dtype='int64')
+        free_from = np.full(len(matches), 0, dtype='int64')
+        free_until = np.full(len(matches), SLOTS_PER_DAY, dtype='int64')
+        for days, start, end in windows:
+            lo, hi = _slot_range(start, end)
+            first, last = min(open_slot, lo), max(close_slot, hi)
+            for day in days:
+                # Only the stretches between opening and the window, and the
+                # window and closing, can change the slack.
+                day_busy = self.busy[:, DAYS.index(day)]
+                before = day_busy[:, first:lo][matches]
+                after = day_busy[:, hi:last][matches]
+                # Slot just after the last busy slot before the window. A window
+                # starting at opening (or ending at closing) has no stretch to search.
+                last_end = np.full(len(matches), first)
+                if lo > first:
+                    last_end = np.where(before.any(axis=1), lo - np.argmax(before[:, ::-1], axis=1), first)
+                next_start = np.full(len(matches), last)
+                if last > hi:
+                    next_start = np.where(after.any(axis=1), hi + np.argmax(after, axis=1), last)
+                slack += (lo - last_end) + (next_start - hi)
+                free_from = np.maximum(free_from, last_end)
+                free_until = np.minimum(free_until, next_start)
+
+        order = np.lexsort((self._natural_rank[matches], slack))
+        return pd.DataFrame({
+            'Room': self.rooms[matches[order]],
+            'Free From': free_from[order] * SLOT_MINUTES,
+            'Free Until': free_until[order] * SLOT_MINUTES,
+            'Slack (min)': slack[order] * SLOT_MINUTES,
+        })
+
+@shared_instance(version=get_data_version)
+def get_room_finder(building: Optional[str] = None) -> RoomFinder:
+    """Returns the process-wide room finder of the active term, rebuilt when the data version changes.
+
+    Covers one building, or every building of the term if None.
+    """
+    return RoomFinder(get_compact_schedule(building=building), get_all_rooms(building=building))
+
+def find_free_rooms(
+    windows: Sequence[Window], rooms: Optional[List[str]] = None, building: Optional[str] = None
+) -> pd.DataFrame:
+    """Rooms free on all days of all `windows` in the stored schedule, tightest fit first."""
+    return get_room_finder(building).find(windows, rooms)
@@ -0,0 +1,289 @@
+import secrets
+import sqlite3
+from typing import Callable, List, Tuple
+
+import pandas as pd
+
+from utils.aggregates import refresh_room_day_stats
+from utils.calendars import refresh_calendars
+from utils.delta import meeting_hashes
+
+# Minutes since midnight for a legacy 'HH:MM:SS' column.
+_LEGACY_MINUTES = "CAST(substr({col}, 1, 2) AS INTEGER) * 60 + CAST(substr({col}, 4, 2) AS INTEGER)"
+
+def _create_legacy_schedule(conn: sqlite3.Connection) -> None:
+    """v1: the original flat schedule table."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schedule (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course TEXT,
+            course_title TEXT,
+            meeting_day TEXT,
+            start_time TEXT,
+            end_time TEXT,
+            instructor TEXT,
+            room TEXT
+        )
+    """)
+
+def _normalize_schedule(conn: sqlite3.Connection) -> None:
+    """v2: lookup tables, integer minute columns and indexes.
+
+    Missing course titles and instructors are stored as '' so the lookup
+    keys stay unique; the `schedule` view turns them back into NULL.
+    """
+    conn.execute("""
+        CREATE TABLE rooms (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE instructors (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE courses (
+            id INTEGER PRIMARY KEY,
+            code TEXT NOT NULL,
+            title TEXT NOT NULL,
+            UNIQUE (code, title)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE meetings (
+            id INTEGER PRIMARY KEY,
+            course_id INTEGER NOT NULL REFERENCES courses(id),
+            instructor_id INTEGER NOT NULL REFERENCES instructors(id),
+            room_id INTEGER NOT NULL REFERENCES rooms(id),
+            meeting_day TEXT NOT NULL,
+            start_min INTEGER NOT NULL,
+            end_min INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_meetings_day_time ON meetings (meeting_day, start_min, end_min)")
+    conn.execute("CREATE INDEX idx_meetings_room_day ON meetings (room_id, meeting_day, start_min)")
+    conn.execute("CREATE INDEX idx_meetings_instructor_day ON meetings (instructor_id, meeting_day, start_min)")
+
+    # Carry over whatever the flat table holds.
+    conn.execute("INSERT OR IGNORE INTO rooms (name) SELECT DISTINCT room FROM schedule WHERE room IS NOT NULL")
+    conn.execute("INSERT OR IGNORE INTO instructors (name) SELECT DISTINCT COALESCE(instructor, '') FROM schedule")
+    conn.execute("""
+        INSERT OR IGNORE INTO courses (code, title)
+        SELECT DISTINCT COALESCE(course, ''), COALESCE(course_title, '') FROM schedule
+    """)
+    conn.execute(f"""
+        INSERT INTO meetings (course_id, instructor_id, room_id, meeting_day, start_min, end_min)
+        SELECT c.id, i.id, r.id, s.meeting_day,
+               {_LEGACY_MINUTES.format(col='s.start_time')},
+               {_LEGACY_MINUTES.format(col='s.end_time')}
+        FROM schedule s
+        JOIN rooms r ON r.name = s.room
+        JOIN instructors i ON i.name = COALESCE(s.instructor, '')
+        JOIN courses c ON c.code = COALESCE(s.course, '') AND c.title = COALESCE(s.course_title, '')
+        WHERE s.start_time IS NOT NULL AND s.end_time IS NOT NULL AND s.meeting_day IS NOT NULL
+    """)
+    conn.execute("DROP TABLE schedule")
+    conn.execute("DROP TABLE IF EXISTS schedule_staging")
+
+    # Same columns the flat table had, plus the integer minutes and the
+    # instructor id (filtering on the NULLIF'd name could not use an index).
+    conn.execute("""
+        CREATE VIEW schedule AS
+        SELECT NULLIF(c.code, '') AS course,
+               NULLIF(c.title, '') AS course_title,
+               m.meeting_day,
+               printf('%02d:%02d:00', m.start_min / 60, m.start_min % 60) AS start_time,
+               printf('%02d:%02d:00', m.end_min / 60, m.end_min % 60) AS end_time,
+               NULLIF(i.name, '') AS instructor,
+               r.name AS room,
+               m.start_min,
+               m.end_min,
+               m.instructor_id
+        FROM meetings m
+        JOIN rooms r ON r.id = m.room_id
+        JOIN instructors i ON i.id = m.instructor_id
+        JOIN courses c ON c.id = m.course_id
+    """)
+
+def _add_meta(conn: sqlite3.Connection) -> None:
+    """v3: key/value metadata, starting with the data version counter."""
+    conn.execute("""
+        CREATE TABLE meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT INTO meta (key, value) VALUES ('data_version', 1)")
+
+def _add_row_hashes(conn: sqlite3.Connection) -> None:
+    """v4: per-meeting content hashes used for delta ingestion."""
+    conn.execute("ALTER TABLE meetings ADD COLUMN row_hash INTEGER")
+    conn.execute("ALTER TABLE meetings ADD COLUMN slot_hash INTEGER")
+    meetings = pd.read_sql_query("""
+        SELECT m.id, c.code AS course, c.title AS course_title, i.name AS instructor,
+               m.meeting_day, m.start_min, m.end_min, r.name AS room
+        FROM meetings m
+        JOIN rooms r ON r.id = m.room_id
+        JOIN instructors i ON i.id = m.instructor_id
+        JOIN courses c ON c.id = m.course_id
+    """, conn)
+    hashes = meeting_hashes(meetings)
+    conn.executemany(
+        "UPDATE meetings SET row_hash = ?, slot_hash = ? WHERE id = ?",
+        zip(hashes['row_hash'].tolist(), hashes['slot_hash'].tolist(), meetings['id'].tolist())
+    )
+
+def _add_room_day_stats(conn: sqlite3.Connection) -> None:
+    """v5: per-room, per-day aggregates rebuilt at ingest time."""
+    conn.execute("""
+        CREATE TABLE room_day_stats (
+            room_id INTEGER NOT NULL REFERENCES rooms(id),
+            meeting_day TEXT NOT NULL,
+            class_count INTEGER NOT NULL,
+            occupied_min INTEGER NOT NULL,
+            utilization REAL NOT NULL,
+            slots BLOB NOT NULL,
+            PRIMARY KEY (room_id, meeting_day)
+        ) WITHOUT ROWID
+    """)
+    refresh_room_day_stats(conn)
+
+def _add_database_id(conn: sqlite3.Connection) -> None:
+    """v6: a random id telling this database's data versions apart from a recreated file's."""
+    conn.execute("INSERT INTO meta (key, value) VALUES ('database_id', ?)", (secrets.randbits(62),))
+
+# Term that schedules stored before partitioning are filed under.
+DEFAULT_TERM = "Current"
+
+def _partition_meetings(conn: sqlite3.Connection) -> None:
+    """v7: term and building partitions, with an active-term pointer.
+
+    Every meeting belongs to one (term, building) partition; building ''
+    means the upload named none. The indexes lead with partition_id, so a
+    query scoped to a partition never reads another one's rows. meta's
+    'active_term' holds the terms.id the pages show by default.
+    """
+    conn.execute("""
+        CREATE TABLE terms (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE partitions (
+            id INTEGER PRIMARY KEY,
+            term_id INTEGER NOT NULL REFERENCES terms(id),
+            building TEXT NOT NULL,
+            UNIQUE (term_id, building)
+        )
+    """)
+    conn.execute("INSERT INTO terms (id, name) VALUES (1, ?)", (DEFAULT_TERM,))
+    conn.execute("INSERT INTO partitions (id, term_id, building) VALUES (1, 1, '')")
+    conn.execute("INSERT INTO meta (key, value) VALUES ('active_term', 1)")
+    # Snapshots written before this version lack the partition column.
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+
+    conn.execute("ALTER TABLE meetings ADD COLUMN partition_id INTEGER NOT NULL DEFAULT 1")
+    conn.execute("DROP INDEX idx_meetings_day_time")
+    conn.execute("DROP INDEX idx_meetings_room_day")
+    conn.execute("DROP INDEX idx_meetings_instructor_day")
+    conn.execute("CREATE INDEX idx_meetings_day_time ON meetings (partition_id, meeting_day, start_min, end_min)")
+    conn.execute("CREATE INDEX idx_meetings_room_day ON meetings (partition_id, room_id, meeting_day, start_min)")
+    conn.execute(
+        "CREATE INDEX idx_meetings_instructor_day ON meetings (partition_id, instructor_id, meeting_day, start_min)"
+    )
+
+    # room_id joins the view for the same reason instructor_id did: a room
+    # filter on the name cannot use the partition-led index.
+    conn.execute("DROP VIEW schedule")
+    conn.execute("""
+        CREATE VIEW schedule AS
+        SELECT NULLIF(c.code, '') AS course,
+               NULLIF(c.title, '') AS course_title,
+               m.meeting_day,
+               printf('%02d:%02d:00', m.start_min / 60, m.start_min % 60) AS start_time,
+               printf('%02d:%02d:00', m.end_min / 60, m.end_min % 60) AS end_time,
+               NULLIF(i.name, '') AS instructor,
+               r.name AS room,
+               m.start_min,
+               m.end_min,
+               m.instructor_id,
+               m.room_id,
+               m.partition_id
+        FROM meetings m
+        JOIN rooms r ON r.id = m.room_id
+        JOIN instructors i ON i.id = m.instructor_id
+        JOIN courses c ON c.id = m.course_id
+    """)
+
+    conn.execute("DROP TABLE room_day_stats")
+    conn.execute("""
+        CREATE TABLE room_day_stats (
+            partition_id INTEGER NOT NULL REFERENCES partitions(id),
+            room_id INTEGER NOT NULL REFERENCES rooms(id),
+            meeting_day TEXT NOT NULL,
+            class_count INTEGER NOT NULL,
+            occupied_min INTEGER NOT NULL,
+            utilization REAL NOT NULL,
+            slots BLOB NOT NULL,
+            PRIMARY KEY (partition_id, room_id, meeting_day)
+        ) WITHOUT ROWID
+    """)
+    refresh_room_day_stats(conn, partition_id=1)
+
+def _add_calendars(conn: sqlite3.Connection) -> None:
+    """v8: per-room and per-instructor weekly calendars, rebuilt with each partition at ingest time."""
+    conn.execute("""
+        CREATE TABLE calendars (
+            partition_id INTEGER NOT NULL REFERENCES partitions(id),
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            events TEXT NOT NULL,
+            vevents TEXT NOT NULL,
+            PRIMARY KEY (partition_id, kind, name)
+        )
+    """)
+    for (partition_id,) in conn.execute("SELECT id FROM partitions").fetchall():
+        refresh_calendars(conn, partition_id)
+
+# Ordered (version, migration) pairs. Append new ones; never edit applied ones.
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _create_legacy_schedule),
+    (2, _normalize_schedule),
+    (3, _add_meta),
+    (4, _add_row_hashes),
+    (5, _add_room_day_stats),
+    (6, _add_database_id),
+    (7, _partition_meetings),
+    (8, _add_calendars),
+]
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Returns the schema version recorded in the database file."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Applies pending migrations, each in its own transaction, and returns the new version."""
+    if conn.in_transaction:
+        conn.commit()
+    current = schema_version(conn)
+    for version, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock.
+            if schema_version(conn) >= version:
+                conn.commit()
+                continue
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = version
+    return current
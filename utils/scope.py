@@ -0,0 +1,28 @@
+from typing import Optional
+
+import streamlit as st
+
+from utils.database import get_active_term, get_buildings, get_terms
+
+def building_scope() -> Optional[str]:
+    """Sidebar picker for the building a page shows; None means every building of the active term.
+
+    Only shown when the active term holds more than one building. The
+    choice is kept in session state, so it follows the user across pages.
+    """
+    if len(get_terms()) > 1:
+        st.sidebar.caption(f"Term: {get_active_term()}")
+    buildings = get_buildings()
+    if len(buildings) < 2:
+        return None
+
+    options = [None] + buildings
+    current = st.session_state.get('building_scope')
+    building = st.sidebar.selectbox(
+        "Building",
+        options,
+        index=options.index(current) if current in options else 0,
+        format_func=lambda b: "All Buildings" if b is None else (b or "Unassigned")
+    )
+    st.session_state['building_scope'] = building
+    return building
@@ -0,0 +1,194 @@
+import glob
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils.time_parsing import minutes_to_times
+
+# Columns stored dictionary-encoded; everything else is integers.
+DICTIONARY_COLUMNS = ['course', 'course_title', 'meeting_day', 'instructor', 'room']
+
+# 'HH:MM:SS' for every minute of the day, as the `schedule` view prints them.
+_MINUTE_STRINGS = np.array([f"{m // 60:02d}:{m % 60:02d}:00" for m in range(24 * 60)], dtype=object)
+
+def build_snapshot(schedule: pd.DataFrame, rooms: List[str], instructors: List[Optional[str]]) -> pa.Table:
+    """Builds a snapshot table from `schedule` view rows and the ordered lookup lists.
+
+    Rows are sorted by (partition_id, meeting_day, room, start_min) so that
+    one day of one partition is a contiguous, zero-copy slice.
+    """
+    schedule = schedule.sort_values(['partition_id', 'meeting_day', 'room', 'start_min'], kind='stable')
+    columns = {col: pa.array(schedule[col], type=pa.string()).dictionary_encode() for col in DICTIONARY_COLUMNS}
+    columns['start_min'] = pa.array(schedule['start_min'].to_numpy(dtype='int16'))
+    columns['end_min'] = pa.array(schedule['end_min'].to_numpy(dtype='int16'))
+    columns['instructor_id'] = pa.array(schedule['instructor_id'].to_numpy(dtype='int64'))
+    columns['room_id'] = pa.array(schedule['room_id'].to_numpy(dtype='int64'))
+    columns['partition_id'] = pa.array(schedule['partition_id'].to_numpy(dtype='int32'))
+    return pa.table(columns).replace_schema_metadata({
+        'rooms': json.dumps(rooms),
+        'instructors': json.dumps(instructors),
+    })
+
+def _runs(*keys: np.ndarray) -> List[Tuple[int, int]]:
+    """(start, end) of each run of rows sharing all of `keys`, for rows sorted by them."""
+    changed = np.zeros(len(keys[0]) - 1, dtype=bool)
+    for key in keys:
+        changed |= key[1:] != key[:-1]
+    bounds = np.flatnonzero(changed) + 1
+    return list(zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(keys[0])]])))
+
+def write_snapshot(path: str, table: pa.Table) -> None:
+    """Writes `table` as an uncompressed Arrow IPC file, atomically."""
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with pa.OSFile(tmp, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table.combine_chunks())
+    os.replace(tmp, path)
+
+class Snapshot:
+    """A memory-mapped, read-only schedule snapshot."""
+
+    def __init__(self, path: str):
+        self.table = pa.ipc.open_file(pa.memory_map(path)).read_all().combine_chunks()
+        metadata = self.table.schema.metadata or {}
+        self.rooms: List[str] = json.loads(metadata.get(b'rooms', b'[]'))
+        self.instructors: List[Optional[str]] = json.loads(metadata.get(b'instructors', b'[]'))
+
+        # Row range of each partition and of each (partition, day), from the
+        # partition ids and the day column's dictionary indices.
+        self._partitions: Dict[int, Tuple[int, int]] = {}
+        self._days: Dict[Tuple[int, str], Tuple[int, int]] = {}
+        if self.table.num_rows:
+            partitions = self.table.column('partition_id').to_numpy()
+            day_column = self.table.column('meeting_day').chunk(0)
+            codes = day_column.indices.to_numpy()
+            names = day_column.dictionary.to_pylist()
+            for s, e in _runs(partitions):
+                self._partitions[int(partitions[s])] = (int(s), int(e - s))
+            for s, e in _runs(partitions, codes):
+                self._days[int(partitions[s]), names[codes[s]]] = (int(s), int(e - s))
+
+    def _mask(self, table: pa.Table, column: str, values: List[str]) -> np.ndarray:
+        # Compares dictionary indices, not strings.
+        array = table.column(column).chunk(0) if table.num_rows else None
+        if array is None:
+            return np.zeros(0, dtype=bool)
+        values = set(values)
+        wanted = [i for i, v in enumerate(array.dictionary.to_pylist()) if v in values]
+        return np.isin(array.indices.to_numpy(zero_copy_only=False), wanted)
+
+    def rows(self, partitions: Optional[List[int]] = None, meeting_day: Optional[str] = None) -> pa.Table:
+        """Rows of `partitions` (all if None), of one day if given, without a scan."""
+        if partitions is None:
+            partitions = list(self._partitions)
+        if meeting_day:
+            spans = [self._days[p, meeting_day] for p in partitions if (p, meeting_day) in self._days]
+        else:
+            spans = [self._partitions[p] for p in partitions if p in self._partitions]
+        if len(spans) == 1:
+            return self.table.slice(*spans[0])
+        if not spans:
+            return self.table.slice(0, 0)
+        return pa.concat_tables([self.table.slice(*span) for span in spans]).combine_chunks()
+
+    def rooms_in(self, partitions: List[int]) -> List[str]:
+        """The rooms used in `partitions`, in lookup table order."""
+        used = set(self.rows(partitions).column('room').unique().to_pylist())
+        return [room for room in self.rooms if room in used]
+
+    def instructors_in(self, partitions: List[int]) -> List[Optional[str]]:
+        """The instructors teaching in `partitions`, in lookup table order."""
+        used = set(self.rows(partitions).column('instructor').unique().to_pylist())
+        return [name for name in self.instructors if name in used]
+
+    def select(
+        self,
+        meeting_day: Optional[str] = None,
+        rooms: Optional[List[str]] = None,
+        instructor: Optional[str] = None,
+        at_minute: Optional[int] = None,
+        instructors: Optional[List[str]] = None,
+        partitions: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """Rows matching the filters, with the `schedule` view's columns."""
+        table = self.rows(partitions, meeting_day)
+
+        keep = np.ones(table.num_rows, dtype=bool)
+        if rooms:
+            keep &= self._mask(table, 'room', rooms)
+        if instructor:
+            keep &= self._mask(table, 'instructor', [instructor])
+        if instructors is not None:
+            keep &= self._mask(table, 'instructor', instructors)
+        if at_minute is not None:
+            keep &= table.column('start_min').to_numpy() <= at_minute
+            keep &= table.column('end_min').to_numpy() >= at_minute
+        if not keep.all():
+            table = table.filter(pa.array(keep))
+
+        df = pd.DataFrame({
+            col: table.column(col).cast(pa.string()).to_pandas() if table.num_rows
+            else pd.Series([], dtype='str')
+            for col in DICTIONARY_COLUMNS
+        })
+        start_min = table.column('start_min').to_numpy().astype('int64')
+        end_min = table.column('end_min').to_numpy().astype('int64')
+        df['start_time'] = pd.array(_MINUTE_STRINGS[start_min], dtype='str')
+        df['end_time'] = pd.array(_MINUTE_STRINGS[end_min], dtype='str')
+        df['start_min'] = start_min
+        df['end_min'] = end_min
+        df['instructor_id'] = table.column('instructor_id').to_numpy()
+        df['room_id'] = table.column('room_id').to_numpy()
+        df['partition_id'] = table.column('partition_id').to_numpy().astype('int64')
+        df['Start Time'] = minutes_to_times(df['start_min'])
+        df['End Time'] = minutes_to_times(df['end_min'])
+        return df[[
+            'course', 'course_title', 'meeting_day', 'start_time', 'end_time', 'instructor',
+            'room', 'start_min', 'end_min', 'instructor_id', 'room_id', 'partition_id', 'Start Time', 'End Time'
+        ]]
+
+class SnapshotStore:
+    """Snapshots of one database in a directory, one immutable file per data version.
+
+    The first reader of a new version (or the upload that created it)
+    writes the file; everyone else memory-maps it.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._current: Optional[Tuple[str, Snapshot]] = None
+        self._lock = threading.Lock()
+
+    def get(self, name: str, load: Callable[[], Tuple[str, pa.Table]]) -> Snapshot:
+        """Returns the snapshot called `name`, writing it from `load()` if it does not exist yet.
+
+        `load` returns the name of what it actually read alongside the table,
+        which wins if the database moved on in the meantime.
+        """
+        current = self._current
+        if current is not None and current[0] == name:
+            return current[1]
+        with self._lock:
+            if self._current is not None and self._current[0] == name:
+                return self._current[1]
+            path = os.path.join(self.directory, f"{name}.arrow")
+            if not os.path.exists(path):
+                name, table = load()
+                path = os.path.join(self.directory, f"{name}.arrow")
+                os.makedirs(self.directory, exist_ok=True)
+                write_snapshot(path, table)
+            snapshot = Snapshot(path)
+            self._current = (name, snapshot)
+            # Open memory maps keep unlinked files readable.
+            for old in glob.glob(os.path.join(self.directory, "*.arrow")):
+                if old != path:
+                    try:
+                        os.remove(old)
+                    except OSError:
+                        pass
+            return snapshot
@@ -0,0 +1,44 @@
+import datetime
+import html
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import timed
+
+# '%I:%M %p' label for every minute of the day, indexed by minute.
+_MINUTE_LABELS = np.array(
+    [datetime.time(m // 60, m % 60).strftime('%I:%M %p') for m in range(24 * 60)] + ["12:00 AM"],
+    dtype=object
+)
+
+def _escaped(values: pd.Series) -> pd.Series:
+    return values.fillna('').astype(str).map(html.escape)
+
+@timed('transform.schedule_tables')
+def schedule_tables(df: pd.DataFrame, by: str = 'Instructor') -> pd.Series:
+    """One HTML table of classes per value of `by`, in order of first appearance.
+
+    Expects get_schedule_data() columns; rows are built for the whole frame
+    at once and joined per group, so the cost does not grow with the number
+    of groups.
+    """
+    if df.empty:
+        return pd.Series([], dtype=object)
+    times = (
+        _MINUTE_LABELS[df['start_min'].to_numpy(dtype='int64').clip(0, 24 * 60)]
+        + " - " + _MINUTE_LABELS[df['end_min'].to_numpy(dtype='int64').clip(0, 24 * 60)]
+    )
+    rows = (
+        "<tr><td>" + _escaped(df['Meeting Day'])
+        + "</td><td>" + times
+        + "</td><td><b>" + _escaped(df['Course'])
+        + "</b></td><td>" + _escaped(df['Course Title'])
+        + "</td><td>" + _escaped(df['Room']) + "</td></tr>"
+    )
+    body = rows.groupby(df[by].fillna('').to_numpy(), sort=False).agg(''.join)
+    return (
+        '<table class="schedule-table"><thead><tr><th>Day</th><th>Time</th>'
+        '<th>Course</th><th>Title</th><th>Room</th></tr></thead><tbody>'
+        + body + '</tbody></table>'
+    )
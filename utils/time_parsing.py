@@ -0,0 +1,114 @@
+import re
+import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Formats accepted by the slow path, tried in order.
+TIME_FORMATS = ("%I:%M%p", "%I%p", "%H:%M", "%H%M")
+
+# Registrar exports repeat a few hundred distinct strings; this comfortably
+# holds a multi-campus export while keeping memory bounded.
+PARSE_CACHE_SIZE = 4096
+
+# Fast paths for the common '9:30AM' and '13:30' shapes. Anything they don't
+# match (or match with an out-of-range value) falls through to strptime.
+_CLOCK_12H = re.compile(r"([0-9]{1,2}):([0-9]{2})([AP]M)")
+_CLOCK_24H = re.compile(r"([0-9]{1,2}):([0-9]{2})")
+
+# datetime.time for every minute of the day, indexed by minutes since midnight.
+MINUTE_TIMES = np.array(
+    [datetime.time(m // 60, m % 60) for m in range(24 * 60)], dtype=object
+)
+
+def _fast_parse(time_str: str) -> Optional[int]:
+    """Parses the common clock shapes without strptime, or returns None."""
+    match = _CLOCK_12H.fullmatch(time_str)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if 1 <= hour <= 12 and minute <= 59:
+            hour %= 12
+            if match.group(3) == 'PM':
+                hour += 12
+            return hour * 60 + minute
+        return None
+    match = _CLOCK_24H.fullmatch(time_str)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if hour <= 23 and minute <= 59:
+            return hour * 60 + minute
+    return None
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_minutes(time_str: str) -> Optional[int]:
+    """Parses a time string into minutes since midnight."""
+    time_str = time_str.strip().upper()
+    minutes = _fast_parse(time_str)
+    if minutes is not None:
+        return minutes
+    for fmt in TIME_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(time_str, fmt)
+        except ValueError:
+            continue
+        return parsed.hour * 60 + parsed.minute
+    return None
+
+def parse_time(time_str: str) -> Optional[datetime.time]:
+    """Parses a time string into a datetime.time object."""
+    minutes = parse_minutes(time_str)
+    return None if minutes is None else MINUTE_TIMES[minutes]
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_meeting_minutes(meeting_time: str) -> Tuple[Optional[int], Optional[int]]:
+    """Splits a 'start-end' meeting time and parses both ends into minutes."""
+    meeting_time = meeting_time.strip()
+    if '-' not in meeting_time:
+        return parse_minutes(meeting_time), None
+    parts = meeting_time.split('-')
+    if len(parts) != 2:
+        return None, None
+    return parse_minutes(parts[0]), parse_minutes(parts[1])
+
+def parse_meeting_times(meeting_times: pd.Series) -> pd.DataFrame:
+    """Parses a Series of meeting times into start_min/end_min columns.
+
+    Each distinct string is parsed once. Unparseable ends are <NA>, so
+    `frame.isna().any(axis=1).sum()` is the number of rows that would be
+    dropped.
+    """
+    codes, uniques = pd.factorize(meeting_times.fillna('').astype(str))
+    parsed = [parse_meeting_minutes(t) for t in uniques]
+    starts = pd.array([p[0] for p in parsed], dtype='Int16')
+    ends = pd.array([p[1] for p in parsed], dtype='Int16')
+    return pd.DataFrame(
+        {'start_min': starts.take(codes), 'end_min': ends.take(codes)},
+        index=meeting_times.index
+    )
+
+def minutes_to_times(minutes: pd.Series) -> pd.Series:
+    """Converts a minutes-since-midnight Series into datetime.time objects."""
+    return pd.Series(
+        MINUTE_TIMES[minutes.to_numpy(dtype='int64')],
+        index=minutes.index, dtype=object
+    )
+
+def parse_cache_info() -> dict:
+    """Returns hit/miss counters for the time and meeting-time caches."""
+    return {
+        'parse_minutes': parse_minutes.cache_info()._asdict(),
+        'parse_meeting_minutes': parse_meeting_minutes.cache_info()._asdict(),
+    }
+
+def times_to_minutes(times: pd.Series) -> pd.Series:
+    """Converts datetime.time objects or 'HH:MM[:SS]' strings into minutes since midnight."""
+    codes, uniques = pd.factorize(times)
+    if (codes < 0).any():
+        raise ValueError("times must not contain missing values")
+    minutes = np.array([
+        t.hour * 60 + t.minute if isinstance(t, datetime.time) else parse_minutes(str(t)[:5])
+        for t in uniques
+    ], dtype='int64')
+    return pd.Series(minutes[codes], index=times.index)
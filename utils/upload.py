@@ -0,0 +1,38 @@
+from typing import Optional
+
+import pandas as pd
+import streamlit as st
+
+from utils.data_processing import check_columns, expand_schedule
+
+@st.cache_data(ttl=3600, show_spinner="Processing schedule data...")
+def load_and_process_data(uploaded_file) -> Optional[pd.DataFrame]:
+    """Loads and processes the uploaded schedule data."""
+    if not uploaded_file:
+        return None
+
+    try:
+        if uploaded_file.name.endswith('.csv'):
+            df = pd.read_csv(uploaded_file)
+        else:
+            df = pd.read_excel(uploaded_file)
+
+        # Validate required columns
+        try:
+            check_columns(df.columns)
+        except ValueError as e:
+            st.error(str(e))
+            return None
+
+        # Expand each row for multiple meeting days and multiple rooms
+        df_expanded = expand_schedule(df)
+
+        failures = df_expanded.attrs['time_parse_failures']
+        if failures:
+            st.warning(f"Skipped {failures} rows with an unreadable Meeting Time")
+
+        return df_expanded
+
+    except Exception as e:
+        st.error(f"Data processing error: {str(e)}")
+        return None